@@ -0,0 +1,166 @@
+"""Stateless signed access tokens that carry the user's entitlements
+
+With ``AUTH_ACCESS_TOKENS`` on, login, registration, rotation and
+``/api/auth/refresh/`` also return a short-lived access token. It is HMAC
+signed with ``SECRET_KEY`` (:mod:`django.core.signing`) and holds the user
+id, username, profile flags and the ids of the tiers the user paid for at
+issue time. A read sent with ``Authorization: Bearer <access token>`` gets
+its user and entitlements from the claims. Only the user's revocation epoch
+is read, and that comes from the cache, so no user, profile or subscription
+query runs. Writes still load the user from the database.
+
+A claim lives ``AUTH_ACCESS_TOKEN_TTL`` seconds, and never past the end of a
+subscription period it includes. Any change to a user's subscriptions,
+account or profile bumps the user's epoch. Older tokens are then refused,
+and the client refreshes with its device token (see
+:mod:`boosty_app.authentication`).
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+
+from .models import TierSubscription
+
+ACCESS_SALT = 'boosty_app.access_tokens'
+EPOCH_KEY = 'access-epoch:{user_id}'
+
+# Profile flags packed into the ``f`` claim
+IS_CREATOR, IS_STAFF, IS_SUPERUSER = 1, 2, 4
+
+
+@dataclass(frozen=True)
+class AccessClaims:
+    user_id: int
+    username: str
+    is_creator: bool
+    is_staff: bool
+    is_superuser: bool
+    tier_ids: frozenset
+    expires_at: datetime
+
+    def user(self):
+        """An unsaved User built from the claims alone, carrying them as ``access_claims``"""
+        user = User(
+            id=self.user_id,
+            username=self.username,
+            is_active=True,
+            is_staff=self.is_staff,
+            is_superuser=self.is_superuser,
+        )
+        user._state.adding = False
+        user._state.db = DEFAULT_DB_ALIAS
+        user.access_claims = self
+        return user
+
+
+def _bump_epochs(user_ids):
+    for user_id in user_ids:
+        key = EPOCH_KEY.format(user_id=user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def token_epoch(user_id):
+    key = EPOCH_KEY.format(user_id=user_id)
+    epoch = cache.get(key)
+    if epoch is None:
+        # Start from the clock so an evicted epoch never matches tokens signed before it
+        cache.add(key, time.time_ns(), None)
+        epoch = cache.get(key)
+    return epoch
+
+
+def revoke_access_tokens(*user_ids):
+    """Refuse every access token issued so far to these users, so their clients refresh"""
+    user_ids = [user_id for user_id in user_ids if user_id]
+    _bump_epochs(user_ids)
+    # Again on commit, in case a refresh signed the pre-commit entitlements in between
+    transaction.on_commit(lambda: _bump_epochs(user_ids))
+
+
+def issue_access_token(user):
+    """A signed access token for ``user`` and when it expires"""
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=settings.AUTH_ACCESS_TOKEN_TTL)
+    tier_ids = []
+    subscriptions = TierSubscription.objects.filter(subscriber=user, is_active=True, end_date__gte=now)
+    for tier_id, end_date in subscriptions.values_list('tier_id', 'end_date'):
+        tier_ids.append(tier_id)
+        expires_at = min(expires_at, end_date)
+
+    profile = user.profile
+    flags = (
+        (IS_CREATOR if profile.is_creator else 0)
+        | (IS_STAFF if user.is_staff else 0)
+        | (IS_SUPERUSER if user.is_superuser else 0)
+    )
+    claims = {
+        'u': user.pk,
+        'n': user.username,
+        'f': flags,
+        't': sorted(set(tier_ids)),
+        'e': token_epoch(user.pk),
+        'x': int(expires_at.timestamp()),
+    }
+    return signing.dumps(claims, salt=ACCESS_SALT, compress=True), expires_at.replace(microsecond=0)
+
+
+def read_access_token(value):
+    """The AccessClaims of a valid, unexpired, current-epoch access token, or None"""
+    try:
+        claims = signing.loads(value, salt=ACCESS_SALT)
+    except signing.BadSignature:
+        return None
+    if claims['x'] <= time.time() or claims['e'] != token_epoch(claims['u']):
+        return None
+    return AccessClaims(
+        user_id=claims['u'],
+        username=claims['n'],
+        is_creator=bool(claims['f'] & IS_CREATOR),
+        is_staff=bool(claims['f'] & IS_STAFF),
+        is_superuser=bool(claims['f'] & IS_SUPERUSER),
+        tier_ids=frozenset(claims['t']),
+        expires_at=datetime.fromtimestamp(claims['x'], tz=dt_timezone.utc),
+    )
+
+
+class AccessTokenAuthentication(BaseAuthentication):
+    """``Authorization: Bearer <access token>``; ignored unless ``AUTH_ACCESS_TOKENS`` is on"""
+
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode() or not settings.AUTH_ACCESS_TOKENS:
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed('Invalid bearer header.')
+
+        claims = read_access_token(auth[1].decode(errors='replace'))
+        if claims is None:
+            raise AuthenticationFailed('Invalid or expired access token.')
+        if request.method in SAFE_METHODS:
+            return claims.user(), claims
+
+        # Writes act on a fully loaded user
+        user = User.objects.filter(pk=claims.user_id, is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed('User inactive or deleted.')
+        return user, claims
+
+    def authenticate_header(self, request):
+        return self.keyword
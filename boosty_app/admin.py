@@ -1,10 +1,37 @@
 from django.contrib import admin
+from django.db.models import DurationField, ExpressionWrapper, F
+from django.db.models.functions import Extract, Greatest, Now
 
-from .models import Category, Comment, Post, Subscription, SubscriptionTier, TierSubscription, UserProfile
+from .bulk import delete_posts, update_posts, update_tier_subscriptions
+from .loaders import annotate_follow_counts, subquery_count
+from .models import (
+    Category,
+    Comment,
+    DeviceToken,
+    NotificationFanout,
+    Post,
+    Reaction,
+    Subscription,
+    SubscriptionRenewal,
+    SubscriptionTier,
+    TierSubscription,
+    UserProfile,
+)
+from .pagination import EstimatedCountPaginator
+
+
+class EstimatedCountAdmin(admin.ModelAdmin):
+    """Changelist counts are cached, estimated or capped like the API's (see ``EstimatedCountPaginator``)
+
+    Filtered changelists skip the second, unfiltered count Django shows as "N total".
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(UserProfile)
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(EstimatedCountAdmin):
     list_display = [
         'user',
         'is_creator',
@@ -17,7 +44,7 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter = ['is_creator', 'is_staff', 'is_superuser', 'created_at']
     search_fields = ['user__username', 'user__email', 'bio']
     list_editable = ['is_creator', 'is_staff', 'is_superuser']
-    date_hierarchy = 'created_at'
+    autocomplete_fields = ['user']
     fieldsets = (
         ('User', {'fields': ('user',)}),
         ('Permissions', {'fields': ('is_creator', 'is_staff', 'is_superuser')}),
@@ -26,55 +53,85 @@ class UserProfileAdmin(admin.ModelAdmin):
     )
     readonly_fields = ['created_at', 'updated_at']
 
+    def get_queryset(self, request):
+        # The user is part of every profile's name, so autocomplete results need it too
+        return annotate_follow_counts(super().get_queryset(request).select_related('user'))
+
     @admin.display(description='Subscribers')
     def subscriber_count(self, obj):
-        return obj.subscriber_count
+        return obj.follower_total
 
     @admin.display(description='Following')
     def following_count(self, obj):
-        return obj.following_count
+        return obj.following_total
 
 
 @admin.register(Subscription)
-class SubscriptionAdmin(admin.ModelAdmin):
+class SubscriptionAdmin(EstimatedCountAdmin):
     list_display = ['subscriber', 'creator', 'created_at']
     list_filter = ['created_at']
+    list_select_related = ['subscriber', 'creator__user']
     search_fields = ['subscriber__username', 'creator__user__username']
-    date_hierarchy = 'created_at'
+    autocomplete_fields = ['subscriber', 'creator']
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(EstimatedCountAdmin):
     list_display = ['name', 'description', 'created_at']
     search_fields = ['name', 'description']
     list_filter = ['created_at']
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(EstimatedCountAdmin):
     list_display = ['title', 'author', 'category', 'status', 'is_free', 'created_at']
-    list_filter = ['status', 'is_free', 'category', 'created_at', 'author']
+    list_filter = ['status', 'is_free', 'category', 'created_at']
+    list_select_related = ['author', 'category']
     search_fields = ['title', 'content', 'author__username']
     list_editable = ['status', 'is_free']
-    filter_horizontal = ['tiers']
-    date_hierarchy = 'created_at'
+    autocomplete_fields = ['author', 'category', 'tiers']
+    actions = ['publish_posts', 'archive_posts', 'make_free', 'make_paid']
+
+    def _bulk_update(self, request, queryset, operation, done):
+        self.message_user(request, f'{update_posts(queryset, operation)} post(s) {done}.')
+
+    @admin.action(description='Publish selected draft posts')
+    def publish_posts(self, request, queryset):
+        self._bulk_update(request, queryset, 'publish', 'published')
+
+    @admin.action(description='Archive selected published posts')
+    def archive_posts(self, request, queryset):
+        self._bulk_update(request, queryset, 'archive', 'archived')
+
+    @admin.action(description='Make selected posts free')
+    def make_free(self, request, queryset):
+        self._bulk_update(request, queryset, 'make_free', 'made free')
+
+    @admin.action(description='Make selected posts paid')
+    def make_paid(self, request, queryset):
+        self._bulk_update(request, queryset, 'make_paid', 'made paid')
+
+    def delete_queryset(self, request, queryset):
+        # "Delete selected posts" without a delete() per post
+        delete_posts(queryset)
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(EstimatedCountAdmin):
     list_display = ['post', 'author', 'content', 'created_at']
-    list_filter = ['created_at', 'author']
+    list_filter = ['created_at']
+    list_select_related = ['post', 'author']
     search_fields = ['content', 'author__username', 'post__title']
-    date_hierarchy = 'created_at'
+    autocomplete_fields = ['post', 'author', 'parent']
 
 
 @admin.register(SubscriptionTier)
-class SubscriptionTierAdmin(admin.ModelAdmin):
+class SubscriptionTierAdmin(EstimatedCountAdmin):
     list_display = ['name', 'creator', 'price', 'order', 'is_active', 'subscriber_count', 'created_at']
-    list_filter = ['is_active', 'created_at', 'creator']
+    list_filter = ['is_active', 'created_at']
     search_fields = ['name', 'description', 'creator__user__username']
     list_editable = ['order', 'is_active']
-    date_hierarchy = 'created_at'
+    autocomplete_fields = ['creator']
     fieldsets = (
         ('Tier Info', {'fields': ('creator', 'name', 'description', 'price')}),
         ('Display', {'fields': ('image', 'order', 'is_active')}),
@@ -82,13 +139,18 @@ class SubscriptionTierAdmin(admin.ModelAdmin):
     )
     readonly_fields = ['created_at', 'updated_at']
 
+    def get_queryset(self, request):
+        active = TierSubscription.objects.filter(is_active=True)
+        queryset = super().get_queryset(request).select_related('creator__user')
+        return queryset.annotate(subscriber_total=subquery_count(active, 'tier'))
+
     @admin.display(description='Subscribers')
     def subscriber_count(self, obj):
-        return obj.subscriber_count
+        return obj.subscriber_total
 
 
 @admin.register(TierSubscription)
-class TierSubscriptionAdmin(admin.ModelAdmin):
+class TierSubscriptionAdmin(EstimatedCountAdmin):
     list_display = [
         'subscriber',
         'tier',
@@ -100,8 +162,10 @@ class TierSubscriptionAdmin(admin.ModelAdmin):
         'cancelled_at',
     ]
     list_filter = ['is_active', 'payment_status', 'start_date', 'end_date']
+    list_select_related = ['subscriber', 'tier__creator__user']
     search_fields = ['subscriber__username', 'tier__name', 'transaction_id']
-    date_hierarchy = 'start_date'
+    autocomplete_fields = ['subscriber', 'tier']
+    actions = ['deactivate_subscriptions', 'cancel_subscriptions']
     fieldsets = (
         ('Subscription', {'fields': ('subscriber', 'tier', 'is_active')}),
         ('Dates', {'fields': ('start_date', 'end_date', 'cancelled_at')}),
@@ -110,6 +174,60 @@ class TierSubscriptionAdmin(admin.ModelAdmin):
     )
     readonly_fields = ['created_at', 'updated_at', 'start_date']
 
-    @admin.display(description='Days Left')
+    def get_queryset(self, request):
+        # Whole days until end_date, the same as TierSubscription.days_remaining
+        remaining = ExpressionWrapper(F('end_date') - Now(), output_field=DurationField())
+        return super().get_queryset(request).annotate(days_left=Greatest(Extract(remaining, 'day'), 0))
+
+    @admin.display(description='Days Left', ordering='end_date')
     def days_remaining(self, obj):
-        return obj.days_remaining
+        return obj.days_left
+
+    @admin.action(description='Deactivate selected subscriptions now')
+    def deactivate_subscriptions(self, request, queryset):
+        count = update_tier_subscriptions(queryset, 'deactivate')
+        self.message_user(request, f'{count} subscription(s) deactivated.')
+
+    @admin.action(description='Cancel selected subscriptions at period end')
+    def cancel_subscriptions(self, request, queryset):
+        count = update_tier_subscriptions(queryset, 'cancel')
+        self.message_user(request, f'{count} subscription(s) cancelled.')
+
+
+@admin.register(SubscriptionRenewal)
+class SubscriptionRenewalAdmin(EstimatedCountAdmin):
+    list_display = ['renewal_key', 'subscription', 'amount', 'status', 'attempts', 'next_attempt_at', 'updated_at']
+    list_filter = ['status']
+    list_select_related = ['subscription__subscriber', 'subscription__tier']
+    search_fields = ['renewal_key', 'transaction_id']
+    raw_id_fields = ['subscription']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(Reaction)
+class ReactionAdmin(EstimatedCountAdmin):
+    list_display = ['user', 'kind', 'post', 'comment', 'created_at']
+    list_filter = ['kind']
+    list_select_related = ['user', 'post', 'comment__author', 'comment__post']
+    raw_id_fields = ['user', 'post', 'comment']
+    readonly_fields = ['created_at']
+
+
+@admin.register(NotificationFanout)
+class NotificationFanoutAdmin(EstimatedCountAdmin):
+    list_display = ['post', 'status', 'delivered', 'cursor', 'updated_at']
+    list_filter = ['status']
+    list_select_related = ['post']
+    raw_id_fields = ['post']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(DeviceToken)
+class DeviceTokenAdmin(admin.ModelAdmin):
+    # Tokens are written on every login, so their count is not cached; see COUNTED_MODELS
+    show_full_result_count = False
+    list_display = ['user', 'device', 'created_at', 'expires_at', 'last_used_at']
+    list_select_related = ['user']
+    search_fields = ['user__username', 'device']
+    autocomplete_fields = ['user']
+    readonly_fields = ['digest', 'created_at', 'last_used_at']
@@ -0,0 +1,223 @@
+"""Incremental daily analytics rollups for creators"""
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import Aggregate, Count, F, QuerySet, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import (
+    Comment,
+    CreatorDailyStats,
+    Post,
+    RollupDirtyBucket,
+    RollupWatermark,
+    Subscription,
+    SubscriptionRenewal,
+    TierSubscription,
+    UserProfile,
+)
+
+WATERMARK_NAME = 'creator-daily-stats'
+
+# Rows committed slightly out of timestamp order are picked up by re-scanning this overlap;
+# buckets are recomputed from scratch, so processing a row twice is harmless
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+STAT_FIELDS = ['new_followers', 'new_tier_subscribers', 'revenue', 'posts', 'comments']
+
+
+@dataclass(frozen=True)
+class _Source:
+    """A raw table feeding one rollup column"""
+
+    column: str
+    queryset: QuerySet
+    creator_field: str
+    date_field: str
+    changed_field: str
+    value: Aggregate
+
+    def bucketed(self, queryset=None):
+        queryset = self.queryset if queryset is None else queryset
+        return queryset.annotate(bucket_creator=F(self.creator_field), bucket_day=TruncDate(self.date_field)).values(
+            'bucket_creator', 'bucket_day'
+        )
+
+    def changed_buckets(self, since):
+        changed = self.queryset.filter(**{f'{self.changed_field}__gt': since})
+        return set(self.bucketed(changed).values_list('bucket_creator', 'bucket_day').distinct())
+
+    def aggregate(self, start, end, creator_ids=None):
+        queryset = self.queryset.filter(
+            **{f'{self.date_field}__date__gte': start, f'{self.date_field}__date__lte': end}
+        )
+        if creator_ids is not None:
+            queryset = queryset.filter(**{f'{self.creator_field}__in': creator_ids})
+        return self.bucketed(queryset).annotate(total=self.value).values_list('bucket_creator', 'bucket_day', 'total')
+
+
+def _sources():
+    return [
+        _Source('new_followers', Subscription.objects.all(), 'creator_id', 'created_at', 'created_at', Count('id')),
+        _Source(
+            'new_tier_subscribers',
+            TierSubscription.objects.all(),
+            'tier__creator_id',
+            'created_at',
+            'updated_at',
+            Count('id'),
+        ),
+        _Source(
+            'revenue',
+            TierSubscription.objects.filter(payment_status='completed'),
+            'tier__creator_id',
+            'created_at',
+            'updated_at',
+            Sum('tier__price'),
+        ),
+        _Source(
+            'revenue',
+            SubscriptionRenewal.objects.filter(status='completed'),
+            'subscription__tier__creator_id',
+            'updated_at',
+            'updated_at',
+            Sum('amount'),
+        ),
+        _Source('posts', Post.objects.all(), 'author__profile__id', 'created_at', 'updated_at', Count('id')),
+        _Source(
+            'comments', Comment.objects.all(), 'post__author__profile__id', 'created_at', 'created_at', Count('id')
+        ),
+    ]
+
+
+def mark_deleted(creator_id, *moments):
+    """Queue the creator's buckets for deleted source rows dated ``moments`` (datetimes or days) for the next rollup"""
+    if creator_id is None:
+        return
+    # Same day boundaries as TruncDate in the current time zone
+    days = {timezone.localtime(when).date() if isinstance(when, datetime) else when for when in moments if when}
+    RollupDirtyBucket.objects.bulk_create(
+        [RollupDirtyBucket(creator_id=creator_id, day=day) for day in days], ignore_conflicts=True
+    )
+
+
+def compute_buckets(start, end, creator_ids=None):
+    """Aggregate every source for days in [start, end], grouped by (creator_id, day)"""
+    buckets = defaultdict(lambda: {field: 0 for field in STAT_FIELDS})
+    for source in _sources():
+        for creator_id, day, total in source.aggregate(start, end, creator_ids):
+            if creator_id is None:
+                continue
+            buckets[(creator_id, day)][source.column] += total or 0
+    return buckets
+
+
+def _write_buckets(buckets, batch_size=1000):
+    rows = [
+        CreatorDailyStats(creator_id=creator_id, day=day, **values) for (creator_id, day), values in buckets.items()
+    ]
+    CreatorDailyStats.objects.bulk_create(
+        rows,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['creator', 'day'],
+        update_fields=STAT_FIELDS + ['updated_at'],
+    )
+    return len(rows)
+
+
+def refresh_buckets(pairs):
+    """Recompute the given (creator_id, day) buckets from raw rows"""
+    if not pairs:
+        return 0
+    days = [day for _, day in pairs]
+    creator_ids = {creator_id for creator_id, _ in pairs}
+    computed = compute_buckets(min(days), max(days), creator_ids)
+
+    # Buckets that no longer have any source rows are reset to zero
+    buckets = {pair: computed.get(pair) or {field: 0 for field in STAT_FIELDS} for pair in pairs}
+    return _write_buckets(buckets)
+
+
+def run_incremental_rollup(now=None):
+    """Fold rows changed since the last watermark into the daily rollup"""
+    now = now or timezone.now()
+    with transaction.atomic():
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(
+            name=WATERMARK_NAME, defaults={'value': datetime(1970, 1, 1, tzinfo=dt_timezone.utc)}
+        )
+        since = watermark.value - WATERMARK_OVERLAP
+
+        pairs = set()
+        for source in _sources():
+            pairs |= source.changed_buckets(since)
+
+        # Buckets that lost rows to deletions; skip creators deleted since
+        dirty = list(RollupDirtyBucket.objects.select_for_update().values_list('pk', 'creator_id', 'day'))
+        pairs |= {(creator_id, day) for _, creator_id, day in dirty}
+        creator_ids = set(UserProfile.objects.filter(pk__in={pair[0] for pair in pairs}).values_list('pk', flat=True))
+        pairs = {pair for pair in pairs if pair[0] in creator_ids}
+
+        updated = refresh_buckets(pairs)
+        RollupDirtyBucket.objects.filter(pk__in=[pk for pk, _, _ in dirty]).delete()
+        watermark.value = now
+        watermark.save(update_fields=['value'])
+    return updated
+
+
+def _rebuild_chunk(start, end):
+    buckets = compute_buckets(start, end)
+    with transaction.atomic():
+        CreatorDailyStats.objects.filter(day__gte=start, day__lte=end).delete()
+        return _write_buckets(buckets)
+
+
+def _rebuild_chunk_in_thread(chunk):
+    try:
+        return _rebuild_chunk(*chunk)
+    finally:
+        # Each worker thread owns its own connection
+        connection.close()
+
+
+def backfill(start, end, chunk_days=30, workers=4):
+    """Rebuild rollups for [start, end], processing date chunks in parallel threads"""
+    chunks = []
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+
+    if workers <= 1:
+        return sum(_rebuild_chunk(*chunk) for chunk in chunks)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(_rebuild_chunk_in_thread, chunks))
+
+
+def daily_series(profile, start, end):
+    """Return one zero-filled entry per day in [start, end] for a creator"""
+    empty = {field: 0 for field in STAT_FIELDS}
+    rows = {
+        row['day']: row
+        for row in CreatorDailyStats.objects.filter(creator=profile, day__gte=start, day__lte=end).values(
+            'day', *STAT_FIELDS
+        )
+    }
+    series = []
+    day = start
+    while day <= end:
+        values = rows.get(day, empty)
+        entry = {'day': day.isoformat()}
+        entry.update((field, values[field]) for field in STAT_FIELDS)
+        entry['revenue'] = f"{values['revenue']:.2f}"
+        series.append(entry)
+        day += timedelta(days=1)
+    return series
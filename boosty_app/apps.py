@@ -6,4 +6,5 @@ class BoostyAppConfig(AppConfig):
     name = 'boosty_app'
 
     def ready(self):
+        import boosty_app.checks
         import boosty_app.signals
@@ -0,0 +1,244 @@
+"""Expiring per-device API tokens, resolved without a database query when warm
+
+Clients still send ``Authorization: Token <key>``. Keys are random, and only
+their SHA-256 digest is stored: one :class:`~boosty_app.models.DeviceToken`
+row per device, each with an expiry. A resolved token, with its user, is
+kept for ``AUTH_TOKEN_LOCAL_TIMEOUT`` seconds in this process and for
+``AUTH_TOKEN_CACHE_TIMEOUT`` seconds in the shared cache. A warm request
+therefore authenticates with no query at all.
+
+Deleting a token row revokes it and evicts both cache entries. Other
+processes stop accepting the token once their short local entry expires.
+Last-used times are collected in memory, and a background thread writes them
+in one batched UPDATE per ``AUTH_TOKEN_LAST_USED_INTERVAL``.
+"""
+
+import atexit
+import hashlib
+import logging
+import pickle
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from .models import DeviceToken
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KEY = 'auth-token:{digest}'
+
+# Most tokens one process keeps resolved in memory
+LOCAL_CACHE_SIZE = 10_000
+
+# Tokens written per batched last-used UPDATE
+FLUSH_BATCH_SIZE = 1000
+
+
+def token_digest(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class LocalTokenCache:
+    """A bounded, thread-safe LRU of resolved tokens, each kept ``AUTH_TOKEN_LOCAL_TIMEOUT`` seconds
+
+    Entries are stored pickled, so no request can see attributes (such as a
+    loaded profile) that another request cached on a shared user object.
+    """
+
+    def __init__(self, size=LOCAL_CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            expires, data = entry
+            if expires <= time.monotonic():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+        return pickle.loads(data)
+
+    def set(self, digest, token):
+        timeout = getattr(settings, 'AUTH_TOKEN_LOCAL_TIMEOUT', 5)
+        if not timeout:
+            return
+        data = pickle.dumps(token)
+        with self._lock:
+            self._entries[digest] = (time.monotonic() + timeout, data)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def delete(self, *digests):
+        with self._lock:
+            for digest in digests:
+                self._entries.pop(digest, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class LastUsedBuffer:
+    """Collect token last-used times in memory and write them in batched UPDATEs from a daemon thread"""
+
+    def __init__(self, interval=None):
+        self._interval = interval
+        self._times = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    @property
+    def interval(self):
+        if self._interval is not None:
+            return self._interval
+        return getattr(settings, 'AUTH_TOKEN_LAST_USED_INTERVAL', 60)
+
+    def touch(self, token_id, when=None):
+        with self._lock:
+            self._times[token_id] = when or timezone.now()
+        self._ensure_thread()
+
+    def pending(self, token_id):
+        with self._lock:
+            return self._times.get(token_id)
+
+    def flush(self):
+        """Write buffered last-used times; returns the number of tokens updated"""
+        with self._lock:
+            times, self._times = self._times, {}
+        if not times:
+            return 0
+        try:
+            DeviceToken.objects.bulk_update(
+                [DeviceToken(pk=pk, last_used_at=when) for pk, when in times.items()],
+                ['last_used_at'],
+                batch_size=FLUSH_BATCH_SIZE,
+            )
+        except Exception:
+            # Keep the times for the next attempt, unless the token was used again since
+            with self._lock:
+                self._times = {**times, **self._times}
+            raise
+        return len(times)
+
+    def _ensure_thread(self):
+        if self._thread is not None or not self.interval:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='token-last-used-flusher', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to flush token last-used times')
+            finally:
+                connection.close()
+
+    def stop(self):
+        """Stop the flusher thread and write any remaining times"""
+        self._stopped.set()
+        try:
+            self.flush()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Failed to flush token last-used times at shutdown')
+
+
+local_tokens = LocalTokenCache()
+last_used = LastUsedBuffer()
+
+
+def _cache_timeout(token):
+    # Never cache a token past its own expiry
+    remaining = int((token.expires_at - timezone.now()).total_seconds())
+    return max(1, min(getattr(settings, 'AUTH_TOKEN_CACHE_TIMEOUT', 300), remaining))
+
+
+def resolve_token(key):
+    """The unexpired DeviceToken (with its user) for ``key``, or None; no query when it is cached"""
+    if not key:
+        return None
+    digest = token_digest(key)
+    token = local_tokens.get(digest)
+    if token is None:
+        token = cache.get(TOKEN_KEY.format(digest=digest))
+        if token is None:
+            token = DeviceToken.objects.select_related('user').filter(digest=digest).first()
+            if token is None:
+                return None
+            cache.set(TOKEN_KEY.format(digest=digest), token, _cache_timeout(token))
+        local_tokens.set(digest, token)
+    if token.expires_at <= timezone.now():
+        return None
+    last_used.touch(token.pk)
+    return token
+
+
+def evict_tokens(*digests):
+    """Drop resolved tokens from the shared cache and this process, now and again on commit"""
+
+    def evict():
+        cache.delete_many([TOKEN_KEY.format(digest=digest) for digest in digests])
+        local_tokens.delete(*digests)
+
+    evict()
+    # A request may re-cache the row between the delete and the commit
+    transaction.on_commit(evict)
+
+
+def issue_token(user, device=''):
+    """Create a token for ``user`` on ``device``, replacing that device's token; returns ``(token, key)``
+
+    The key is only ever returned here; the database keeps its digest.
+    """
+    device = device[:100]
+    key = secrets.token_hex(20)
+    now = timezone.now()
+    stale = Q(expires_at__lte=now)
+    if device:
+        stale |= Q(device=device)
+    with transaction.atomic():
+        DeviceToken.objects.filter(stale, user=user).delete()
+        token = DeviceToken.objects.create(
+            user=user, digest=token_digest(key), device=device, expires_at=now + settings.AUTH_TOKEN_TTL
+        )
+    return token, key
+
+
+def rotate_token(token):
+    """Replace ``token`` with a fresh one for the same device; returns ``(token, key)``"""
+    with transaction.atomic():
+        DeviceToken.objects.filter(pk=token.pk).delete()
+        return issue_token(token.user, token.device)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``Authorization: Token <key>`` checked against cached, expiring device tokens"""
+
+    def authenticate_credentials(self, key):
+        token = resolve_token(key)
+        if token is None:
+            raise AuthenticationFailed('Invalid or expired token.')
+        if not token.user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+        return token.user, token
@@ -0,0 +1,129 @@
+"""Resolve several GET API requests inside one HTTP request"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import orjson
+from django.conf import settings
+from django.db import connection, connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/'
+# Paths that must not be nested in a batch: the batch endpoint itself and long-lived streams
+EXCLUDED_PREFIXES = ('/api/batch/', '/api/stream/')
+
+
+class BatchError(Exception):
+    """The batch payload is malformed"""
+
+
+def parse_batch(payload):
+    """Validate the ``requests`` list; returns ``[(id, path), ...]``"""
+    items = payload.get('requests') if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise BatchError('requests must be a non-empty list')
+    limit = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+    if len(items) > limit:
+        raise BatchError(f'A batch may contain at most {limit} requests')
+
+    parsed = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            item = {'path': item}
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise BatchError(f'requests[{index}] must be a path or an object with a path')
+        if item.get('method', 'GET').upper() != 'GET':
+            raise BatchError(f'requests[{index}]: only GET requests can be batched')
+        parsed.append((item.get('id', index), item['path']))
+    return parsed
+
+
+def _sub_request(request, path, query):
+    """Build a GET request for ``path`` that reuses the batch request's headers and authentication"""
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.META = {key: value for key, value in request.META.items() if key != 'wsgi.input'}
+    sub.META.update(REQUEST_METHOD='GET', PATH_INFO=path, QUERY_STRING=query, CONTENT_LENGTH='0')
+    sub.GET = QueryDict(query)
+    sub.user = request.user
+    if request.user.is_authenticated:
+        # DRF skips its authenticators for requests carrying a forced user, so the token is looked up once per batch
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+    return sub
+
+
+def _resolve(url):
+    """``(match, None)`` for a batchable path, else ``(None, (status, body))``"""
+    if not url.path.startswith(API_PREFIX) or url.path.startswith(EXCLUDED_PREFIXES):
+        return None, (400, {'detail': 'Only API GET endpoints can be batched.'})
+    try:
+        return resolve(url.path), None
+    except Resolver404:
+        return None, (404, {'detail': 'Not found.'})
+
+
+def _decode(response):
+    """The sub-response's ``(status, body)``, with JSON bodies parsed"""
+    if hasattr(response, 'data'):
+        return response.status_code, response.data
+    if not response.streaming:
+        return response.status_code, response.content.decode(response.charset or 'utf-8')
+    # Streamed lists are collected here, while this thread's connection is still open
+    body = b''.join(response.streaming_content)
+    if response['Content-Type'].startswith('application/json'):
+        return response.status_code, orjson.loads(body)
+    return response.status_code, body.decode(response.charset or 'utf-8')
+
+
+def _execute(request, path):
+    url = urlsplit(path)
+    match, error = _resolve(url)
+    if error:
+        return error
+
+    try:
+        response = match.func(_sub_request(request, url.path, url.query), *match.args, **match.kwargs)
+    except Exception:  # pylint: disable=broad-except
+        # One failing sub-request must not fail the others
+        logger.exception('Batched request to %s failed', path)
+        return 500, {'detail': 'Internal server error.'}
+    return _decode(response)
+
+
+def _execute_in_thread(request, path):
+    try:
+        return _execute(request, path)
+    finally:
+        # Each worker thread opened its own connection
+        connections.close_all()
+
+
+def run_batch(request, items):
+    """Run the parsed batch items; returns ``[{'id', 'status', 'body'}, ...]`` in request order
+
+    Identical paths are resolved once and share their result. The viewer and
+    their profile are loaded once and shared by every sub-request. Outside a
+    transaction, distinct paths run concurrently on up to ``BATCH_MAX_WORKERS``
+    threads, each with its own database connection; inside one (e.g. with
+    ``ATOMIC_REQUESTS``) they run in order on the request's connection, since
+    other connections could not see its uncommitted writes.
+    """
+    if request.user.is_authenticated:
+        # Prime the per-batch identity cache: every sub-view sees the same user and profile objects
+        getattr(request.user, 'profile', None)
+
+    paths = list(dict.fromkeys(path for _, path in items))
+    workers = min(getattr(settings, 'BATCH_MAX_WORKERS', 4), len(paths))
+    if workers > 1 and not connection.in_atomic_block:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api-batch') as executor:
+            results = dict(zip(paths, executor.map(lambda path: _execute_in_thread(request, path), paths)))
+    else:
+        results = {path: _execute(request, path) for path in paths}
+
+    return [{'id': item_id, 'status': results[path][0], 'body': results[path][1]} for item_id, path in items]
@@ -0,0 +1,89 @@
+"""Set-based moderation of posts and tier subscriptions
+
+Each operation locks the selected rows and changes them with one ``UPDATE``
+inside a transaction instead of a ``save()`` per row, so the image
+``pre_save`` hook and the other per-row signals never run and only the
+changed columns are written. What those signals would have done happens once
+for the whole set: cached list counts are invalidated per table, creator
+statistics per creator, and newly published posts are queued for
+notification fan-out together.
+"""
+
+from django.db import transaction
+from django.db.models.functions import Now
+
+from .access_tokens import revoke_access_tokens
+from .creator_stats import invalidate_creator_stats
+from .events import creator_posts_channel, publish
+from .models import NotificationFanout, Post, TierSubscription
+from .pagination import deferred_count_invalidation, invalidate_counts
+
+# Most ids one bulk API request may name
+MAX_IDS = 1000
+
+# operation: (rows it applies to, values it sets)
+POST_OPERATIONS = {
+    'publish': ({'status': 'draft'}, {'status': 'published'}),
+    'archive': ({'status': 'published'}, {'status': 'archived'}),
+    'make_free': ({'is_free': False}, {'is_free': True}),
+    'make_paid': ({'is_free': True}, {'is_free': False}),
+}
+
+TIER_SUBSCRIPTION_OPERATIONS = {
+    'deactivate': ({'is_active': True}, {'is_active': False}),
+    'cancel': ({'cancelled_at__isnull': True}, {'cancelled_at': Now()}),
+}
+
+
+def _update(model, queryset, match, values, *columns):
+    """Update the rows of ``queryset`` that match ``match`` in one statement; returns their pk and ``columns``"""
+    with transaction.atomic():
+        # Re-select by pk so any queryset (distinct, annotated, ordered) can be locked
+        selected = model.objects.filter(pk__in=queryset.values('pk'), **match).select_for_update(of=('self',))
+        rows = list(selected.values_list('pk', *columns))
+        if rows:
+            model.objects.filter(pk__in=[row[0] for row in rows]).update(**values, updated_at=Now())
+            invalidate_counts(model._meta.db_table)
+    return rows
+
+
+def update_posts(queryset, operation):
+    """Apply one of ``POST_OPERATIONS`` to the posts in ``queryset``; returns the number changed"""
+    match, values = POST_OPERATIONS[operation]
+    rows = _update(Post, queryset, match, values, 'author_id', 'created_at')
+    invalidate_creator_stats(*{author_id for _, author_id, _ in rows})
+    if operation == 'publish':
+        _queue_fanouts(rows)
+    return len(rows)
+
+
+def _queue_fanouts(rows):
+    """Queue notifications and push feed events for posts published for the first time"""
+    done = set(NotificationFanout.objects.filter(post_id__in=[row[0] for row in rows]).values_list('post', flat=True))
+    new = [row for row in rows if row[0] not in done]
+    NotificationFanout.objects.bulk_create([NotificationFanout(post_id=pk) for pk, _, _ in new], ignore_conflicts=True)
+    invalidate_counts(NotificationFanout._meta.db_table)
+    for pk, author_id, created_at in new:
+        publish(
+            creator_posts_channel(author_id), {'type': 'post', 'id': pk, 'author': author_id, 'created_at': created_at}
+        )
+
+
+def delete_posts(queryset):
+    """Delete the posts in ``queryset`` with their comments, reactions and notifications; returns posts deleted"""
+    posts = Post.objects.filter(pk__in=queryset.values('pk'))
+    with transaction.atomic(), deferred_count_invalidation():
+        author_ids = set(posts.values_list('author_id', flat=True))
+        # One DELETE per table; per-row signals still fire, but their count invalidation is collapsed
+        _, deleted = posts.delete()
+    invalidate_creator_stats(*author_ids)
+    return deleted.get(Post._meta.label, 0)
+
+
+def update_tier_subscriptions(queryset, operation):
+    """Apply one of ``TIER_SUBSCRIPTION_OPERATIONS`` to the subscriptions in ``queryset``; returns the number changed"""
+    match, values = TIER_SUBSCRIPTION_OPERATIONS[operation]
+    rows = _update(TierSubscription, queryset, match, values, 'tier__creator__user_id', 'subscriber_id')
+    invalidate_creator_stats(*{creator_id for _, creator_id, _ in rows})
+    revoke_access_tokens(*{subscriber_id for _, _, subscriber_id in rows})
+    return len(rows)
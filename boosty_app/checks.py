@@ -0,0 +1,49 @@
+"""System checks for deployment settings the app cannot run correctly without"""
+
+from django.conf import settings
+from django.core import checks
+
+# Cache backends whose entries live in one process only
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Token revocation and access-token epochs must be visible to every worker process"""
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    if settings.AUTH_ACCESS_TOKENS:
+        reason = 'AUTH_ACCESS_TOKENS is on: each process would keep its own revocation epochs'
+    elif settings.API_WORKERS > 1:
+        reason = f'the API runs {settings.API_WORKERS} worker processes: revoked tokens stay cached in the others'
+    else:
+        return []
+    return [
+        checks.Error(
+            f'{backend} is local to one process, but {reason}.',
+            hint='Set CACHE_BACKEND and CACHE_LOCATION to a shared cache such as Redis or Memcached.',
+            id='boosty_app.E001',
+        )
+    ]
+
+
+@checks.register(checks.Tags.compatibility)
+def check_payment_backend(app_configs, **kwargs):
+    """Renewals must never fall back to the fake provider outside development
+
+    Only a warning: migrations and the API run without a provider, and
+    ``renew_subscriptions`` itself refuses to start until one is set.
+    """
+    if settings.PAYMENT_BACKEND:
+        return []
+    return [
+        checks.Warning(
+            'PAYMENT_BACKEND is not set, so subscription renewals cannot charge anyone.',
+            hint='Set PAYMENT_BACKEND to your provider, or run with DEBUG=1 to use the fake one.',
+            id='boosty_app.W001',
+        )
+    ]
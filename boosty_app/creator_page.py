@@ -0,0 +1,75 @@
+"""Everything the public creator page shows, loaded with a fixed number of queries"""
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Post, Subscription, SubscriptionTier, TierSubscription
+from .pagination import keyset_paginate
+from .reactions import reaction_counts, viewer_reactions
+from .serializers import (
+    AnnotatedProfileSerializer,
+    CreatorPagePostSerializer,
+    CreatorPageSubscriptionSerializer,
+    CreatorPageTierSerializer,
+)
+
+POSTS_PER_PAGE = 10
+
+
+def build_creator_page(request, profile, posts_per_page=POSTS_PER_PAGE):
+    """Return the creator page payload for ``profile`` as seen by ``request.user``
+
+    The viewer's entitlements (active tiers with this creator, follow state)
+    are resolved once and reused for every post's lock state, so the query
+    count does not depend on how many posts or tiers the creator has.
+    """
+    viewer = request.user
+    tiers = (
+        SubscriptionTier.objects.filter(creator=profile, is_active=True)
+        .annotate(
+            active_subscriber_total=Count('subscriptions', filter=Q(subscriptions__is_active=True), distinct=True),
+            published_post_total=Count('posts', filter=Q(posts__status='published'), distinct=True),
+        )
+        .order_by('order', 'price')
+    )
+
+    posts = keyset_paginate(
+        request,
+        Post.objects.filter(author_id=profile.user_id, status='published')
+        .select_related('category')
+        .prefetch_related('tiers')
+        .annotate(comment_total=Count('comments')),
+        per_page=posts_per_page,
+    )
+
+    subscriptions = []
+    is_following = False
+    if viewer.is_authenticated:
+        subscriptions = list(
+            TierSubscription.objects.filter(
+                subscriber=viewer, tier__creator=profile, is_active=True, end_date__gte=timezone.now()
+            ).select_related('tier')
+        )
+        is_following = Subscription.objects.filter(subscriber=viewer, creator=profile).exists()
+
+    context = {
+        'request': request,
+        'viewer_id': viewer.id,
+        'viewer_tier_ids': {subscription.tier_id for subscription in subscriptions},
+        'reaction_counts': reaction_counts(posts.items),
+        'my_reactions': viewer_reactions(viewer, posts.items),
+    }
+    return {
+        'profile': AnnotatedProfileSerializer(profile, context=context).data,
+        'tiers': CreatorPageTierSerializer(tiers, many=True, context=context).data,
+        'posts': {
+            'results': CreatorPagePostSerializer(posts.items, many=True, context=context).data,
+            'next_cursor': posts.next_cursor,
+        },
+        'viewer': {
+            'is_authenticated': viewer.is_authenticated,
+            'is_owner': viewer.id == profile.user_id,
+            'is_following': is_following,
+            'subscriptions': CreatorPageSubscriptionSerializer(subscriptions, many=True, context=context).data,
+        },
+    }
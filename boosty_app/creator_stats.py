@@ -0,0 +1,54 @@
+"""Aggregated creator dashboard statistics, cached per creator"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from .models import Post, Subscription, SubscriptionTier, TierSubscription
+
+CACHE_KEY = 'creator-stats:{user_id}'
+
+
+def _cache_timeout():
+    return getattr(settings, 'CREATOR_STATS_CACHE_TIMEOUT', 300)
+
+
+def compute_creator_stats(profile):
+    """Compute dashboard statistics with one conditional aggregate per table"""
+    post_stats = Post.objects.filter(author_id=profile.user_id).aggregate(
+        total_posts=Count('id'),
+        published_posts=Count('id', filter=Q(status='published')),
+        draft_posts=Count('id', filter=Q(status='draft')),
+        archived_posts=Count('id', filter=Q(status='archived')),
+    )
+    tier_stats = SubscriptionTier.objects.filter(creator=profile).aggregate(
+        total_tiers=Count('id'),
+        active_tiers=Count('id', filter=Q(is_active=True)),
+    )
+    tier_subscription_stats = TierSubscription.objects.filter(tier__creator=profile, is_active=True).aggregate(
+        total_tier_subscribers=Count('id'),
+        monthly_revenue=Sum('tier__price'),
+    )
+
+    return {
+        **post_stats,
+        **tier_stats,
+        'total_tier_subscribers': tier_subscription_stats['total_tier_subscribers'],
+        'monthly_revenue': tier_subscription_stats['monthly_revenue'] or 0,
+        'subscriber_count': Subscription.objects.filter(creator=profile).count(),
+    }
+
+
+def get_creator_stats(profile):
+    """Return cached dashboard statistics for a creator profile"""
+    key = CACHE_KEY.format(user_id=profile.user_id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_creator_stats(profile)
+        cache.set(key, stats, _cache_timeout())
+    return stats
+
+
+def invalidate_creator_stats(*user_ids):
+    """Drop cached statistics for the given creator user ids"""
+    cache.delete_many([CACHE_KEY.format(user_id=user_id) for user_id in user_ids if user_id])
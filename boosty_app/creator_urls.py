@@ -8,6 +8,8 @@ app_name = 'creator'
 
 urlpatterns = [
     path('', creator_views.creator_dashboard, name='dashboard'),
+    path('analytics/', creator_views.creator_analytics, name='analytics'),
+    path('export/<slug:dataset>/', creator_views.export_data, name='export'),
     path('posts/', creator_views.creator_posts, name='posts'),
     path('posts/create/', creator_views.create_post, name='create_post'),
     path('posts/<int:post_id>/', creator_views.view_post, name='view_post'),
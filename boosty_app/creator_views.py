@@ -1,13 +1,35 @@
 """Creator dashboard views for managing posts, comments, and subscribers"""
 
+from datetime import date, timedelta
+
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
 from django.utils.translation import activate
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_http_methods
 
+from . import exports
+from .analytics import daily_series
+from .creator_stats import get_creator_stats
 from .forms import PostForm, SubscriptionTierForm
 from .models import Category, Comment, Post, Subscription, SubscriptionTier, TierSubscription, UserProfile
+from .pagination import capped_count, keyset_paginate
+from .streaming import SyncStreamingHttpResponse
+
+# Longest range the analytics endpoint will return in one response
+MAX_ANALYTICS_DAYS = 366
+
+# Rows per page on dashboard listings
+DASHBOARD_PAGE_SIZE = 50
+
+# Creator stats entry holding the post count for each status filter
+STATUS_COUNT_KEYS = {
+    'published': 'published_posts',
+    'draft': 'draft_posts',
+    'archived': 'archived_posts',
+}
 
 
 def activate_ru(view_func):
@@ -44,7 +66,8 @@ def creator_required(view_func):
             messages.error(
                 request,
                 _(
-                    "You must be a creator to access this page. Please update your profile in Django Admin to enable creator mode."
+                    "You must be a creator to access this page. "
+                    "Please update your profile in Django Admin to enable creator mode."
                 ),
             )
             return render(
@@ -69,58 +92,77 @@ def creator_dashboard(request):
     """Main creator dashboard showing overview statistics"""
     profile = request.user.profile
 
-    # Get statistics
-    posts = Post.objects.filter(author=request.user)
-    total_posts = posts.count()
-    published_posts = posts.filter(status='published').count()
-    draft_posts = posts.filter(status='draft').count()
-    archived_posts = posts.filter(status='archived').count()
-
-    # Get recent posts
-    recent_posts = posts[:5]
-
-    # Get recent comments
-    recent_comments = Comment.objects.filter(post__author=request.user).order_by('-created_at')[:5]
-
-    # Get subscriber count
-    subscriber_count = profile.subscriber_count
-
-    # Get recent subscribers
-    recent_subscriptions = Subscription.objects.filter(creator=profile).order_by('-created_at')[:5]
+    # Statistics are aggregated in a handful of queries and cached per creator
+    stats = get_creator_stats(profile)
 
-    # Get tier statistics
-    tiers = SubscriptionTier.objects.filter(creator=profile)
-    total_tiers = tiers.count()
-    active_tiers = tiers.filter(is_active=True).count()
-
-    # Get tier subscriptions
-    tier_subscriptions = TierSubscription.objects.filter(tier__creator=profile, is_active=True)
-    total_tier_subscribers = tier_subscriptions.count()
-
-    # Calculate monthly revenue (placeholder)
-    from django.db.models import Sum
-
-    monthly_revenue = tier_subscriptions.aggregate(total=Sum('tier__price'))['total'] or 0
+    # Get recent activity
+    recent_posts = Post.objects.filter(author=request.user)[:5]
+    recent_comments = (
+        Comment.objects.filter(post__author=request.user).select_related('post', 'author').order_by('-created_at')[:5]
+    )
+    recent_subscriptions = (
+        Subscription.objects.filter(creator=profile).select_related('subscriber').order_by('-created_at')[:5]
+    )
 
     context = {
         'profile': profile,
-        'total_posts': total_posts,
-        'published_posts': published_posts,
-        'draft_posts': draft_posts,
-        'archived_posts': archived_posts,
-        'subscriber_count': subscriber_count,
+        **stats,
         'recent_posts': recent_posts,
         'recent_comments': recent_comments,
         'recent_subscriptions': recent_subscriptions,
-        'total_tiers': total_tiers,
-        'active_tiers': active_tiers,
-        'total_tier_subscribers': total_tier_subscribers,
-        'monthly_revenue': monthly_revenue,
     }
 
     return render(request, 'creator/dashboard.html', context)
 
 
+@login_required
+@creator_required
+def creator_analytics(request):
+    """Daily rollup series for charts; accepts ?start=YYYY-MM-DD&end=YYYY-MM-DD"""
+    try:
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else timezone.now().date()
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else end - timedelta(days=29)
+    except ValueError:
+        return JsonResponse({'error': 'Dates must be in YYYY-MM-DD format'}, status=400)
+
+    if start > end:
+        return JsonResponse({'error': 'start must not be after end'}, status=400)
+    if (end - start).days >= MAX_ANALYTICS_DAYS:
+        return JsonResponse({'error': f'Range cannot exceed {MAX_ANALYTICS_DAYS} days'}, status=400)
+
+    return JsonResponse(
+        {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'days': daily_series(request.user.profile, start, end),
+        }
+    )
+
+
+@login_required
+@creator_required
+def export_data(request, dataset):
+    """Stream an export; ?format=csv|ndjson|json and ?compress=gzip are supported"""
+    if dataset not in exports.DATASETS:
+        raise Http404('Unknown export')
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in exports.FORMATS:
+        return HttpResponseBadRequest('format must be csv, ndjson or json')
+
+    compress = request.GET.get('compress') == 'gzip'
+    content_type, extension = exports.FORMATS[export_format]
+    filename = f'{dataset}.{extension}'
+    if compress:
+        content_type = 'application/gzip'
+        filename += '.gz'
+
+    response = SyncStreamingHttpResponse(
+        exports.stream_export(request.user.profile, dataset, export_format, gzip=compress), content_type=content_type
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 @login_required
 @creator_required
 @activate_ru
@@ -128,16 +170,19 @@ def creator_posts(request):
     """List all posts created by the creator"""
     status_filter = request.GET.get('status', 'all')
 
-    posts = Post.objects.filter(author=request.user)
+    posts = Post.objects.filter(author=request.user).select_related('category')
 
+    # Counts come from the cached creator statistics rather than a COUNT over the listing
+    stats = get_creator_stats(request.user.profile)
+    post_count = stats['total_posts']
     if status_filter != 'all':
         posts = posts.filter(status=status_filter)
-
-    posts = posts.order_by('-created_at')
+        post_count = stats.get(STATUS_COUNT_KEYS.get(status_filter), 0)
 
     context = {
-        'posts': posts,
+        'posts': keyset_paginate(request, posts, per_page=DASHBOARD_PAGE_SIZE),
         'status_filter': status_filter,
+        'post_count': post_count,
     }
 
     return render(request, 'creator/posts.html', context)
@@ -207,18 +252,20 @@ def delete_post(request, post_id):
 def creator_comments(request):
     """Review comments on creator's posts"""
     # Get all comments on posts by this creator
-    comments = (
-        Comment.objects.filter(post__author=request.user).select_related('post', 'author').order_by('-created_at')
-    )
+    comments = Comment.objects.filter(post__author=request.user).select_related('post', 'author')
 
     # Filter by post if specified
     post_id = request.GET.get('post')
     if post_id:
         comments = comments.filter(post_id=post_id)
 
+    comment_count, comment_count_capped = capped_count(comments)
+
     context = {
-        'comments': comments,
+        'comments': keyset_paginate(request, comments, per_page=DASHBOARD_PAGE_SIZE),
         'selected_post_id': post_id,
+        'comment_count': comment_count,
+        'comment_count_capped': comment_count_capped,
     }
 
     return render(request, 'creator/comments.html', context)
@@ -246,11 +293,11 @@ def view_post(request, post_id):
 def creator_subscribers(request):
     """View all subscribers"""
     profile = request.user.profile
-    subscriptions = Subscription.objects.filter(creator=profile).select_related('subscriber').order_by('-created_at')
+    subscriptions = Subscription.objects.filter(creator=profile).select_related('subscriber')
 
     context = {
-        'subscriptions': subscriptions,
-        'subscriber_count': len(subscriptions),
+        'subscriptions': keyset_paginate(request, subscriptions, per_page=DASHBOARD_PAGE_SIZE),
+        'subscriber_count': get_creator_stats(profile)['subscriber_count'],
     }
 
     return render(request, 'creator/subscribers.html', context)
@@ -357,14 +404,14 @@ def delete_tier(request, tier_id):
 def tier_subscribers(request, tier_id):
     """View subscribers of a specific tier"""
     tier = get_object_or_404(SubscriptionTier, id=tier_id, creator=request.user.profile)
-    subscriptions = (
-        TierSubscription.objects.filter(tier=tier, is_active=True).select_related('subscriber').order_by('-created_at')
-    )
+    subscriptions = TierSubscription.objects.filter(tier=tier, is_active=True).select_related('subscriber')
+    subscriber_count, subscriber_count_capped = capped_count(subscriptions)
 
     context = {
         'tier': tier,
-        'subscriptions': subscriptions,
-        'subscriber_count': subscriptions.count(),
+        'subscriptions': keyset_paginate(request, subscriptions, per_page=DASHBOARD_PAGE_SIZE),
+        'subscriber_count': subscriber_count,
+        'subscriber_count_capped': subscriber_count_capped,
     }
 
     return render(request, 'creator/tier_subscribers.html', context)
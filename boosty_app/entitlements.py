@@ -0,0 +1,52 @@
+"""Set-based access rules expressed as SQL subqueries"""
+
+from django.db.models import Exists, OuterRef, Q
+
+from .models import Post, Subscription
+from .models.subscription import active_tier_ids
+
+
+def active_tier_id_set(user):
+    """:func:`active_tier_ids` loaded as a set"""
+    tier_ids = active_tier_ids(user)
+    if isinstance(tier_ids, frozenset):
+        return set(tier_ids)
+    return set(tier_ids.values_list('tier_id', flat=True))
+
+
+def followed_author_ids(user):
+    """Subquery of user ids of the creators the user follows"""
+    return Subscription.objects.filter(subscriber=user).values('creator__user_id')
+
+
+def entitled_post_ids(user):
+    """Subquery of paid post ids unlocked by the user's active tier subscriptions"""
+    return Post.tiers.through.objects.filter(subscriptiontier_id__in=active_tier_ids(user)).values('post_id')
+
+
+def readable_post_filter(user):
+    """Q matching the posts whose content the user may read: :meth:`Post.user_has_access` as SQL
+
+    The author, free posts, paid posts without tiers, and posts unlocked by one
+    of the user's active tiers.
+    """
+    rule = Q(is_free=True) | ~Exists(Post.tiers.through.objects.filter(post_id=OuterRef('pk')))
+    if user.is_authenticated:
+        rule |= Q(author=user) | Q(id__in=entitled_post_ids(user))
+    return rule
+
+
+def discussable_posts(user):
+    """Posts whose comments the user may read and write
+
+    Published posts the user may read (see :func:`readable_post_filter`) or
+    whose creator the user follows, and the user's own posts in any status.
+    Each branch is a semi-join or anti-join, so callers filter with
+    ``post_id__in`` and never need DISTINCT.
+    """
+    if not user.is_authenticated:
+        return Post.objects.filter(readable_post_filter(user), status='published')
+
+    return Post.objects.filter(
+        Q(readable_post_filter(user) | Q(author_id__in=followed_author_ids(user)), status='published') | Q(author=user)
+    )
@@ -0,0 +1,207 @@
+"""In-process pub/sub bus feeding the live event streams
+
+Publishers call :func:`publish` from ordinary (sync) Django code; the event is
+handed to the configured backend once the surrounding transaction commits.
+``LocalBackend`` delivers straight to this process's bus, which is enough for
+a single ASGI worker. ``PostgresBackend`` sends events through
+``pg_notify`` and runs one ``LISTEN`` thread per process, so every worker
+sees events published by any other process.
+
+Each stream holds a :class:`Subscriber` with a bounded queue on the event
+loop that serves it. Subscribers are plain queue entries, so idle streams
+cost no threads, and a stream whose client reads too slowly overflows and is
+closed instead of buffering without limit.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class StreamOverflow(Exception):
+    """The subscriber fell too far behind and missed events"""
+
+
+class Subscriber:
+    """A bounded queue of events from a set of channels, owned by one event loop"""
+
+    def __init__(self, bus, channels, maxsize):
+        self.bus = bus
+        self.channels = frozenset(channels)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def deliver(self, channel, event):
+        """Enqueue an event; runs on the subscriber's loop"""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait((channel, event))
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self):
+        """Wait for the next ``(channel, event)``; raises StreamOverflow once events were dropped"""
+        if self.overflowed:
+            raise StreamOverflow()
+        return await self.queue.get()
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """Routes events published on a channel to the subscribers of that channel in this process"""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels, maxsize=None):
+        """Subscribe the running event loop to ``channels``"""
+        subscriber = Subscriber(self, channels, maxsize or getattr(settings, 'EVENT_STREAM_QUEUE_SIZE', 100))
+        with self._lock:
+            for channel in subscriber.channels:
+                self._subscribers[channel].add(subscriber)
+        get_backend().start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            for channel in subscriber.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return len({s for subscribers in self._subscribers.values() for s in subscribers})
+
+    def dispatch(self, channel, event):
+        """Deliver to local subscribers; safe to call from any thread"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.deliver, channel, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down without unsubscribing
+                self.unsubscribe(subscriber)
+
+
+bus = EventBus()
+
+
+class LocalBackend:
+    """Deliver events only to subscribers in this process"""
+
+    def __init__(self, event_bus):
+        self.bus = event_bus
+
+    def start(self):
+        pass
+
+    def publish(self, channel, event):
+        self.bus.dispatch(channel, event)
+
+
+class PostgresBackend:
+    """Deliver events to every process through Postgres ``LISTEN``/``NOTIFY``"""
+
+    PG_CHANNEL = 'boosty_events'
+    # NOTIFY payloads are limited to 8000 bytes; larger events are sent without their body
+    MAX_PAYLOAD = 7900
+    # How often the listener wakes up to check whether it should stop
+    POLL_SECONDS = 1
+
+    def __init__(self, event_bus):
+        self.bus = event_bus
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def publish(self, channel, event):
+        payload = json.dumps({'channel': channel, 'event': event}, default=str)
+        if len(payload.encode()) > self.MAX_PAYLOAD:
+            trimmed = {'type': event.get('type'), 'id': event.get('id'), 'truncated': True}
+            payload = json.dumps({'channel': channel, 'event': trimmed})
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.PG_CHANNEL, payload])
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._listen, name='event-bus-listener', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Stop the listener thread; used at shutdown and in tests"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _listen(self):
+        import psycopg2
+
+        params = connection.get_connection_params()
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(**params)
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {self.PG_CHANNEL}')
+                while not self._stopped.is_set():
+                    if select.select([conn], [], [], self.POLL_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        message = json.loads(conn.notifies.pop(0).payload)
+                        self.bus.dispatch(message['channel'], message['event'])
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Event listener connection lost; reconnecting')
+                self._stopped.wait(1)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend  # pylint: disable=global-statement
+    if _backend is None:
+        backend_path = getattr(settings, 'EVENT_BUS_BACKEND', 'boosty_app.events.LocalBackend')
+        _backend = import_string(backend_path)(bus)
+    return _backend
+
+
+def publish(channel, event):
+    """Publish ``event`` (a JSON-serializable dict) on ``channel`` after the current transaction commits"""
+    transaction.on_commit(lambda: get_backend().publish(channel, event))
+
+
+def post_comments_channel(post_id):
+    return f'post:{post_id}:comments'
+
+
+def creator_posts_channel(user_id):
+    return f'creator:{user_id}:posts'
@@ -0,0 +1,152 @@
+"""Streaming CSV / NDJSON / JSON exports of a creator's audience and comments"""
+
+import csv
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Subscription, TierSubscription
+
+# Rows fetched per database round trip from the server-side cursor
+CHUNK_SIZE = 2000
+
+# Encoded output is buffered up to roughly this many bytes before being sent
+FLUSH_BYTES = 64 * 1024
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'json': ('application/json', 'json'),
+}
+
+
+def _followers(profile):
+    return Subscription.objects.filter(creator=profile).order_by('id')
+
+
+def _tier_subscribers(profile):
+    return TierSubscription.objects.filter(tier__creator=profile).order_by('id')
+
+
+def _comments(profile):
+    return Comment.objects.filter(post__author_id=profile.user_id).order_by('id')
+
+
+# dataset name -> (queryset factory, [(column header, values() lookup), ...])
+DATASETS = {
+    'subscribers': (
+        _followers,
+        [
+            ('id', 'id'),
+            ('username', 'subscriber__username'),
+            ('email', 'subscriber__email'),
+            ('subscribed_at', 'created_at'),
+        ],
+    ),
+    'tier-subscribers': (
+        _tier_subscribers,
+        [
+            ('id', 'id'),
+            ('username', 'subscriber__username'),
+            ('email', 'subscriber__email'),
+            ('tier', 'tier__name'),
+            ('price', 'tier__price'),
+            ('is_active', 'is_active'),
+            ('start_date', 'start_date'),
+            ('end_date', 'end_date'),
+            ('cancelled_at', 'cancelled_at'),
+            ('payment_status', 'payment_status'),
+        ],
+    ),
+    'comments': (
+        _comments,
+        [
+            ('id', 'id'),
+            ('post_id', 'post_id'),
+            ('post_title', 'post__title'),
+            ('author', 'author__username'),
+            ('content', 'content'),
+            ('created_at', 'created_at'),
+        ],
+    ),
+}
+
+
+class _LineBuffer:
+    """File-like object that hands back whatever csv.writer writes"""
+
+    def write(self, value):
+        return value
+
+
+# Spreadsheets evaluate cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    """Quote user-supplied text that a spreadsheet would run as a formula"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_lines(headers, rows):
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def _ndjson_lines(headers, rows):
+    encoder = DjangoJSONEncoder(separators=(',', ':'), ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(headers, row))) + '\n'
+
+
+def _json_lines(headers, rows):
+    """One JSON array, with an element per line"""
+    separator = '['
+    for line in _ndjson_lines(headers, rows):
+        yield separator + line
+        separator = ','
+    yield '[]\n' if separator == '[' else ']\n'
+
+
+_LINES = {'csv': _csv_lines, 'ndjson': _ndjson_lines, 'json': _json_lines}
+
+
+def _buffered(lines):
+    """Join encoded lines into chunks of about FLUSH_BYTES"""
+    buffer = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= FLUSH_BYTES:
+            yield b''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(profile, dataset, export_format='csv', gzip=False):
+    """Yield the encoded export as byte chunks; memory use is independent of row count"""
+    queryset_factory, columns = DATASETS[dataset]
+    headers = [header for header, _ in columns]
+    rows = queryset_factory(profile).values_list(*[lookup for _, lookup in columns]).iterator(chunk_size=CHUNK_SIZE)
+
+    lines = _LINES[export_format](headers, rows)
+    chunks = _buffered(lines)
+    return _gzipped(chunks) if gzip else chunks
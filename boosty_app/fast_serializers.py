@@ -0,0 +1,378 @@
+"""Read-only list serializers that build plain dicts from ``.values()`` rows
+
+Each fast serializer reproduces the output of one ``ModelSerializer`` byte for
+byte on a hot list endpoint. Its field plan (output key, column, formatter) is
+compiled once per class from the model serializer's own fields, so datetimes,
+decimals and file URLs are still formatted by DRF; what goes away is building
+model instances, binding fields per object and resolving related objects one
+at a time. Like the model serializers, datetimes are left unformatted for
+renderers that encode them natively. Everything a row needs beyond its own columns is loaded for the
+whole page in :meth:`FastSerializer.prepare`.
+
+Fields that are not plain columns (nested serializers, method fields,
+properties) need a ``get_<field>(row)`` method on the fast serializer;
+compiling a plan without one raises ``ImproperlyConfigured`` so a field added
+to the model serializer cannot silently drift. ``method_columns`` lists the
+columns each method reads, so a field pruned by ``?fields=``/``?expand=``
+(see :mod:`boosty_app.fieldsets`) takes its columns, annotations and batch
+loads with it.
+"""
+
+from collections import defaultdict
+from operator import itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from rest_framework import serializers
+
+from .entitlements import active_tier_id_set
+from .fieldsets import FieldSet
+from .loaders import annotate_follow_counts, profile_loader, subquery_count
+from .models import Category, Comment, Post, SubscriptionTier, TierSubscription
+from .reactions import reaction_counts, viewer_reactions
+from .renderers import native_datetimes
+from .serializers import (
+    COMMENTS_PREVIEW_SIZE,
+    AnnotatedProfileSerializer,
+    CategorySerializer,
+    CommentSerializer,
+    PostSerializer,
+    PostSummarySerializer,
+    SubscriptionTierSerializer,
+    UserProfileSerializer,
+    locked_excerpt,
+    summary_text,
+)
+
+# Fields whose to_representation() returns a values() column unchanged
+RAW_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.ReadOnlyField,
+)
+FORMATTED_FIELDS = (serializers.DateField, serializers.DecimalField)
+
+
+class FastSerializer:
+    """Serialize ``values()`` rows the way ``serializer_class`` serializes instances"""
+
+    serializer_class = None
+    # Columns read by each get_<field>() method and the prepare() work for it; 'id' is always loaded
+    method_columns = {}
+
+    _plans = {}
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.request = self.context.get('request')
+        self.user = getattr(self.request, 'user', None)
+        self.loader = profile_loader(self.context, AnnotatedProfileSerializer)
+        self.native_datetimes = native_datetimes(self.context)
+        fieldset = self.context.get('fieldset') or FieldSet()
+        self.selection = fieldset.select(
+            [name for name, *_ in self.plan()], getattr(self.serializer_class.Meta, 'expandable', {})
+        )
+        self._getters = [
+            (name, self._getter(column, kind, arg) if self.wants(name) else itemgetter(self.selection[name]))
+            for name, column, kind, arg in self.plan()
+            if name in self.selection
+        ]
+
+    @classmethod
+    def plan(cls):
+        """``[(name, column, kind, arg), ...]`` in the model serializer's field order"""
+        if cls not in FastSerializer._plans:
+            FastSerializer._plans[cls] = cls._compile()
+        return FastSerializer._plans[cls]
+
+    @classmethod
+    def _compile(cls):
+        model = cls.serializer_class.Meta.model
+        plan = []
+        for name, field in cls.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            column = field.source.replace('.', '__')
+            if hasattr(cls, f'get_{name}'):
+                plan.append((name, None, 'method', f'get_{name}'))
+            elif isinstance(field, serializers.FileField):
+                plan.append((name, column, 'file', model._meta.get_field(column).storage))
+            elif isinstance(field, RAW_FIELDS):
+                plan.append((name, column, 'raw', None))
+            elif isinstance(field, serializers.DateTimeField):
+                plan.append((name, column, 'datetime', field.to_representation))
+            elif isinstance(field, FORMATTED_FIELDS):
+                plan.append((name, column, 'format', field.to_representation))
+            else:
+                raise ImproperlyConfigured(
+                    f'{cls.__name__} needs a get_{name}() method for the {type(field).__name__} {name!r}'
+                )
+        return plan
+
+    def _getter(self, column, kind, arg):
+        if kind == 'method':
+            return getattr(self, arg)
+        if kind == 'raw' or (kind == 'datetime' and self.native_datetimes):
+            return itemgetter(column)
+        if kind in ('format', 'datetime'):
+            return lambda row: None if row[column] is None else arg(row[column])
+
+        def file_url(row):
+            if not row[column]:
+                return None
+            url = arg.url(row[column])
+            return self.request.build_absolute_uri(url) if self.request is not None else url
+
+        return file_url
+
+    def wants(self, name):
+        """Whether ``name`` is serialized in full (not pruned or collapsed to an id)"""
+        return name in self.selection and self.selection[name] is None
+
+    def nested_context(self):
+        """Context for serializers embedded in this one, which ignore the request's fieldset"""
+        return {key: value for key, value in self.context.items() if key != 'fieldset'}
+
+    def columns(self):
+        columns = ['id']
+        for name, column, kind, _ in self.plan():
+            if name not in self.selection:
+                continue
+            if not self.wants(name):
+                columns.append(self.selection[name])
+            elif kind == 'method':
+                columns.extend(self.method_columns.get(name, ()))
+            else:
+                columns.append(column)
+        return list(dict.fromkeys(columns))
+
+    def annotate(self, queryset):
+        return queryset
+
+    def rows(self, queryset):
+        """The single ``values()`` query the rows come from; paginate it like a queryset"""
+        return self.annotate(queryset).values(*self.columns())
+
+    def prepare(self, rows):
+        """Load whatever the page's rows need beyond their own columns"""
+
+    def serialize(self, rows):
+        rows = list(rows)
+        if rows:
+            self.prepare(rows)
+        getters = self._getters
+        return [{name: get(row) for name, get in getters} for row in rows]
+
+
+class FastUserProfileSerializer(FastSerializer):
+    serializer_class = UserProfileSerializer
+    method_columns = {'subscriber_count': ('follower_total',), 'following_count': ('following_total',)}
+
+    def annotate(self, queryset):
+        if self.wants('subscriber_count') or self.wants('following_count'):
+            return annotate_follow_counts(queryset)
+        return queryset
+
+    def get_subscriber_count(self, row):
+        return row['follower_total']
+
+    def get_following_count(self, row):
+        return row['following_total']
+
+
+class FastCategorySerializer(FastSerializer):
+    serializer_class = CategorySerializer
+
+
+class FastCommentSerializer(FastSerializer):
+    serializer_class = CommentSerializer
+    method_columns = {'author': ('author_id',)}
+
+    def prepare(self, rows):
+        if self.wants('author'):
+            self.loader.prime_users(row['author_id'] for row in rows)
+
+    def get_author(self, row):
+        return self.loader.for_user(row['author_id'])
+
+
+class FastSubscriptionTierSerializer(FastSerializer):
+    serializer_class = SubscriptionTierSerializer
+    method_columns = {
+        'creator': ('creator_id',),
+        'subscriber_count': ('active_subscriber_total',),
+        'post_count': ('published_post_total',),
+    }
+
+    def annotate(self, queryset):
+        if self.wants('subscriber_count'):
+            queryset = queryset.annotate(
+                active_subscriber_total=subquery_count(TierSubscription.objects.filter(is_active=True), 'tier')
+            )
+        if self.wants('post_count'):
+            queryset = queryset.annotate(
+                published_post_total=subquery_count(
+                    Post.tiers.through.objects.filter(post__status='published'), 'subscriptiontier'
+                )
+            )
+        return queryset
+
+    def prepare(self, rows):
+        if self.wants('creator'):
+            self.loader.prime_profiles(row['creator_id'] for row in rows)
+
+    def get_creator(self, row):
+        return self.loader.for_profile(row['creator_id'])
+
+    def get_subscriber_count(self, row):
+        return row['active_subscriber_total']
+
+    def get_post_count(self, row):
+        return row['published_post_total']
+
+
+class FastPostSerializer(FastSerializer):
+    """``PostSerializer`` for lists: comment previews, tiers, categories, access and reactions load once per page"""
+
+    serializer_class = PostSerializer
+    # Fields whose value depends on the viewer's access to the post
+    ACCESS_FIELDS = ('user_has_access', 'is_locked', 'content', 'excerpt', 'comments_preview')
+    method_columns = {
+        'author': ('author_id',),
+        'category': ('category_id',),
+        'comments_count': ('comment_total',),
+        'comments_preview': ('author_id', 'is_free'),
+        'is_published': ('status',),
+        'is_draft': ('status',),
+        'user_has_access': ('author_id', 'is_free'),
+        'is_locked': ('author_id', 'is_free'),
+        'content': ('author_id', 'is_free', 'content', 'excerpt'),
+        'excerpt': ('author_id', 'is_free', 'excerpt', 'summary_text'),
+        'view_count': ('view_count',),
+    }
+
+    def annotate(self, queryset):
+        if self.wants('comments_count'):
+            queryset = queryset.annotate(comment_total=subquery_count(Comment.objects.all(), 'post'))
+        if self.wants('excerpt'):
+            queryset = queryset.annotate(summary_text=summary_text())
+        return queryset
+
+    def prepare(self, rows):
+        ids = [row['id'] for row in rows]
+        if self.wants('author'):
+            self.loader.prime_users(row['author_id'] for row in rows)
+
+        if self.wants('category'):
+            categories = FastCategorySerializer(self.nested_context())
+            category_ids = {row['category_id'] for row in rows} - {None}
+            self.categories = {
+                category['id']: category
+                for category in categories.serialize(categories.rows(Category.objects.filter(id__in=category_ids)))
+            }
+
+        if self.wants('comments_preview'):
+            comments = FastCommentSerializer(self.nested_context())
+            ranked = (
+                Comment.objects.filter(post_id__in=ids, parent__isnull=True)
+                .annotate(
+                    preview_rank=Window(
+                        RowNumber(), partition_by=F('post_id'), order_by=[F('created_at').asc(), F('id').asc()]
+                    )
+                )
+                .filter(preview_rank__lte=COMMENTS_PREVIEW_SIZE)
+                .order_by('created_at', 'id')
+            )
+            comment_rows = list(comments.rows(ranked))
+            self.comments_preview = defaultdict(list)
+            for row, comment in zip(comment_rows, comments.serialize(comment_rows)):
+                self.comments_preview[row['post']].append(comment)
+
+        checks_access = any(self.wants(name) for name in self.ACCESS_FIELDS)
+        self.tiers = defaultdict(list)
+        if self.wants('tiers') or checks_access:
+            # Same order as post.tiers.all()
+            tier_order = [f'subscriptiontier__{field}' for field in SubscriptionTier._meta.ordering]
+            tier_rows = (
+                Post.tiers.through.objects.filter(post_id__in=ids)
+                .order_by(*tier_order)
+                .values_list('post_id', 'subscriptiontier_id', 'subscriptiontier__name', 'subscriptiontier__price')
+            )
+            for post_id, tier_id, name, price in tier_rows:
+                self.tiers[post_id].append({'id': tier_id, 'name': name, 'price': str(price)})
+
+        self.viewer_tier_ids = set()
+        if checks_access and self.user is not None and self.user.is_authenticated:
+            self.viewer_tier_ids = active_tier_id_set(self.user)
+
+        targets = [Post(pk=pk) for pk in ids]
+        if self.wants('reaction_counts'):
+            self.reaction_counts = reaction_counts(targets)
+        if self.wants('my_reactions'):
+            self.my_reactions = viewer_reactions(self.user, targets) if self.user is not None else {}
+
+    def _has_access(self, row):
+        """``Post.user_has_access`` against the entitlements loaded in prepare()"""
+        if row['author_id'] == self.user.id or row['is_free']:
+            return True
+        tier_ids = {tier['id'] for tier in self.tiers[row['id']]}
+        return not tier_ids or bool(tier_ids & self.viewer_tier_ids)
+
+    def get_author(self, row):
+        return self.loader.for_user(row['author_id'])
+
+    def get_category(self, row):
+        return self.categories.get(row['category_id'])
+
+    def get_comments_preview(self, row):
+        return self.comments_preview[row['id']] if self._readable(row) else []
+
+    def get_comments_count(self, row):
+        return row['comment_total']
+
+    def get_is_published(self, row):
+        return row['status'] == 'published'
+
+    def get_is_draft(self, row):
+        return row['status'] == 'draft'
+
+    def get_tiers(self, row):
+        return self.tiers[row['id']]
+
+    def get_user_has_access(self, row):
+        return self._readable(row)
+
+    def get_is_locked(self, row):
+        if row['is_free']:
+            return False
+        return not self._has_access(row) if self.user is not None else True
+
+    def _readable(self, row):
+        return self._has_access(row) if self.user is not None else row['is_free']
+
+    def get_content(self, row):
+        return row['content'] if self._readable(row) else locked_excerpt(row['excerpt'])
+
+    def get_excerpt(self, row):
+        return row['summary_text'] if self._readable(row) else locked_excerpt(row['excerpt'])
+
+    def get_view_count(self, row):
+        from .view_counter import post_views
+
+        return row['view_count'] + post_views.pending(row['id'])
+
+    def get_reaction_counts(self, row):
+        return self.reaction_counts[row['id']]
+
+    def get_my_reactions(self, row):
+        return self.my_reactions.get(row['id'], [])
+
+
+class FastPostSummarySerializer(FastPostSerializer):
+    """``PostSummarySerializer`` for lists: never selects ``content``"""
+
+    serializer_class = PostSummarySerializer
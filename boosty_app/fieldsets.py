@@ -0,0 +1,65 @@
+"""Sparse fieldsets (``?fields=``) and expansion control (``?expand=``) for read requests
+
+``?fields=id,title,author`` limits each top-level object to the listed fields.
+``?expand=author`` embeds only the listed relations: an expandable relation
+that is not listed is collapsed to its id (``author`` becomes the author's
+user id), or left out when it has no single id (``comments``). Without
+``?expand=`` every relation stays embedded, as before.
+
+Serializers declare their relations in ``Meta.expandable`` as
+``{field: id_column_or_None}``. Pruned fields are never evaluated, and the
+fast list serializers also drop the columns, joins, annotations and batch
+loads that only those fields needed.
+"""
+
+from dataclasses import dataclass
+
+from rest_framework.exceptions import ValidationError
+
+
+def _names(value):
+    if value is None:
+        return None
+    return frozenset(name.strip() for name in value.split(',') if name.strip())
+
+
+@dataclass(frozen=True)
+class FieldSet:
+    fields: frozenset = None
+    expand: frozenset = None
+
+    def includes(self, name):
+        return self.fields is None or name in self.fields
+
+    def select(self, names, expandable):
+        """Map each selected field name to None (serialize it) or the column it collapses to
+
+        ``names`` are the serializer's fields in output order; fields that are
+        pruned, or collapsed without an id column, are left out.
+        """
+        unknown = (self.fields or frozenset()) - set(names)
+        if unknown:
+            raise ValidationError({'fields': f'Unknown field(s): {", ".join(sorted(unknown))}'})
+        unknown = (self.expand or frozenset()) - set(expandable)
+        if unknown:
+            raise ValidationError({'expand': f'Cannot expand: {", ".join(sorted(unknown))}'})
+
+        selection = {}
+        for name in names:
+            if not self.includes(name):
+                continue
+            if name in expandable and self.expand is not None and name not in self.expand:
+                if expandable[name] is not None:
+                    selection[name] = expandable[name]
+                continue
+            selection[name] = None
+        return selection
+
+
+def parse_fieldset(query_params):
+    """The FieldSet requested by ``?fields=``/``?expand=``, or None if neither is given"""
+    # An empty ?fields= means no restriction; an empty ?expand= collapses every relation
+    fields, expand = _names(query_params.get('fields')) or None, _names(query_params.get('expand'))
+    if fields is None and expand is None:
+        return None
+    return FieldSet(fields=fields, expand=expand)
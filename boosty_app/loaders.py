@@ -0,0 +1,93 @@
+"""Request-scoped batch loading of the profiles nested serializers embed"""
+
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Subscription, UserProfile
+
+
+def subquery_count(queryset, field):
+    """Count of ``queryset`` rows whose ``field`` points at the outer row, as a correlated subquery"""
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(total=Count('*'))
+    return Coalesce(Subquery(counts.values('total'), output_field=IntegerField()), 0)
+
+
+def annotate_follow_counts(queryset):
+    """Annotate profiles with ``follower_total`` and ``following_total``"""
+    return queryset.annotate(
+        follower_total=subquery_count(Subscription.objects.all(), 'creator'),
+        following_total=subquery_count(Subscription.objects.all(), 'subscriber__profile'),
+    )
+
+
+def annotated_profiles():
+    """Profiles with their follower and following counts as correlated subqueries"""
+    return annotate_follow_counts(UserProfile.objects.select_related('user'))
+
+
+class ProfileLoader:
+    """Collect the profiles a response needs, load them in one query and memoize their serialized form
+
+    Keys are queued with :meth:`prime_users` / :meth:`prime_profiles` (usually
+    by a list serializer before it serializes its items). The first lookup of
+    a key that is not loaded yet fetches every queued key at once. Fragments
+    stay cached for the rest of the request, so an author who wrote many of
+    the posts and comments on a page is loaded and counted once.
+
+    ``serializer_class`` (``serializers.AnnotatedProfileSerializer``) turns
+    each annotated profile into its fragment.
+    """
+
+    def __init__(self, serializer_class, context=None):
+        self.serializer_class = serializer_class
+        self.context = context or {}
+        self._by_user = {}
+        self._by_profile = {}
+        self._pending_users = set()
+        self._pending_profiles = set()
+
+    def prime_users(self, user_ids):
+        self._pending_users.update(uid for uid in user_ids if uid is not None and uid not in self._by_user)
+
+    def prime_profiles(self, profile_ids):
+        self._pending_profiles.update(pid for pid in profile_ids if pid is not None and pid not in self._by_profile)
+
+    def for_user(self, user_id):
+        """Serialized profile of the user with ``user_id``, or None if they have no profile"""
+        if user_id not in self._by_user:
+            self._pending_users.add(user_id)
+            self._load()
+        return self._by_user[user_id]
+
+    def for_profile(self, profile_id):
+        if profile_id not in self._by_profile:
+            self._pending_profiles.add(profile_id)
+            self._load()
+        return self._by_profile[profile_id]
+
+    def _load(self):
+        users, profiles = self._pending_users, self._pending_profiles
+        self._pending_users, self._pending_profiles = set(), set()
+        for profile in annotated_profiles().filter(Q(user_id__in=users) | Q(id__in=profiles)):
+            data = self.serializer_class(profile, context=self.context).data
+            self._by_user[profile.user_id] = self._by_profile[profile.id] = data
+        for user_id in users:
+            self._by_user.setdefault(user_id, None)
+        for profile_id in profiles:
+            self._by_profile.setdefault(profile_id, None)
+
+
+def profile_loader(context, serializer_class):
+    """The profile loader shared by every serializer in the current request
+
+    Lives on the request when there is one, otherwise on the serializer
+    context, so serializers built without a request still batch within
+    themselves.
+    """
+    request = context.get('request')
+    if request is None:
+        return context.setdefault('profile_loader', ProfileLoader(serializer_class))
+    loader = getattr(request, '_profile_loader', None)
+    if loader is None:
+        loader = request._profile_loader = ProfileLoader(serializer_class, {'request': request})
+    return loader
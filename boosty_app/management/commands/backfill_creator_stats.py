@@ -0,0 +1,27 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from boosty_app.analytics import backfill
+
+
+class Command(BaseCommand):
+    help = 'Rebuild creator daily stats history in parallel date chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day to rebuild (default: today)')
+        parser.add_argument('--days', type=int, default=365, help='Days to rebuild when --start is omitted')
+        parser.add_argument('--chunk-days', type=int, default=30, help='Days per chunk')
+        parser.add_argument('--workers', type=int, default=4, help='Chunks processed in parallel')
+
+    def handle(self, *args, **options):
+        end = options['end'] or timezone.now().date()
+        start = options['start'] or end - timedelta(days=options['days'] - 1)
+        if start > end:
+            raise CommandError('--start must not be after --end')
+
+        self.stdout.write(f'Rebuilding creator daily stats from {start} to {end}...')
+        written = backfill(start, end, chunk_days=options['chunk_days'], workers=options['workers'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} creator daily stats rows'))
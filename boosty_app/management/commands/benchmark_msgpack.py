@@ -0,0 +1,69 @@
+import io
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.fast_serializers import FastPostSummarySerializer
+from boosty_app.models import Post, TierSubscription
+from boosty_app.renderers import MessagePackParser, MessagePackRenderer, ORJSONParser, ORJSONRenderer, msgpack
+from boosty_app.serializers import TierSubscriptionSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare JSON and MessagePack payload size and encode/decode time on data from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='Rows serialized per endpoint')
+        parser.add_argument('--iterations', type=int, default=200, help='Encode/decode rounds per measurement')
+
+    def _time(self, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1000
+
+    def _context(self, renderer):
+        # Serializers format datetimes according to the negotiated renderer
+        request = Request(APIRequestFactory().get('/api/'))
+        request.user = AnonymousUser()
+        request.accepted_renderer = renderer
+        return {'request': request}
+
+    def handle(self, *args, **options):
+        if msgpack is None:
+            raise CommandError('msgpack is not installed')
+
+        limit = options['limit']
+
+        def posts(context):
+            serializer = FastPostSummarySerializer(context)
+            return serializer.serialize(serializer.rows(Post.objects.filter(status='published'))[:limit])
+
+        def tier_subscriptions(context):
+            queryset = TierSubscription.objects.select_related('tier', 'subscriber')[:limit]
+            return TierSubscriptionSerializer(queryset, many=True, context=context).data
+
+        iterations = options['iterations']
+        for name, build in [('posts', posts), ('tier-subscriptions', tier_subscriptions)]:
+            results = {}
+            for label, renderer, parser in [
+                ('json', ORJSONRenderer(), ORJSONParser()),
+                ('msgpack', MessagePackRenderer(), MessagePackParser()),
+            ]:
+                data = build(self._context(renderer))
+                encoded = renderer.render(data)
+                results[label] = (
+                    len(encoded),
+                    self._time(lambda renderer=renderer, data=data: renderer.render(data), iterations),
+                    self._time(lambda parser=parser, encoded=encoded: parser.parse(io.BytesIO(encoded)), iterations),
+                )
+
+            self.stdout.write(f'{name}: {len(data)} items')
+            for label, (size, encode, decode) in results.items():
+                self.stdout.write(f'  {label}: {size} bytes, encode {encode:.3f} ms, decode {decode:.3f} ms')
+            self.stdout.write(f'  msgpack size: {results["msgpack"][0] / results["json"][0]:.0%} of json')
+
+        self.stdout.write(self.style.SUCCESS('MessagePack benchmark completed!'))
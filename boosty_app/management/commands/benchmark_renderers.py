@@ -0,0 +1,62 @@
+import io
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.models import Post, SubscriptionTier
+from boosty_app.renderers import ORJSONParser, ORJSONRenderer
+from boosty_app.serializers import PostSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compare the stdlib and orjson JSON renderers and parsers on data from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100, help='Published posts in the serialized payload')
+        parser.add_argument('--iterations', type=int, default=200, help='Encode/decode rounds per measurement')
+
+    def _time(self, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1000
+
+    def handle(self, *args, **options):
+        request = Request(APIRequestFactory().get('/api/posts/'))
+        request.user = AnonymousUser()
+        posts = Post.objects.filter(status='published').select_related('category').order_by('-created_at')
+        payloads = {
+            # What /api/posts/ renders: strings produced by serializer fields
+            'posts': PostSerializer(posts[: options['posts']], many=True, context={'request': request}).data,
+            # Raw Decimal and datetime values, as returned by .values() and aggregates
+            'tier values': list(SubscriptionTier.objects.values('id', 'name', 'price', 'created_at', 'updated_at')),
+        }
+
+        iterations = options['iterations']
+        for name, data in payloads.items():
+            encoded = JSONRenderer().render(data)
+            rows = [
+                (
+                    'render',
+                    lambda data=data: JSONRenderer().render(data),
+                    lambda data=data: ORJSONRenderer().render(data),
+                ),
+                (
+                    'parse',
+                    lambda encoded=encoded: JSONParser().parse(io.BytesIO(encoded)),
+                    lambda encoded=encoded: ORJSONParser().parse(io.BytesIO(encoded)),
+                ),
+            ]
+            self.stdout.write(f'{name}: {len(data)} items, {len(encoded)} bytes')
+            for label, stdlib, fast in rows:
+                baseline = self._time(stdlib, iterations)
+                candidate = self._time(fast, iterations)
+                speedup = baseline / candidate if candidate else float('inf')
+                self.stdout.write(f'  {label}: json {baseline:.3f} ms, orjson {candidate:.3f} ms ({speedup:.1f}x)')
+
+        self.stdout.write(self.style.SUCCESS('Renderer benchmark completed!'))
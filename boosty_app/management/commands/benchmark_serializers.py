@@ -0,0 +1,62 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.fast_serializers import (
+    FastPostSerializer,
+    FastPostSummarySerializer,
+    FastSubscriptionTierSerializer,
+    FastUserProfileSerializer,
+)
+from boosty_app.models import Post, SubscriptionTier, UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Compare the model serializers with the values-based fast serializers on data from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='Rows serialized per endpoint')
+        parser.add_argument('--iterations', type=int, default=20, help='Serialization rounds per measurement')
+
+    def _time(self, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations * 1000
+
+    def _context(self):
+        # A fresh request per round, so the per-request profile loader starts cold for both implementations
+        request = Request(APIRequestFactory().get('/api/'))
+        request.user = AnonymousUser()
+        return {'request': request}
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        cases = [
+            ('posts', FastPostSerializer, Post.objects.filter(status='published')),
+            ('post summaries', FastPostSummarySerializer, Post.objects.filter(status='published')),
+            ('creators', FastUserProfileSerializer, UserProfile.objects.filter(is_creator=True)),
+            ('tiers', FastSubscriptionTierSerializer, SubscriptionTier.objects.filter(is_active=True)),
+        ]
+
+        for name, fast_class, queryset in cases:
+
+            def slow(fast_class=fast_class, queryset=queryset):
+                return fast_class.serializer_class(queryset[:limit], many=True, context=self._context()).data
+
+            def fast(fast_class=fast_class, queryset=queryset):
+                serializer = fast_class(self._context())
+                return serializer.serialize(serializer.rows(queryset)[:limit])
+
+            baseline = self._time(slow, options['iterations'])
+            candidate = self._time(fast, options['iterations'])
+            speedup = baseline / candidate if candidate else float('inf')
+            self.stdout.write(
+                f'{name}: {len(queryset[:limit])} rows, '
+                f'model {baseline:.2f} ms, fast {candidate:.2f} ms ({speedup:.1f}x)'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Serializer benchmark completed!'))
@@ -0,0 +1,58 @@
+import time
+import tracemalloc
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.fast_serializers import FastPostSummarySerializer
+from boosty_app.models import Post
+from boosty_app.renderers import ORJSONRenderer
+from boosty_app.streaming import CHUNK_SIZE, json_array, serialized_chunks
+
+
+class Command(BaseCommand):
+    help = 'Compare a buffered and a streamed JSON list of every post: time to first byte, total time, peak memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows serialized per streamed chunk')
+
+    def _serializer(self):
+        request = Request(APIRequestFactory().get('/api/posts/my_posts/'))
+        request.user = AnonymousUser()
+        return FastPostSummarySerializer({'request': request})
+
+    def _measure(self, chunks):
+        """Consume ``chunks`` like a WSGI server: (first byte ms, total ms, peak KiB, bytes)"""
+        tracemalloc.start()
+        start = time.perf_counter()
+        first = None
+        size = 0
+        for chunk in chunks:
+            if first is None:
+                first = time.perf_counter() - start
+            size += len(chunk)
+        total = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return first * 1000, total * 1000, peak / 1024, size
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.all()
+
+        def buffered():
+            serializer = self._serializer()
+            yield ORJSONRenderer().render(serializer.serialize(serializer.rows(queryset)))
+
+        def streamed():
+            return json_array(serialized_chunks(self._serializer(), queryset, options['chunk_size']))
+
+        self.stdout.write(f'posts: {queryset.count()} rows')
+        for name, chunks in [('buffered', buffered), ('streamed', streamed)]:
+            first, total, peak, size = self._measure(chunks())
+            self.stdout.write(
+                f'  {name}: first byte {first:.1f} ms, total {total:.1f} ms, peak {peak:.0f} KiB, {size} bytes'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Streaming benchmark completed!'))
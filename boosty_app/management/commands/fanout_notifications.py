@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from boosty_app.notifications import FanoutWorker
+
+
+class Command(BaseCommand):
+    help = 'Deliver inbox notifications for recently published posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Recipients notified per transaction')
+        parser.add_argument('--limit', type=int, default=None, help='Process at most this many posts')
+
+    def handle(self, *args, **options):
+        stats = FanoutWorker(batch_size=options['batch_size']).run(limit=options['limit'])
+
+        self.stdout.write(f'Posts: {stats.posts}, notifications delivered: {stats.delivered}')
+        self.stdout.write(self.style.SUCCESS('Notification fan-out completed!'))
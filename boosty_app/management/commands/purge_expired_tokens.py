@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from boosty_app.models import DeviceToken
+from boosty_app.pagination import deferred_count_invalidation
+
+
+class Command(BaseCommand):
+    help = 'Delete API tokens that have expired'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tokens deleted per statement')
+
+    def handle(self, *args, **options):
+        expired = DeviceToken.objects.filter(expires_at__lte=timezone.now())
+        deleted = 0
+        with deferred_count_invalidation():
+            while ids := list(expired.values_list('pk', flat=True)[: options['batch_size']]):
+                deleted += DeviceToken.objects.filter(pk__in=ids).delete()[0]
+
+        self.stdout.write(f'Expired tokens deleted: {deleted}')
+        self.stdout.write(self.style.SUCCESS('Token purge completed!'))
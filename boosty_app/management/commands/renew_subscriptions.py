@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from boosty_app.renewals import RenewalEngine
+
+
+class Command(BaseCommand):
+    help = 'Charge and extend tier subscriptions whose period ends soon'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window-hours', type=int, default=24, help='Renew subscriptions ending within this window'
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Subscriptions processed per batch')
+
+    def handle(self, *args, **options):
+        engine = RenewalEngine(batch_size=options['batch_size'])
+        stats = engine.run(window=timedelta(hours=options['window_hours']))
+
+        self.stdout.write(
+            f'Renewed: {stats.renewed}, failed (will retry): {stats.failed}, '
+            f'exhausted: {stats.exhausted}, skipped: {stats.skipped}'
+        )
+        self.stdout.write(self.style.SUCCESS('Subscription renewal completed!'))
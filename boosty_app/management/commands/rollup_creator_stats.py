@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from boosty_app.analytics import run_incremental_rollup
+
+
+class Command(BaseCommand):
+    help = 'Fold rows changed since the last run into the creator daily stats rollup'
+
+    def handle(self, *args, **options):
+        updated = run_incremental_rollup()
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} creator daily stats rows'))
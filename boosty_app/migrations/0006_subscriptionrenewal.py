@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0005_subscriptiontier_post_tiers_tiersubscription"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubscriptionRenewal",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "renewal_key",
+                    models.CharField(
+                        help_text="Identifies the renewed period; one renewal per subscription period",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "period_start",
+                    models.DateTimeField(
+                        help_text="Start of the period being paid for"
+                    ),
+                ),
+                (
+                    "period_end",
+                    models.DateTimeField(help_text="End of the period being paid for"),
+                ),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=10)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                            ("exhausted", "Exhausted"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        help_text="Earliest time the next charge attempt may run"
+                    ),
+                ),
+                (
+                    "transaction_id",
+                    models.CharField(blank=True, max_length=255, null=True),
+                ),
+                ("last_error", models.CharField(blank=True, max_length=255)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="tiersubscription",
+            index=models.Index(
+                fields=["is_active", "end_date"], name="boosty_app__is_acti_47d246_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="subscriptionrenewal",
+            name="subscription",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="renewals",
+                to="boosty_app.tiersubscription",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subscriptionrenewal",
+            index=models.Index(
+                fields=["status", "next_attempt_at"],
+                name="boosty_app__status_56ac80_idx",
+            ),
+        ),
+    ]
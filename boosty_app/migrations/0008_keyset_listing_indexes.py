@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0007_creatordailystats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="boosty_app__author__c7f8a4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "status", "-created_at", "-id"],
+                name="boosty_app__author__cd8871_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subscription",
+            index=models.Index(
+                fields=["creator", "-created_at", "-id"],
+                name="boosty_app__creator_e65e5c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tiersubscription",
+            index=models.Index(
+                fields=["tier", "is_active", "-created_at", "-id"],
+                name="boosty_app__tier_id_414d8e_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def set_root_paths(apps, schema_editor):
+    """Existing comments are all top-level; their path is just their own id"""
+    from boosty_app.models.comment import encode_path_segment
+
+    Comment = apps.get_model("boosty_app", "Comment")
+    batch = []
+    for comment in Comment.objects.only("id").iterator(chunk_size=2000):
+        comment.path = encode_path_segment(comment.id)
+        batch.append(comment)
+        if len(batch) >= 2000:
+            Comment.objects.bulk_update(batch, ["path"])
+            batch = []
+    if batch:
+        Comment.objects.bulk_update(batch, ["path"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0008_keyset_listing_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="parent",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="replies",
+                to="boosty_app.comment",
+            ),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Ancestor ids, root first, ending with this id",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="reply_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Number of replies in this subtree"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "path"],
+                name="comment_post_path_idx",
+                opclasses=["int8_ops", "varchar_pattern_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                condition=models.Q(("parent__isnull", True)),
+                fields=["post", "created_at", "id"],
+                name="comment_post_toplevel_idx",
+            ),
+        ),
+        migrations.RunPython(set_root_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0009_threaded_comments"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "created_at"], name="comment_post_created_idx"
+            ),
+        ),
+    ]
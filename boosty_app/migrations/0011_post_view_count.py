@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0010_comment_post_created_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="view_count",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
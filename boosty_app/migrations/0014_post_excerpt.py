@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:10
+
+from django.db import migrations, models
+
+
+def fill_excerpts(apps, schema_editor):
+    from boosty_app.models.post import make_excerpt
+
+    Post = apps.get_model("boosty_app", "Post")
+    batch = []
+    for post in Post.objects.only("id", "content").iterator(chunk_size=2000):
+        post.excerpt = make_excerpt(post.content)
+        if post.excerpt:
+            batch.append(post)
+        if len(batch) >= 2000:
+            Post.objects.bulk_update(batch, ["excerpt"])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ["excerpt"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0013_notifications"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="excerpt",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="Start of long content, so lists never read the full body; empty for short posts",
+                max_length=150,
+            ),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
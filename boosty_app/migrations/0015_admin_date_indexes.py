@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0014_post_excerpt"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["created_at", "-id"], name="comment_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="boosty_app__created_eb1455_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subscription",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="boosty_app__created_d85a48_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tiersubscription",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="boosty_app__created_93bd4b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="boosty_app__created_38d8d6_idx"
+            ),
+        ),
+    ]
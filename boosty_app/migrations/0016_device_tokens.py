@@ -0,0 +1,98 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:57
+
+import hashlib
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def import_drf_tokens(apps, schema_editor):
+    """Carry existing DRF tokens over, so signed-in clients keep working until the new tokens expire"""
+    Token = apps.get_model("authtoken", "Token")
+    DeviceToken = apps.get_model("boosty_app", "DeviceToken")
+    expires_at = timezone.now() + settings.AUTH_TOKEN_TTL
+    DeviceToken.objects.bulk_create(
+        (
+            DeviceToken(
+                user_id=token.user_id,
+                digest=hashlib.sha256(token.key.encode()).hexdigest(),
+                device="legacy",
+                expires_at=expires_at,
+            )
+            for token in Token.objects.iterator(chunk_size=2000)
+        ),
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0015_admin_date_indexes"),
+        ("authtoken", "0004_alter_tokenproxy_options"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeviceToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "digest",
+                    models.CharField(
+                        help_text="SHA-256 of the token key", max_length=64, unique=True
+                    ),
+                ),
+                (
+                    "device",
+                    models.CharField(
+                        blank=True,
+                        help_text="Name the client gave when logging in",
+                        max_length=100,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("expires_at", models.DateTimeField()),
+                (
+                    "last_used_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Written in batches; may lag a little",
+                        null=True,
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="device_tokens",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "device"], name="boosty_app__user_id_2c1369_idx"
+                    ),
+                    models.Index(
+                        fields=["expires_at"], name="boosty_app__expires_2184c4_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(import_drf_tokens, migrations.RunPython.noop),
+    ]
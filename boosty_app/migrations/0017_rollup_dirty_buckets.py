@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0016_device_tokens"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupDirtyBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("creator_id", models.BigIntegerField()),
+                ("day", models.DateField()),
+            ],
+            options={
+                "unique_together": {("creator_id", "day")},
+            },
+        ),
+    ]
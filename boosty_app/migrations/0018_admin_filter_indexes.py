@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("boosty_app", "0017_rollup_dirty_buckets"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="subscriptiontier",
+            index=models.Index(fields=["created_at"], name="tier_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tiersubscription",
+            index=models.Index(fields=["start_date"], name="tiersub_start_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tiersubscription",
+            index=models.Index(fields=["end_date"], name="tiersub_end_date_idx"),
+        ),
+    ]
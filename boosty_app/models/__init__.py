@@ -4,11 +4,16 @@ All models are imported here for backward compatibility
 """
 
 # Import order matters to avoid circular dependencies
+from .analytics import CreatorDailyStats, RollupDirtyBucket, RollupWatermark
 from .category import Category
 from .comment import Comment
+from .notification import Notification, NotificationFanout
 from .post import Post
+from .reaction import Reaction, ReactionCounter
+from .renewal import SubscriptionRenewal
 from .subscription import Subscription, TierSubscription
 from .tier import SubscriptionTier
+from .token import DeviceToken
 from .user import UserProfile
 
 __all__ = [
@@ -19,4 +24,13 @@ __all__ = [
     'Subscription',
     'SubscriptionTier',
     'TierSubscription',
+    'SubscriptionRenewal',
+    'CreatorDailyStats',
+    'RollupWatermark',
+    'RollupDirtyBucket',
+    'Reaction',
+    'ReactionCounter',
+    'Notification',
+    'NotificationFanout',
+    'DeviceToken',
 ]
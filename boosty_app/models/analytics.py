@@ -0,0 +1,52 @@
+from django.db import models
+
+from .user import UserProfile
+
+
+class CreatorDailyStats(models.Model):
+    """Per-creator, per-day rollup of audience and content activity"""
+
+    creator = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    new_followers = models.PositiveIntegerField(default=0)
+    new_tier_subscribers = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    posts = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Creator daily stats"
+        ordering = ['creator', 'day']
+        unique_together = ['creator', 'day']
+
+    def __str__(self):
+        return f"{self.creator.user.username} - {self.day}"
+
+
+class RollupWatermark(models.Model):
+    """High-water mark of source rows already folded into a rollup"""
+
+    name = models.CharField(max_length=100, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
+
+
+class RollupDirtyBucket(models.Model):
+    """A (creator, day) rollup bucket that lost a source row and must be recounted
+
+    Deleted rows leave no timestamp for the incremental rollup to find, so
+    deletion signals record their bucket here instead. ``creator_id`` is a
+    plain id: the creator may be deleted in the same transaction.
+    """
+
+    creator_id = models.BigIntegerField()
+    day = models.DateField()
+
+    class Meta:
+        unique_together = ['creator_id', 'day']
+
+    def __str__(self):
+        return f"{self.creator_id} - {self.day}"
@@ -1,20 +1,101 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
 
+from .counters import CounterFieldsModel
 from .post import Post
 
+# Each ancestor id is stored as a fixed-width base-36 segment of the materialized path,
+# so lexical order of paths is depth-first thread order
+PATH_SEGMENT_WIDTH = 8
+PATH_MAX_LENGTH = 255
+MAX_DEPTH = PATH_MAX_LENGTH // PATH_SEGMENT_WIDTH - 1
+_BASE36 = '0123456789abcdefghijklmnopqrstuvwxyz'
 
-class Comment(models.Model):
-    """Comment model for posts"""
+
+def encode_path_segment(pk):
+    segment = ''
+    while pk:
+        pk, remainder = divmod(pk, 36)
+        segment = _BASE36[remainder] + segment
+    return segment.rjust(PATH_SEGMENT_WIDTH, '0')
+
+
+def decode_path(path):
+    """Return the comment ids making up a materialized path, root first"""
+    return [int(path[i : i + PATH_SEGMENT_WIDTH], 36) for i in range(0, len(path), PATH_SEGMENT_WIDTH)]
+
+
+class Comment(CounterFieldsModel):
+    """Comment model for posts, threaded through a materialized path"""
 
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
+    path = models.CharField(
+        max_length=PATH_MAX_LENGTH,
+        blank=True,
+        editable=False,
+        help_text='Ancestor ids, root first, ending with this id',
+    )
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    reply_count = models.PositiveIntegerField(default=0, editable=False, help_text='Number of replies in this subtree')
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Bumped on ancestors as replies come and go
+    counter_fields = ('reply_count',)
+
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # Subtree loads are a prefix range scan on path within one post
+            models.Index(
+                fields=['post', 'path'], name='comment_post_path_idx', opclasses=['int8_ops', 'varchar_pattern_ops']
+            ),
+            models.Index(
+                fields=['post', 'created_at', 'id'], name='comment_post_toplevel_idx', condition=Q(parent__isnull=True)
+            ),
+            models.Index(fields=['post', 'created_at'], name='comment_post_created_idx'),
+            # Site-wide listings (the admin changelist) and their date range filters
+            models.Index(fields=['created_at', '-id'], name='comment_created_idx'),
+        ]
 
     def __str__(self):
         return f'Comment by {self.author.username} on {self.post.title}'
+
+    @property
+    def ancestor_ids(self):
+        return decode_path(self.path)[:-1] if self.path else []
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # The path ends with this comment's own id, so it can only be written after the insert
+            parent_path = self.parent.path if self.parent_id else ''
+            self.path = parent_path + encode_path_segment(self.pk)
+            self.depth = self.parent.depth + 1 if self.parent_id else 0
+            Comment.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+            if self.parent_id:
+                Comment.objects.filter(pk__in=self.ancestor_ids).update(reply_count=F('reply_count') + 1)
+
+    def delete(self, *args, **kwargs):
+        # Replies are removed by the cascade; ancestors lose this whole subtree
+        with transaction.atomic():
+            ancestor_ids = self.ancestor_ids
+            removed = 1 + Comment.objects.filter(pk=self.pk).values_list('reply_count', flat=True).get()
+            result = super().delete(*args, **kwargs)
+            if ancestor_ids:
+                Comment.objects.filter(pk__in=ancestor_ids).update(reply_count=F('reply_count') - removed)
+        return result
+
+    def subtree(self):
+        """All replies below this comment in depth-first order, via one indexed range query"""
+        return Comment.objects.filter(post_id=self.post_id, path__startswith=self.path, depth__gt=self.depth).order_by(
+            'path'
+        )
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class CounterFieldsModel(models.Model):
+    """Leaves ``counter_fields`` out of full saves of existing rows
+
+    Counters are bumped with ``F()`` or raw UPDATEs while instances loaded
+    earlier are still in use; writing every column back from such an instance
+    would undo those increments. Pass ``update_fields`` to write a counter.
+    """
+
+    counter_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
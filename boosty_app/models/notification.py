@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class Notification(models.Model):
+    """An inbox entry telling a user about a newly published post"""
+
+    KIND_CHOICES = [
+        ('new_post', 'New post'),
+    ]
+
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    post = models.ForeignKey('Post', on_delete=models.CASCADE, related_name='notifications')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='new_post')
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        constraints = [
+            models.UniqueConstraint(fields=['recipient', 'post', 'kind'], name='notification_unique_per_post'),
+        ]
+        indexes = [
+            # The inbox is a range scan over one recipient's newest entries
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notification_inbox_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} for {self.recipient.username}: post {self.post_id}'
+
+
+class NotificationFanout(models.Model):
+    """Progress of delivering one post's notifications; ``cursor`` is the last recipient id done"""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+    ]
+
+    post = models.OneToOneField('Post', on_delete=models.CASCADE, related_name='fanout')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    cursor = models.BigIntegerField(default=0, help_text='Recipients with a higher user id are still to be notified')
+    delivered = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f'Fan-out of post {self.post_id} ({self.status})'
@@ -2,9 +2,19 @@ from django.contrib.auth.models import User
 from django.db import models
 
 from .category import Category
+from .counters import CounterFieldsModel
+from .subscription import active_tier_ids
 
+# Characters of content kept in Post.excerpt for list views and locked previews
+EXCERPT_LENGTH = 150
 
-class Post(models.Model):
+
+def make_excerpt(content):
+    """Leading slice of ``content`` stored for lists; empty when the content is no longer than that"""
+    return content[:EXCERPT_LENGTH] if len(content) > EXCERPT_LENGTH else ''
+
+
+class Post(CounterFieldsModel):
     """Post model for content with draft system"""
 
     STATUS_CHOICES = [
@@ -28,15 +38,37 @@ class Post(models.Model):
         related_name='posts',
         help_text='Subscription tiers that can access this post. Leave empty if post is free.',
     )
+    view_count = models.PositiveBigIntegerField(default=0, editable=False)
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        help_text='Start of long content, so lists never read the full body; empty for short posts',
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Flushed by the view counter buffer
+    counter_fields = ('view_count',)
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['author', '-created_at', '-id']),
+            models.Index(fields=['author', 'status', '-created_at', '-id']),
+            models.Index(fields=['-created_at', '-id']),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.excerpt = make_excerpt(self.content)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
     @property
     def is_published(self):
         return self.status == 'published'
@@ -46,7 +78,10 @@ class Post(models.Model):
         return self.status == 'draft'
 
     def user_has_access(self, user):
-        """Check if a user has access to this post"""
+        """Check if a user has access to this post
+
+        Keep in step with ``entitlements.readable_post_filter``, the same rule for querysets.
+        """
         # Author always has access
         if user == self.author:
             return True
@@ -61,14 +96,7 @@ class Post(models.Model):
 
         # Check if user has active subscription to any of the post's tiers
         if user.is_authenticated:
-            from django.utils import timezone
-
-            from .subscription import TierSubscription
-
-            user_tier_ids = TierSubscription.objects.filter(
-                subscriber=user, is_active=True, end_date__gte=timezone.now()
-            ).values_list('tier_id', flat=True)
-
-            return self.tiers.filter(id__in=user_tier_ids).exists()
+            # Answered from a signed access token's claims when the request carries one
+            return self.tiers.filter(id__in=active_tier_ids(user)).exists()
 
         return False
@@ -0,0 +1,73 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import Q
+
+REACTION_KINDS = [
+    ('like', 'Like'),
+    ('heart', 'Heart'),
+    ('fire', 'Fire'),
+    ('laugh', 'Laugh'),
+    ('wow', 'Wow'),
+]
+
+# A reaction targets exactly one post or one comment
+_ONE_TARGET = Q(post__isnull=False, comment__isnull=True) | Q(post__isnull=True, comment__isnull=False)
+
+
+class Reaction(models.Model):
+    """A user's reaction of one kind to a post or comment; the row is the membership record"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reactions')
+    post = models.ForeignKey('Post', on_delete=models.CASCADE, null=True, blank=True, related_name='reactions')
+    comment = models.ForeignKey('Comment', on_delete=models.CASCADE, null=True, blank=True, related_name='reactions')
+    kind = models.CharField(max_length=20, choices=REACTION_KINDS)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.CheckConstraint(condition=_ONE_TARGET, name='reaction_one_target'),
+            models.UniqueConstraint(
+                fields=['user', 'post', 'kind'], condition=Q(post__isnull=False), name='reaction_unique_post'
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'comment', 'kind'], condition=Q(comment__isnull=False), name='reaction_unique_comment'
+            ),
+        ]
+
+    def __str__(self):
+        target = f'post {self.post_id}' if self.post_id else f'comment {self.comment_id}'
+        return f'{self.user.username} reacted {self.kind} to {target}'
+
+
+class ReactionCounter(models.Model):
+    """One shard of a reaction total; a target's total is the sum of its shards
+
+    Writers pick a random shard, so concurrent reactions to a popular post
+    update different rows instead of queueing on a single counter row. A
+    shard may go negative when removals land on a different shard than the
+    matching additions; only the sum is meaningful.
+    """
+
+    post = models.ForeignKey('Post', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    comment = models.ForeignKey('Comment', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    kind = models.CharField(max_length=20, choices=REACTION_KINDS)
+    shard = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(condition=_ONE_TARGET, name='reactioncounter_one_target'),
+            models.UniqueConstraint(
+                fields=['post', 'kind', 'shard'], condition=Q(post__isnull=False), name='reactioncounter_unique_post'
+            ),
+            models.UniqueConstraint(
+                fields=['comment', 'kind', 'shard'],
+                condition=Q(comment__isnull=False),
+                name='reactioncounter_unique_comment',
+            ),
+        ]
+
+    def __str__(self):
+        target = f'post {self.post_id}' if self.post_id else f'comment {self.comment_id}'
+        return f'{self.kind} on {target} [shard {self.shard}]: {self.count}'
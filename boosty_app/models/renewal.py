@@ -0,0 +1,41 @@
+from django.db import models
+
+
+class SubscriptionRenewal(models.Model):
+    """One charge attempt series for renewing a tier subscription period"""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+        ('exhausted', 'Exhausted'),
+    ]
+
+    subscription = models.ForeignKey('TierSubscription', on_delete=models.CASCADE, related_name='renewals')
+    renewal_key = models.CharField(
+        max_length=64, unique=True, help_text='Identifies the renewed period; one renewal per subscription period'
+    )
+    period_start = models.DateTimeField(help_text='Start of the period being paid for')
+    period_end = models.DateTimeField(help_text='End of the period being paid for')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(help_text='Earliest time the next charge attempt may run')
+    transaction_id = models.CharField(max_length=255, blank=True, null=True)
+    last_error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"Renewal {self.renewal_key} ({self.status})"
+
+    @staticmethod
+    def make_key(subscription_id, period_start):
+        """Build the idempotency key for renewing a subscription from period_start"""
+        return f"{subscription_id}:{period_start:%Y%m%d%H%M%S}"
@@ -6,6 +6,9 @@ from django.utils import timezone
 
 from .user import UserProfile
 
+# Length of one paid subscription period
+SUBSCRIPTION_PERIOD = timedelta(days=30)
+
 
 class Subscription(models.Model):
     """Legacy subscription model - kept for backwards compatibility"""
@@ -17,6 +20,10 @@ class Subscription(models.Model):
     class Meta:
         unique_together = ['subscriber', 'creator']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['creator', '-created_at', '-id']),
+            models.Index(fields=['-created_at', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.subscriber.username} follows {self.creator.user.username}"
@@ -55,15 +62,21 @@ class TierSubscription(models.Model):
         indexes = [
             models.Index(fields=['subscriber', 'is_active']),
             models.Index(fields=['tier', 'is_active']),
+            models.Index(fields=['is_active', 'end_date']),
+            models.Index(fields=['tier', 'is_active', '-created_at', '-id']),
+            models.Index(fields=['-created_at', '-id']),
+            # Admin date filters
+            models.Index(fields=['start_date'], name='tiersub_start_date_idx'),
+            models.Index(fields=['end_date'], name='tiersub_end_date_idx'),
         ]
 
     def __str__(self):
         return f"{self.subscriber.username} - {self.tier.name} ({'Active' if self.is_active else 'Inactive'})"
 
     def save(self, *args, **kwargs):
-        # Set end_date to 30 days from start if not set
+        # Set end_date to one period from start if not set
         if not self.end_date and not self.pk:
-            self.end_date = timezone.now() + timedelta(days=30)
+            self.end_date = timezone.now() + SUBSCRIPTION_PERIOD
         super().save(*args, **kwargs)
 
     def cancel(self):
@@ -88,3 +101,13 @@ class TierSubscription(models.Model):
             return 0
         delta = self.end_date - timezone.now()
         return max(0, delta.days)
+
+
+def active_tier_ids(user):
+    """Tier ids the user currently pays for: the snapshot in a signed access token, else a subquery"""
+    claims = getattr(user, 'access_claims', None)
+    if claims is not None:
+        return claims.tier_ids
+    return TierSubscription.objects.filter(subscriber=user, is_active=True, end_date__gte=timezone.now()).values(
+        'tier_id'
+    )
@@ -23,6 +23,8 @@ class SubscriptionTier(models.Model):
     class Meta:
         ordering = ['creator', 'order', 'price']
         unique_together = ['creator', 'name']
+        # Admin date filter
+        indexes = [models.Index(fields=['created_at'], name='tier_created_idx')]
 
     def __str__(self):
         return f"{self.creator.user.username} - {self.name} (${self.price}/month)"
@@ -0,0 +1,23 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+
+class DeviceToken(models.Model):
+    """An expiring API token issued to one device of a user; only a digest of the key is stored"""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='device_tokens')
+    digest = models.CharField(max_length=64, unique=True, help_text='SHA-256 of the token key')
+    device = models.CharField(max_length=100, blank=True, help_text='Name the client gave when logging in')
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    last_used_at = models.DateTimeField(null=True, blank=True, help_text='Written in batches; may lag a little')
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'device']),
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} on {self.device or 'unnamed device'}"
@@ -14,11 +14,15 @@ class UserProfile(models.Model):
     )
     bio = models.TextField(max_length=500, blank=True, validators=[MinLengthValidator(10)])
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
+    unread_notifications = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s profile"
@@ -0,0 +1,135 @@
+"""Inbox notifications fanned out to a creator's audience when a post is published"""
+
+from dataclasses import dataclass
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Notification, NotificationFanout, Subscription, TierSubscription, UserProfile
+
+
+def queue_fanout(post):
+    """Schedule notifications for a published post; returns False if it was already fanned out"""
+    _, created = NotificationFanout.objects.get_or_create(post=post)
+    return created
+
+
+def audience(post):
+    """Users to notify about ``post``: followers of its author and tier subscribers who can read it
+
+    Both sources are semi-joins against ``auth_user``, so someone who follows
+    the creator and also pays for a tier appears once.
+    """
+    followers = Subscription.objects.filter(creator__user_id=post.author_id).values('subscriber_id')
+    tier_subscribers = TierSubscription.objects.filter(
+        tier__creator__user_id=post.author_id, is_active=True, end_date__gte=timezone.now()
+    )
+    tier_ids = list(post.tiers.values_list('id', flat=True))
+    if not post.is_free and tier_ids:
+        tier_subscribers = tier_subscribers.filter(tier_id__in=tier_ids)
+
+    return (
+        User.objects.filter(Q(id__in=followers) | Q(id__in=tier_subscribers.values('subscriber_id')))
+        .exclude(id=post.author_id)
+        .order_by('id')
+    )
+
+
+@dataclass
+class FanoutStats:
+    posts: int = 0
+    delivered: int = 0
+
+
+class FanoutWorker:
+    """Deliver pending post notifications in chunks of ``batch_size`` recipients
+
+    Recipient ids are streamed in id order with keyset pagination. Each chunk
+    inserts its notifications with ``bulk_create``, bumps the recipients'
+    unread counters and advances the job cursor in one transaction, so a
+    worker that dies mid-post resumes after the last committed chunk without
+    notifying anyone twice. Jobs are claimed with ``SKIP LOCKED``, so several
+    workers can run side by side.
+    """
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+
+    def run(self, limit=None):
+        stats = FanoutStats()
+        pending = NotificationFanout.objects.filter(status='pending').order_by('created_at', 'id')
+        for job_id in pending.values_list('id', flat=True)[:limit]:
+            delivered = self.deliver(job_id)
+            if delivered is not None:
+                stats.posts += 1
+                stats.delivered += delivered
+        return stats
+
+    def deliver(self, job_id):
+        """Run one fan-out job to completion; returns None if another worker holds it"""
+        delivered = 0
+        while True:
+            with transaction.atomic():
+                job = (
+                    NotificationFanout.objects.select_for_update(skip_locked=True)
+                    .select_related('post')
+                    .filter(pk=job_id, status='pending')
+                    .first()
+                )
+                if job is None:
+                    return delivered or None
+
+                recipient_ids = []
+                if job.post.status == 'published':
+                    recipient_ids = list(
+                        audience(job.post).filter(id__gt=job.cursor).values_list('id', flat=True)[: self.batch_size]
+                    )
+                notified = self._notify(job.post, recipient_ids)
+                if recipient_ids:
+                    job.cursor = recipient_ids[-1]
+                if len(recipient_ids) < self.batch_size:
+                    job.status = 'done'
+                job.delivered += notified
+                delivered += notified
+                job.save(update_fields=['cursor', 'status', 'delivered', 'updated_at'])
+
+            if job.status == 'done':
+                return delivered
+
+    def _notify(self, post, recipient_ids):
+        # Skip anyone already notified so unread counters are bumped exactly once
+        existing = set(
+            Notification.objects.filter(post=post, recipient_id__in=recipient_ids).values_list(
+                'recipient_id', flat=True
+            )
+        )
+        recipient_ids = [recipient_id for recipient_id in recipient_ids if recipient_id not in existing]
+        if not recipient_ids:
+            return 0
+        Notification.objects.bulk_create(
+            [Notification(recipient_id=recipient_id, post=post) for recipient_id in recipient_ids],
+            ignore_conflicts=True,
+        )
+        UserProfile.objects.filter(user_id__in=recipient_ids).update(unread_notifications=F('unread_notifications') + 1)
+        return len(recipient_ids)
+
+
+def mark_read(user, ids=None):
+    """Mark the user's notifications read (all of them unless ``ids`` is given); returns how many changed"""
+    with transaction.atomic():
+        unread = Notification.objects.filter(recipient=user, is_read=False)
+        if ids is not None:
+            unread = unread.filter(id__in=ids)
+        changed = unread.update(is_read=True)
+        if changed:
+            UserProfile.objects.filter(user=user).update(
+                unread_notifications=Greatest(F('unread_notifications') - changed, 0)
+            )
+    return changed
+
+
+def unread_count(user):
+    return UserProfile.objects.filter(user=user).values_list('unread_notifications', flat=True).first() or 0
@@ -0,0 +1,341 @@
+"""Pagination helpers for large listings"""
+
+import base64
+import binascii
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections, transaction
+from django.db.models import Q, QuerySet
+from django.db.models.sql import Query
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+COUNT_KEY = 'count:{digest}'
+COUNT_VERSION_KEY = 'count-version:{table}'
+COUNT_ESTIMATE_KEY = 'count-estimate:{table}'
+
+# Tables collected by an active deferred_count_invalidation() block in this thread
+_deferred = threading.local()
+
+
+def encode_cursor(value, pk):
+    """Encode a (timestamp, id) position as an opaque URL-safe token"""
+    raw = f'{value.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor token; returns None if it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        value, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(value), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def capped_count(queryset, cap=1000):
+    """Count rows up to ``cap`` so large result sets never cost a full scan
+
+    Returns ``(count, is_capped)``; when capped the true count is larger than ``cap``.
+    """
+    count = queryset.order_by()[: cap + 1].count()
+    return min(count, cap), count > cap
+
+
+def _table_version(table):
+    key = COUNT_VERSION_KEY.format(table=table)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so a version evicted from the cache never comes back with old counts
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_versions(tables):
+    for table in tables:
+        key = COUNT_VERSION_KEY.format(table=table)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate_counts(*tables):
+    """Expire every cached count that reads any of the given database tables"""
+    pending = getattr(_deferred, 'tables', None)
+    if pending is not None:
+        pending.update(tables)
+        return
+    _bump_versions(tables)
+    # Again on commit, in case a reader counted and cached the pre-commit rows in between
+    transaction.on_commit(lambda: _bump_versions(tables))
+
+
+@contextmanager
+def deferred_count_invalidation():
+    """Invalidate each table written inside the block once, when it ends, instead of once per row
+
+    Used around operations whose per-row signals would otherwise bump the same
+    tables thousands of times, such as a cascading bulk delete.
+    """
+    if getattr(_deferred, 'tables', None) is not None:
+        yield
+        return
+    _deferred.tables = set()
+    try:
+        yield
+    finally:
+        tables, _deferred.tables = _deferred.tables, None
+        if tables:
+            invalidate_counts(*tables)
+
+
+def estimated_rows(model, using='default'):
+    """The planner's row estimate for ``model``'s table (``pg_class.reltuples``), or None if there is none"""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    # The estimate only moves when autovacuum or ANALYZE runs, so it is cached like a count
+    key = COUNT_ESTIMATE_KEY.format(table=model._meta.db_table)
+    estimate = cache.get(key)
+    if estimate is None:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)', [model._meta.db_table])
+            row = cursor.fetchone()
+        # -1 until the table is first vacuumed or analyzed
+        estimate = int(row[0]) if row else -1
+        cache.set(key, estimate, getattr(settings, 'COUNT_CACHE_TIMEOUT', 300))
+    return estimate if estimate >= 0 else None
+
+
+def query_tables(query):
+    """Every table ``query`` reads: its joins and those of subqueries in filters, annotations and combinations"""
+    tables = {query.get_meta().db_table} | {alias.table_name for alias in query.alias_map.values()}
+    pending = [query.where, *query.annotations.values()]
+    for combined in query.combined_queries:
+        tables |= query_tables(combined)
+    while pending:
+        node = pending.pop()
+        # Exists/Subquery wrap a Query; "__in" lookups on a queryset hold one directly
+        inner = node if isinstance(node, Query) else getattr(node, 'query', None)
+        if isinstance(inner, Query):
+            tables |= query_tables(inner)
+            continue
+        if hasattr(node, 'get_source_expressions'):
+            pending.extend(expression for expression in node.get_source_expressions() if expression is not None)
+    return tables
+
+
+def _cached_count(queryset, count):
+    """Run ``count()`` once per distinct query and version of the tables it reads"""
+    query = queryset.order_by().query
+    try:
+        sql, params = query.sql_with_params()
+    except EmptyResultSet:
+        return 0, False
+    tables = query_tables(query)
+    versions = [(table, _table_version(table)) for table in sorted(tables)]
+    digest = hashlib.md5(repr((sql, params, versions)).encode(), usedforsecurity=False).hexdigest()
+    key = COUNT_KEY.format(digest=digest)
+
+    result = cache.get(key)
+    if result is None:
+        result = count()
+        cache.set(key, result, getattr(settings, 'COUNT_CACHE_TIMEOUT', 300))
+    return result
+
+
+def count_rows(queryset):
+    """``(count, approximate)`` for a paginated listing of ``queryset``
+
+    Tables the planner estimates below ``COUNT_ESTIMATE_THRESHOLD`` rows are
+    counted exactly and the count is cached until a write to one of the
+    tables it reads (see :func:`invalidate_counts`). Above it, an unfiltered
+    listing reports the planner's estimate and a filtered one is counted up
+    to ``COUNT_CAP`` rows; both are flagged approximate.
+    """
+    if queryset.query.is_empty():
+        return 0, False
+    estimate = estimated_rows(queryset.model, queryset.db)
+    if estimate is None or estimate < getattr(settings, 'COUNT_ESTIMATE_THRESHOLD', 100_000):
+        return _cached_count(queryset, lambda: (queryset.count(), False))
+
+    query = queryset.query
+    if not query.where and len(query.alias_map) <= 1 and not query.combinator:
+        return estimate, True
+    return _cached_count(queryset, lambda: capped_count(queryset, getattr(settings, 'COUNT_CAP', 10_000)))
+
+
+class EstimatedPage(Page):
+    # Set for pages of an approximate count, which cannot tell from the count whether more rows follow
+    has_more = None
+
+    def has_next(self):
+        return super().has_next() if self.has_more is None else self.has_more
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose count comes from :func:`count_rows`
+
+    When the count is approximate, pages past it are still served (an
+    estimate can be low) and each page reads one extra row to know whether
+    another page follows.
+    """
+
+    @cached_property
+    def _counted(self):
+        if not isinstance(self.object_list, QuerySet):
+            return len(self.object_list), False
+        return count_rows(self.object_list)
+
+    @cached_property
+    def count(self):
+        return self._counted[0]
+
+    @property
+    def approximate(self):
+        return self._counted[1]
+
+    def validate_number(self, number):
+        if not self.approximate:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError) as exc:
+            raise PageNotAnInteger(self.error_messages['invalid_page']) from exc
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        if not self.approximate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        items = list(self.object_list[bottom : bottom + self.per_page + 1])
+        page = self._get_page(items[: self.per_page], number, self)
+        page.has_more = len(items) > self.per_page
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return EstimatedPage(*args, **kwargs)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """Page-number pagination with cached, estimated or capped counts; ``count_is_approximate`` flags the latter"""
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                'count': self.page.paginator.count,
+                'count_is_approximate': self.page.paginator.approximate,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+                'results': data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_approximate'] = {'type': 'boolean', 'example': False}
+        return response_schema
+
+
+class KeysetPage:
+    """One page of a keyset-paginated listing; iterates like the list of items"""
+
+    def __init__(self, items, next_cursor, query_params, cursor_param='cursor'):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.is_first = cursor_param not in query_params
+        self._query_params = query_params
+        self._cursor_param = cursor_param
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def _query_string(self, cursor):
+        params = self._query_params.copy()
+        params.pop(self._cursor_param, None)
+        if cursor:
+            params[self._cursor_param] = cursor
+        return '?' + params.urlencode() if params else '?'
+
+    @property
+    def next_query(self):
+        return self._query_string(self.next_cursor)
+
+    @property
+    def first_query(self):
+        return self._query_string(None)
+
+
+def keyset_paginate(request, queryset, per_page=50, field='created_at', cursor_param='cursor'):
+    """Return the page of ``queryset`` after the request's cursor, newest first
+
+    Rows are ordered by ``(field, id)`` descending and the next page starts
+    strictly after the last row seen, so every page is a bounded index range
+    scan no matter how deep the reader has paged.
+    """
+    queryset = queryset.order_by(f'-{field}', '-id')
+    position = decode_cursor(request.GET.get(cursor_param))
+    if position:
+        value, pk = position
+        queryset = queryset.filter(Q(**{f'{field}__lt': value}) | Q(**{field: value, 'id__lt': pk}))
+
+    items = list(queryset[: per_page + 1])
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, field), last.pk)
+
+    return KeysetPage(items, next_cursor, request.GET, cursor_param)
+
+
+class CommentThreadPagination(CursorPagination):
+    """Top-level comments of a post, oldest first"""
+
+    page_size = 20
+    ordering = ('created_at', 'id')
+
+
+class CommentReplyPagination(CursorPagination):
+    """Replies below a comment in depth-first thread order"""
+
+    page_size = 50
+    ordering = 'path'
+
+
+class NotificationPagination(CursorPagination):
+    """A user's inbox, newest first"""
+
+    page_size = 20
+    ordering = ('-created_at', '-id')
@@ -0,0 +1,68 @@
+"""Pluggable payment backends used for charging tier subscriptions"""
+
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+@dataclass(frozen=True)
+class Charge:
+    """A single charge request; idempotency_key lets providers drop duplicates"""
+
+    idempotency_key: str
+    subscriber_id: int
+    amount: Decimal
+    description: str = ''
+
+
+@dataclass(frozen=True)
+class ChargeResult:
+    idempotency_key: str
+    success: bool
+    transaction_id: str = ''
+    error: str = ''
+
+
+class BasePaymentBackend:
+    """Interface for payment providers"""
+
+    def charge_many(self, charges):
+        """Charge a batch of requests, returning one ChargeResult per Charge in the same order"""
+        raise NotImplementedError
+
+
+class FakePaymentBackend(BasePaymentBackend):
+    """Local provider for development and tests - never talks to the network
+
+    Charges succeed unless the subscriber is listed in ``failing_subscribers``.
+    Results are remembered per idempotency key, so replaying a charge returns
+    the original outcome instead of charging twice.
+    """
+
+    def __init__(self, failing_subscribers=None):
+        self.failing_subscribers = set(failing_subscribers or [])
+        self.processed = {}
+
+    def charge_many(self, charges):
+        results = []
+        for charge in charges:
+            result = self.processed.get(charge.idempotency_key)
+            if result is None or not result.success:
+                if charge.subscriber_id in self.failing_subscribers:
+                    result = ChargeResult(charge.idempotency_key, False, error='Card declined')
+                else:
+                    result = ChargeResult(charge.idempotency_key, True, transaction_id=f'FAKE_{uuid.uuid4().hex}')
+                self.processed[charge.idempotency_key] = result
+            results.append(result)
+        return results
+
+
+def get_payment_backend():
+    """Instantiate the backend configured in settings.PAYMENT_BACKEND"""
+    if not settings.PAYMENT_BACKEND:
+        raise ImproperlyConfigured('PAYMENT_BACKEND is not set; refusing to renew subscriptions without a provider')
+    return import_string(settings.PAYMENT_BACKEND)()
@@ -0,0 +1,109 @@
+"""Post and comment reactions backed by sharded, cached counters"""
+
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+
+from .models import Comment, Post, Reaction, ReactionCounter
+from .models.reaction import REACTION_KINDS
+
+CACHE_KEY = 'reactions:{field}:{pk}'
+KINDS = {kind for kind, _ in REACTION_KINDS}
+
+
+def _shard_count():
+    return getattr(settings, 'REACTION_COUNTER_SHARDS', 16)
+
+
+def _cache_timeout():
+    return getattr(settings, 'REACTION_COUNTS_CACHE_TIMEOUT', 60)
+
+
+def _target_field(target):
+    if isinstance(target, Post):
+        return 'post'
+    if isinstance(target, Comment):
+        return 'comment'
+    raise TypeError(f'Cannot react to {type(target).__name__}')
+
+
+def _bump(field, target_id, kind, delta):
+    """Add ``delta`` to one randomly chosen shard, creating the shard row on first use"""
+    lookup = {f'{field}_id': target_id, 'kind': kind, 'shard': random.randrange(_shard_count())}
+    shard = ReactionCounter.objects.filter(**lookup)
+    if not shard.update(count=F('count') + delta):
+        ReactionCounter.objects.bulk_create([ReactionCounter(**lookup)], ignore_conflicts=True)
+        shard.update(count=F('count') + delta)
+
+    # Delete again on commit in case a reader re-cached the pre-commit totals in between
+    key = CACHE_KEY.format(field=field, pk=target_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def add_reaction(user, target, kind):
+    """Record ``user``'s reaction; returns False if it already existed"""
+    field = _target_field(target)
+    with transaction.atomic():
+        _, created = Reaction.objects.get_or_create(user=user, kind=kind, **{field: target})
+        if created:
+            _bump(field, target.pk, kind, 1)
+    return created
+
+
+def remove_reaction(user, target, kind):
+    """Remove ``user``'s reaction; returns False if there was none"""
+    field = _target_field(target)
+    with transaction.atomic():
+        deleted, _ = Reaction.objects.filter(user=user, kind=kind, **{field: target}).delete()
+        if deleted:
+            _bump(field, target.pk, kind, -1)
+    return bool(deleted)
+
+
+def reaction_counts(targets):
+    """Map each target id to its ``{kind: total}`` counts, summing shards only for cache misses"""
+    targets = list(targets)
+    if not targets:
+        return {}
+    field = _target_field(targets[0])
+    keys = {CACHE_KEY.format(field=field, pk=target.pk): target.pk for target in targets}
+    cached = cache.get_many(keys)
+    counts = {keys[key]: value for key, value in cached.items()}
+
+    missing = [pk for key, pk in keys.items() if key not in cached]
+    if missing:
+        fresh = {pk: {} for pk in missing}
+        rows = (
+            ReactionCounter.objects.filter(**{f'{field}_id__in': missing})
+            .values_list(f'{field}_id', 'kind')
+            .annotate(total=Sum('count'))
+            .order_by()
+        )
+        for pk, kind, total in rows:
+            if total:
+                fresh[pk][kind] = total
+        cache.set_many(
+            {CACHE_KEY.format(field=field, pk=pk): value for pk, value in fresh.items()}, timeout=_cache_timeout()
+        )
+        counts.update(fresh)
+    return counts
+
+
+def viewer_reactions(user, targets):
+    """Map each target id to the sorted kinds ``user`` reacted with, in one query"""
+    targets = list(targets)
+    mine = defaultdict(list)
+    if not targets or not user.is_authenticated:
+        return mine
+    field = _target_field(targets[0])
+    rows = Reaction.objects.filter(user=user, **{f'{field}_id__in': [t.pk for t in targets]}).values_list(
+        f'{field}_id', 'kind'
+    )
+    for pk, kind in rows.order_by('kind'):
+        mine[pk].append(kind)
+    return mine
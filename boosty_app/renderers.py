@@ -0,0 +1,109 @@
+"""orjson-backed JSON and optional MessagePack renderers and parsers for DRF
+
+The JSON pair are drop-in replacements for DRF's ``JSONRenderer``/``JSONParser``.
+orjson encodes ``datetime``, ``date``, ``time`` and ``UUID`` natively in C; the
+few types it does not know (``Decimal``, ``timedelta``, lazy translation
+strings, querysets) fall back to DRF's own encoder hook so the output matches
+the stdlib renderer.
+
+The MessagePack pair serve ``application/msgpack`` when the ``msgpack``
+package is installed. Serializers leave datetimes unformatted for it (see
+``serializers.NativeDateTimesMixin``), so they are packed as MessagePack
+timestamps; decimals are packed as their exact digits in a string.
+"""
+
+import codecs
+import datetime
+from decimal import Decimal
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed to serve application/msgpack
+    msgpack = None
+
+_fallback = JSONEncoder().default
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def dumps(data, options=OPTIONS):
+    """Encode ``data`` exactly as :class:`ORJSONRenderer` does"""
+    ret = orjson.dumps(data, default=_fallback, option=options)
+
+    # Same as JSONRenderer: U+2028/U+2029 are valid JSON but not valid JavaScript string literals
+    return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            # orjson only indents by two spaces; any requested indent (e.g. the browsable API) gets that
+            options |= orjson.OPT_INDENT_2
+        return dumps(data, options)
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read()
+            if codecs.lookup(encoding).name != 'utf-8':
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f'JSON parse error - {exc}') from exc
+
+
+def _pack_fallback(obj):
+    # '9.99' packs into 5 bytes, a float64 into 9, and the string keeps every digit
+    if isinstance(obj, Decimal):
+        return str(obj)
+    # Aware datetimes are packed as timestamps before reaching here; naive ones have no instant to pack
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    return _fallback(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    # Serializers skip formatting datetimes for renderers that encode them natively
+    native_datetimes = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_pack_fallback, datetime=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            # Timestamps come back as aware UTC datetimes, which DateTimeField accepts as input
+            return msgpack.unpackb(stream.read(), timestamp=3)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}') from exc
+
+
+def native_datetimes(context):
+    """Whether the request in a serializer ``context`` is rendered by a renderer that packs datetimes itself"""
+    renderer = getattr(context.get('request'), 'accepted_renderer', None)
+    return getattr(renderer, 'native_datetimes', False)
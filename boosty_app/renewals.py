@@ -0,0 +1,170 @@
+"""Batch renewal engine for recurring tier subscriptions"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .access_tokens import revoke_access_tokens
+from .creator_stats import invalidate_creator_stats
+from .models import SubscriptionRenewal, TierSubscription
+from .models.subscription import SUBSCRIPTION_PERIOD
+from .payments import Charge, get_payment_backend
+
+# Delay before each retry after a failed charge; once exhausted the subscription is deactivated
+DEFAULT_RETRY_SCHEDULE = [timedelta(hours=1), timedelta(days=1), timedelta(days=3)]
+
+
+@dataclass
+class RenewalStats:
+    renewed: int = 0
+    failed: int = 0
+    exhausted: int = 0
+    skipped: int = 0
+
+
+class RenewalEngine:
+    """Renew subscriptions whose period ends within ``window``
+
+    Due subscriptions are walked in primary key order with keyset pagination
+    and processed ``batch_size`` at a time: renewal rows are inserted in bulk,
+    charged through the payment backend in one call, and the results are
+    written back with ``bulk_update``. Each renewal is keyed by subscription
+    and period start, so re-running the engine never charges a period twice,
+    and the same key is passed to the provider so a crash between charging
+    and committing is safe to replay.
+    """
+
+    def __init__(self, backend=None, batch_size=500, retry_schedule=None):
+        self.backend = backend or get_payment_backend()
+        self.batch_size = batch_size
+        self.retry_schedule = retry_schedule if retry_schedule is not None else DEFAULT_RETRY_SCHEDULE
+
+    def due_subscriptions(self, now, window):
+        return TierSubscription.objects.filter(
+            is_active=True,
+            cancelled_at__isnull=True,
+            tier__is_active=True,
+            end_date__lte=now + window,
+        )
+
+    def run(self, now=None, window=timedelta(days=1)):
+        now = now or timezone.now()
+        stats = RenewalStats()
+        due = self.due_subscriptions(now, window).order_by('id')
+
+        last_id = 0
+        while True:
+            batch = list(
+                due.filter(id__gt=last_id).values('id', 'subscriber_id', 'end_date', 'tier__price')[: self.batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1]['id']
+            self._process_batch(batch, now, stats)
+
+        return stats
+
+    def _process_batch(self, batch, now, stats):
+        rows_by_key = {}
+        for row in batch:
+            rows_by_key[SubscriptionRenewal.make_key(row['id'], row['end_date'])] = row
+
+        with transaction.atomic():
+            SubscriptionRenewal.objects.bulk_create(
+                [
+                    SubscriptionRenewal(
+                        subscription_id=row['id'],
+                        renewal_key=key,
+                        period_start=row['end_date'],
+                        period_end=row['end_date'] + SUBSCRIPTION_PERIOD,
+                        amount=row['tier__price'],
+                        next_attempt_at=now,
+                    )
+                    for key, row in rows_by_key.items()
+                ],
+                ignore_conflicts=True,
+            )
+
+            # Lock the attempts that are due; rows held by a concurrent run are skipped
+            renewals = list(
+                SubscriptionRenewal.objects.select_for_update(skip_locked=True).filter(
+                    renewal_key__in=rows_by_key.keys(),
+                    status__in=['pending', 'failed'],
+                    next_attempt_at__lte=now,
+                )
+            )
+            stats.skipped += len(rows_by_key) - len(renewals)
+            if not renewals:
+                return
+
+            charges = [
+                Charge(
+                    idempotency_key=renewal.renewal_key,
+                    subscriber_id=rows_by_key[renewal.renewal_key]['subscriber_id'],
+                    amount=renewal.amount,
+                    description=f'Subscription renewal {renewal.renewal_key}',
+                )
+                for renewal in renewals
+            ]
+            results = {result.idempotency_key: result for result in self.backend.charge_many(charges)}
+
+            subscriptions = []
+            for renewal in renewals:
+                result = results[renewal.renewal_key]
+                renewal.attempts += 1
+                renewal.updated_at = now
+                if result.success:
+                    renewal.status = 'completed'
+                    renewal.transaction_id = result.transaction_id
+                    renewal.last_error = ''
+                    subscriptions.append(
+                        TierSubscription(
+                            pk=renewal.subscription_id,
+                            end_date=renewal.period_end,
+                            payment_status='completed',
+                            transaction_id=result.transaction_id,
+                            updated_at=now,
+                        )
+                    )
+                    stats.renewed += 1
+                    continue
+
+                renewal.last_error = result.error[:255]
+                if renewal.attempts > len(self.retry_schedule):
+                    renewal.status = 'exhausted'
+                    subscriptions.append(
+                        TierSubscription(
+                            pk=renewal.subscription_id, is_active=False, payment_status='failed', updated_at=now
+                        )
+                    )
+                    stats.exhausted += 1
+                else:
+                    renewal.status = 'failed'
+                    renewal.next_attempt_at = now + self.retry_schedule[renewal.attempts - 1]
+                    stats.failed += 1
+
+            SubscriptionRenewal.objects.bulk_update(
+                renewals, ['status', 'attempts', 'next_attempt_at', 'transaction_id', 'last_error', 'updated_at']
+            )
+            self._bulk_update_subscriptions(subscriptions)
+
+    def _bulk_update_subscriptions(self, subscriptions):
+        renewed = [sub for sub in subscriptions if sub.payment_status == 'completed']
+        lapsed = [sub for sub in subscriptions if sub.payment_status == 'failed']
+        if renewed:
+            TierSubscription.objects.bulk_update(
+                renewed, ['end_date', 'payment_status', 'transaction_id', 'updated_at'], batch_size=self.batch_size
+            )
+        if lapsed:
+            TierSubscription.objects.bulk_update(
+                lapsed, ['is_active', 'payment_status', 'updated_at'], batch_size=self.batch_size
+            )
+            # bulk_update bypasses signals, so drop the affected creators' cached statistics here
+            rows = TierSubscription.objects.filter(pk__in=[sub.pk for sub in lapsed]).values_list(
+                'tier__creator__user_id', 'subscriber_id'
+            )
+            invalidate_creator_stats(*{creator_id for creator_id, _ in rows})
+            # and make the lapsed subscribers' access tokens refresh without the tier
+            revoke_access_tokens(*{subscriber_id for _, subscriber_id in rows})
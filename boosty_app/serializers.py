@@ -1,11 +1,52 @@
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
+from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Coalesce, NullIf
 from rest_framework import serializers
 
-from .models import Category, Comment, Post, Subscription, SubscriptionTier, TierSubscription, UserProfile
+from .loaders import profile_loader
+from .models import Category, Comment, Notification, Post, Subscription, SubscriptionTier, TierSubscription, UserProfile
+from .models.comment import MAX_DEPTH
+from .reactions import reaction_counts, viewer_reactions
+from .renderers import native_datetimes
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class NativeDateTimesMixin:
+    """Leave datetimes as ``datetime`` objects when the response renderer encodes them itself (MessagePack)"""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if native_datetimes(self.context):
+            for field in fields.values():
+                if isinstance(field, serializers.DateTimeField):
+                    field.format = None
+        return fields
+
+
+class SparseFieldsMixin:
+    """Apply the view's ``?fields=``/``?expand=`` (``context['fieldset']``) to the top-level serializer
+
+    Relations listed in ``Meta.expandable`` collapse to their id column, or are
+    dropped when mapped to None, unless expanded. Nested serializers are left
+    whole.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get('fieldset')
+        parent = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        if fieldset is None or parent is not None:
+            return fields
+
+        selection = fieldset.select(list(fields), getattr(self.Meta, 'expandable', {}))
+        return {
+            name: fields[name] if column is None else serializers.ReadOnlyField(source=column)
+            for name, column in selection.items()
+        }
+
+
+class UserProfileSerializer(NativeDateTimesMixin, SparseFieldsMixin, serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     email = serializers.CharField(source='user.email', read_only=True)
     first_name = serializers.CharField(source='user.first_name', read_only=True)
@@ -31,6 +72,52 @@ class UserProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'subscriber_count', 'following_count', 'created_at']
 
 
+class AnnotatedProfileSerializer(UserProfileSerializer):
+    """Profile with follower counts read from query annotations (see ``loaders.annotated_profiles``)"""
+
+    subscriber_count = serializers.IntegerField(source='follower_total', read_only=True)
+    following_count = serializers.IntegerField(source='following_total', read_only=True)
+
+
+class LoadedProfileField(serializers.Field):
+    """Serialized profile resolved through the request's :class:`~boosty_app.loaders.ProfileLoader`
+
+    Point ``source`` at a user id (``key='user'``) or a profile id
+    (``key='profile'``) so the related rows are never loaded one by one.
+    """
+
+    def __init__(self, key='user', **kwargs):
+        kwargs['read_only'] = True
+        self.key = key
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        loader = profile_loader(self.context, AnnotatedProfileSerializer)
+        return loader.for_user(value) if self.key == 'user' else loader.for_profile(value)
+
+
+class ProfilePrimingListSerializer(serializers.ListSerializer):
+    """Queues every item's profile with the loader so a page of items loads them in one query
+
+    The child lists its loader fields in ``Meta.profile_fields``.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        loader = profile_loader(self.context, AnnotatedProfileSerializer)
+        for name in getattr(self.child.Meta, 'profile_fields', ()):
+            field = self.child.fields.get(name)
+            if not isinstance(field, LoadedProfileField):
+                # Pruned or collapsed by ?fields=/?expand=
+                continue
+            ids = [getattr(item, field.source) for item in items]
+            if field.key == 'user':
+                loader.prime_users(ids)
+            else:
+                loader.prime_profiles(ids)
+        return super().to_representation(items)
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, validators=[validate_password])
     password_confirm = serializers.CharField(write_only=True)
@@ -68,43 +155,89 @@ class UserLoginSerializer(serializers.Serializer):
     password = serializers.CharField()
 
 
-class SubscriptionSerializer(serializers.ModelSerializer):
-    creator = UserProfileSerializer(read_only=True)
+class SubscriptionSerializer(NativeDateTimesMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    creator = LoadedProfileField(key='profile', source='creator_id')
     creator_id = serializers.IntegerField(write_only=True)
 
     class Meta:
         model = Subscription
         fields = ['id', 'creator', 'creator_id', 'created_at']
         read_only_fields = ['id', 'created_at']
+        list_serializer_class = ProfilePrimingListSerializer
+        profile_fields = ['creator']
+        expandable = {'creator': 'creator_id'}
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(NativeDateTimesMixin, SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
 
 
-class CommentSerializer(serializers.ModelSerializer):
-    author = serializers.SerializerMethodField()
+class CommentSerializer(NativeDateTimesMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    author = LoadedProfileField(source='author_id')
 
     class Meta:
         model = Comment
         fields = '__all__'
         read_only_fields = ['author']
+        list_serializer_class = ProfilePrimingListSerializer
+        profile_fields = ['author']
+        expandable = {'author': 'author_id'}
+
+    def validate(self, attrs):
+        parent = attrs.get('parent')
+        if parent:
+            post = attrs.get('post') or getattr(self.instance, 'post', None)
+            if post and parent.post_id != post.id:
+                raise serializers.ValidationError({'parent': 'Replies must belong to the same post'})
+            if parent.depth + 1 > MAX_DEPTH:
+                raise serializers.ValidationError({'parent': 'This thread is nested too deeply'})
+        return attrs
+
 
-    def get_author(self, obj):
-        from .serializers import UserProfileSerializer
+# Top-level comments embedded in each post summary
+COMMENTS_PREVIEW_SIZE = 3
 
-        # Check if author is a real user (not AnonymousUser)
-        if hasattr(obj.author, 'profile'):
-            return UserProfileSerializer(obj.author.profile).data
-        return None
 
+def locked_excerpt(excerpt):
+    """Teaser shown in place of the content of a post the viewer cannot read, built from ``Post.excerpt``"""
+    if excerpt:
+        return excerpt + '... [Subscribe to read more]'
+    return '[This content is locked. Subscribe to view.]'
 
-class PostSerializer(serializers.ModelSerializer):
-    author = serializers.SerializerMethodField()
+
+def summary_text():
+    """Annotation with the text a reader sees in a list: the stored excerpt, or the whole body of a short post"""
+    return Coalesce(NullIf('excerpt', Value('')), 'content', output_field=models.TextField())
+
+
+def _load_post_reactions(context, posts):
+    """Resolve reaction counts and the viewer's reactions for ``posts`` into the serializer context"""
+    request = context.get('request')
+    user = getattr(request, 'user', None)
+    counts, mine = context.setdefault('post_reactions', ({}, {}))
+    counts.update(reaction_counts(posts))
+    if user is not None:
+        mine.update(viewer_reactions(user, posts))
+    return counts, mine
+
+
+class PostListSerializer(ProfilePrimingListSerializer):
+    """Loads reactions for the whole page in two queries before serializing each post"""
+
+    def to_representation(self, data):
+        posts = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        if {'reaction_counts', 'my_reactions'} & self.child.fields.keys():
+            _load_post_reactions(self.context, posts)
+        return super().to_representation(posts)
+
+
+class PostSerializer(NativeDateTimesMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    author = LoadedProfileField(source='author_id')
     category = CategorySerializer(read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    # The first top-level comments only; the thread is paginated by /api/posts/<id>/comments/
+    comments_preview = serializers.SerializerMethodField()
     comments_count = serializers.SerializerMethodField()
     is_published = serializers.BooleanField(read_only=True)
     is_draft = serializers.BooleanField(read_only=True)
@@ -112,23 +245,49 @@ class PostSerializer(serializers.ModelSerializer):
     user_has_access = serializers.SerializerMethodField()
     is_locked = serializers.SerializerMethodField()
     content = serializers.SerializerMethodField()
+    excerpt = serializers.SerializerMethodField()
+    view_count = serializers.SerializerMethodField()
+    reaction_counts = serializers.SerializerMethodField()
+    my_reactions = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
         fields = '__all__'
         read_only_fields = ['author']
+        list_serializer_class = PostListSerializer
+        profile_fields = ['author']
+        expandable = {'author': 'author_id', 'category': 'category_id', 'comments_preview': None}
+
+    def get_view_count(self, obj):
+        # Include views still buffered in this process so a reader sees their own view
+        from .view_counter import post_views
 
-    def get_author(self, obj):
-        from .serializers import UserProfileSerializer
+        return obj.view_count + post_views.pending(obj.id)
 
-        # Check if author is a real user (not AnonymousUser)
-        if hasattr(obj.author, 'profile'):
-            return UserProfileSerializer(obj.author.profile).data
-        return None
+    def _reactions(self, obj):
+        counts, mine = self.context.get('post_reactions', ({}, {}))
+        if obj.id not in counts:
+            counts, mine = _load_post_reactions(self.context, [obj])
+        return counts[obj.id], mine.get(obj.id, [])
+
+    def get_reaction_counts(self, obj):
+        return self._reactions(obj)[0]
+
+    def get_my_reactions(self, obj):
+        return self._reactions(obj)[1]
 
     def get_comments_count(self, obj):
         return obj.comments.count()
 
+    def get_comments_preview(self, obj):
+        # Comments on a paid post are hidden along with its body
+        if not self._readable(obj):
+            return []
+        comments = obj.comments.filter(parent__isnull=True).order_by('created_at', 'id')[:COMMENTS_PREVIEW_SIZE]
+        # The request's ?fields= describes posts, not the embedded comments
+        context = {key: value for key, value in self.context.items() if key != 'fieldset'}
+        return CommentSerializer(comments, many=True, context=context).data
+
     def get_tiers(self, obj):
         """Get tier information for the post"""
         tiers = obj.tiers.all()
@@ -150,20 +309,61 @@ class PostSerializer(serializers.ModelSerializer):
             return not obj.user_has_access(request.user)
         return True
 
-    def get_content(self, obj):
-        """Return content or locked message based on access"""
+    def _readable(self, obj):
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
-            if obj.user_has_access(request.user):
-                return obj.content
-        elif obj.is_free:
-            return obj.content
+            return obj.user_has_access(request.user)
+        return obj.is_free
+
+    def get_content(self, obj):
+        """Return content or locked message based on access"""
+        return obj.content if self._readable(obj) else locked_excerpt(obj.excerpt)
+
+    def get_excerpt(self, obj):
+        """Return the list text (excerpt, or a short post's whole body) or the locked message"""
+        if not self._readable(obj):
+            return locked_excerpt(obj.excerpt)
+        if hasattr(obj, 'summary_text'):
+            return obj.summary_text
+        return obj.excerpt or obj.content
+
+
+class PostSummarySerializer(PostSerializer):
+    """List item for a post: excerpt instead of the body
+
+    Serialize a queryset from :func:`summary_queryset` so ``content`` is
+    never read for long posts.
+    """
+
+    class Meta(PostSerializer.Meta):
+        fields = [
+            'id',
+            'title',
+            'excerpt',
+            'author',
+            'category',
+            'image',
+            'status',
+            'is_free',
+            'is_published',
+            'is_draft',
+            'tiers',
+            'user_has_access',
+            'is_locked',
+            'comments_count',
+            'comments_preview',
+            'view_count',
+            'reaction_counts',
+            'my_reactions',
+            'created_at',
+            'updated_at',
+        ]
+        expandable = {'author': 'author_id', 'category': 'category_id', 'comments_preview': None}
 
-        # Return preview for locked content
-        preview_length = 150
-        if len(obj.content) > preview_length:
-            return obj.content[:preview_length] + '... [Subscribe to read more]'
-        return '[This content is locked. Subscribe to view.]'
+
+def summary_queryset(queryset):
+    """``queryset`` prepared for :class:`PostSummarySerializer`: body deferred, list text annotated"""
+    return queryset.defer('content').annotate(summary_text=summary_text())
 
 
 class PostCreateSerializer(serializers.ModelSerializer):
@@ -179,8 +379,8 @@ class PostUpdateSerializer(serializers.ModelSerializer):
         read_only_fields = ['author']
 
 
-class SubscriptionTierSerializer(serializers.ModelSerializer):
-    creator = UserProfileSerializer(read_only=True)
+class SubscriptionTierSerializer(NativeDateTimesMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    creator = LoadedProfileField(key='profile', source='creator_id')
     subscriber_count = serializers.IntegerField(read_only=True)
     post_count = serializers.SerializerMethodField()
 
@@ -201,6 +401,9 @@ class SubscriptionTierSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'subscriber_count']
+        list_serializer_class = ProfilePrimingListSerializer
+        profile_fields = ['creator']
+        expandable = {'creator': 'creator_id'}
 
     def get_post_count(self, obj):
         return obj.posts.filter(status='published').count()
@@ -222,7 +425,7 @@ class SubscriptionTierCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class TierSubscriptionSerializer(serializers.ModelSerializer):
+class TierSubscriptionSerializer(NativeDateTimesMixin, SparseFieldsMixin, serializers.ModelSerializer):
     tier = SubscriptionTierSerializer(read_only=True)
     tier_id = serializers.IntegerField(write_only=True)
     subscriber_username = serializers.CharField(source='subscriber.username', read_only=True)
@@ -247,3 +450,87 @@ class TierSubscriptionSerializer(serializers.ModelSerializer):
             'created_at',
         ]
         read_only_fields = ['id', 'start_date', 'payment_status', 'transaction_id', 'created_at']
+        expandable = {'tier': 'tier_id'}
+
+
+class NotificationSerializer(NativeDateTimesMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    post_title = serializers.CharField(source='post.title', read_only=True)
+    author = serializers.CharField(source='post.author.username', read_only=True)
+
+    class Meta:
+        model = Notification
+        fields = ['id', 'kind', 'post', 'post_title', 'author', 'is_read', 'created_at']
+        read_only_fields = fields
+
+
+class CreatorPageTierSerializer(serializers.ModelSerializer):
+    subscriber_count = serializers.IntegerField(source='active_subscriber_total', read_only=True)
+    post_count = serializers.IntegerField(source='published_post_total', read_only=True)
+
+    class Meta:
+        model = SubscriptionTier
+        fields = ['id', 'name', 'description', 'price', 'image', 'order', 'subscriber_count', 'post_count']
+
+
+class CreatorPagePostSerializer(serializers.ModelSerializer):
+    """Post card whose lock state comes from entitlements resolved once for the whole page
+
+    Expects ``viewer_id`` and ``viewer_tier_ids`` in the context, prefetched
+    ``tiers``, and a ``comment_total`` annotation.
+    """
+
+    category = CategorySerializer(read_only=True)
+    tiers = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(source='comment_total', read_only=True)
+    is_locked = serializers.SerializerMethodField()
+    content = serializers.SerializerMethodField()
+    reaction_counts = serializers.SerializerMethodField()
+    my_reactions = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Post
+        fields = [
+            'id',
+            'title',
+            'content',
+            'category',
+            'image',
+            'is_free',
+            'tiers',
+            'is_locked',
+            'comments_count',
+            'view_count',
+            'reaction_counts',
+            'my_reactions',
+            'created_at',
+            'updated_at',
+        ]
+
+    def get_tiers(self, obj):
+        return [{'id': t.id, 'name': t.name, 'price': str(t.price)} for t in obj.tiers.all()]
+
+    def get_is_locked(self, obj):
+        if obj.is_free or obj.author_id == self.context['viewer_id']:
+            return False
+        tier_ids = {t.id for t in obj.tiers.all()}
+        return bool(tier_ids) and not tier_ids & self.context['viewer_tier_ids']
+
+    def get_content(self, obj):
+        return locked_excerpt(obj.excerpt) if self.get_is_locked(obj) else obj.content
+
+    def get_reaction_counts(self, obj):
+        return self.context['reaction_counts'].get(obj.id, {})
+
+    def get_my_reactions(self, obj):
+        return self.context['my_reactions'].get(obj.id, [])
+
+
+class CreatorPageSubscriptionSerializer(serializers.ModelSerializer):
+    tier = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TierSubscription
+        fields = ['id', 'tier', 'is_active', 'start_date', 'end_date', 'cancelled_at']
+
+    def get_tier(self, obj):
+        return {'id': obj.tier.id, 'name': obj.tier.name, 'price': str(obj.tier.price)}
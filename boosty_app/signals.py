@@ -3,11 +3,31 @@ from io import BytesIO
 
 from django.contrib.auth.models import User
 from django.core.files.base import ContentFile
-from django.db.models.signals import post_save, pre_save
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from PIL import Image
 
-from .models import Post, UserProfile
+from .access_tokens import revoke_access_tokens
+from .analytics import mark_deleted
+from .authentication import evict_tokens
+from .creator_stats import invalidate_creator_stats
+from .events import creator_posts_channel, post_comments_channel, publish
+from .models import (
+    Category,
+    Comment,
+    DeviceToken,
+    NotificationFanout,
+    Post,
+    Reaction,
+    Subscription,
+    SubscriptionRenewal,
+    SubscriptionTier,
+    TierSubscription,
+    UserProfile,
+)
+from .notifications import queue_fanout
+from .pagination import invalidate_counts
 
 
 def resize_image(image_field, max_width, max_height, quality=85):
@@ -99,6 +119,32 @@ def sync_user_permissions(sender, instance, **kwargs):
         User.objects.filter(pk=instance.user.pk).update(is_staff=instance.is_staff, is_superuser=instance.is_superuser)
 
 
+def _evict_user_tokens(user_id):
+    """Re-resolve the user's device tokens and refuse its access tokens"""
+    evict_tokens(*DeviceToken.objects.filter(user_id=user_id).values_list('digest', flat=True))
+    revoke_access_tokens(user_id)
+
+
+@receiver(post_save, sender=User)
+def evict_user_tokens(sender, instance, created, **kwargs):
+    """Re-resolve a changed user's tokens, so cached copies never outlive a deactivation or role change"""
+    if not created:
+        _evict_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+def evict_profile_user_tokens(sender, instance, created, **kwargs):
+    """Profile flags are synced to the User with an UPDATE that fires no signal, so evict its tokens here"""
+    if not created:
+        _evict_user_tokens(instance.user_id)
+
+
+@receiver(post_delete, sender=DeviceToken)
+def evict_revoked_token(sender, instance, **kwargs):
+    """Stop accepting a deleted (revoked, rotated or expired) token"""
+    evict_tokens(instance.digest)
+
+
 @receiver(pre_save, sender=UserProfile)
 def resize_user_avatar(sender, instance, **kwargs):
     """Resize user avatar before saving"""
@@ -117,3 +163,140 @@ def resize_post_image(sender, instance, **kwargs):
         if hasattr(instance.image, "file") and instance.image.file:
             # Resize post images to max 1200x1200 pixels
             resize_image(instance.image, max_width=1200, max_height=1200)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_stats_for_post(sender, instance, **kwargs):
+    """Drop cached dashboard statistics when a creator's posts change"""
+    invalidate_creator_stats(instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_published_post(sender, instance, **kwargs):
+    """Queue follower notifications and push a live feed event once a post is first published"""
+    if instance.status == 'published' and queue_fanout(instance):
+        publish(
+            creator_posts_channel(instance.author_id),
+            {'type': 'post', 'id': instance.id, 'author': instance.author_id, 'created_at': instance.created_at},
+        )
+
+
+@receiver(post_save, sender=Comment)
+def push_new_comment(sender, instance, created, **kwargs):
+    """Push new comments to live streams of the post"""
+    if created:
+        publish(
+            post_comments_channel(instance.post_id),
+            {
+                'type': 'comment',
+                'id': instance.id,
+                'post': instance.post_id,
+                'parent': instance.parent_id,
+                'author': {'id': instance.author_id, 'username': instance.author.username},
+                'content': instance.content,
+                'created_at': instance.created_at,
+            },
+        )
+
+
+@receiver([post_save, post_delete], sender=SubscriptionTier)
+def invalidate_stats_for_tier(sender, instance, **kwargs):
+    """Drop cached dashboard statistics when a creator's tiers change"""
+    invalidate_creator_stats(_profile_user_id(instance.creator_id))
+
+
+@receiver([post_save, post_delete], sender=Subscription)
+def invalidate_stats_for_subscription(sender, instance, **kwargs):
+    """Drop cached dashboard statistics when a creator gains or loses a follower"""
+    invalidate_creator_stats(_profile_user_id(instance.creator_id))
+
+
+@receiver([post_save, post_delete], sender=TierSubscription)
+def revoke_subscriber_access_tokens(sender, instance, **kwargs):
+    """Access tokens carry the subscriber's active tiers, so re-issue them after any change"""
+    revoke_access_tokens(instance.subscriber_id)
+
+
+@receiver([post_save, post_delete], sender=TierSubscription)
+def invalidate_stats_for_tier_subscription(sender, instance, **kwargs):
+    """Drop cached dashboard statistics when a tier subscription changes"""
+    invalidate_creator_stats(
+        SubscriptionTier.objects.filter(pk=instance.tier_id).values_list('creator__user_id', flat=True).first()
+    )
+
+
+# Models whose tables paginated API lists and admin changelists count, join or filter through;
+# writes to any other table (sessions, tokens, rollups) never expire a cached count
+COUNTED_MODELS = frozenset(
+    [
+        User,
+        UserProfile,
+        Category,
+        Post,
+        Comment,
+        Reaction,
+        Subscription,
+        SubscriptionTier,
+        TierSubscription,
+        SubscriptionRenewal,
+        NotificationFanout,
+    ]
+)
+
+
+@receiver([post_save, post_delete])
+def invalidate_list_counts(sender, **kwargs):
+    """Expire cached paginated-list counts that read the written table"""
+    if sender in COUNTED_MODELS:
+        invalidate_counts(sender._meta.db_table)
+
+
+@receiver(m2m_changed, sender=Post.tiers.through)
+def invalidate_relation_list_counts(sender, action, **kwargs):
+    """Expire cached paginated-list counts that join through the changed relation table"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_counts(sender._meta.db_table)
+
+
+def _deleting_posts(origin):
+    return isinstance(origin, Post) or (isinstance(origin, QuerySet) and origin.model is Post)
+
+
+@receiver(post_delete, sender=Subscription)
+def mark_deleted_subscription(sender, instance, **kwargs):
+    """Recount the follower rollup bucket an unfollow leaves"""
+    mark_deleted(instance.creator_id, instance.created_at)
+
+
+@receiver(post_delete, sender=TierSubscription)
+def mark_deleted_tier_subscription(sender, instance, **kwargs):
+    """Recount the subscriber and revenue rollup bucket of a deleted tier subscription"""
+    creator_id = SubscriptionTier.objects.filter(pk=instance.tier_id).values_list('creator_id', flat=True).first()
+    mark_deleted(creator_id, instance.created_at)
+
+
+@receiver(post_delete, sender=SubscriptionRenewal)
+def mark_deleted_renewal(sender, instance, **kwargs):
+    """Recount the revenue rollup bucket of a deleted renewal"""
+    subscriptions = TierSubscription.objects.filter(pk=instance.subscription_id)
+    mark_deleted(subscriptions.values_list('tier__creator_id', flat=True).first(), instance.updated_at)
+
+
+@receiver(pre_delete, sender=Post)
+def mark_deleted_post(sender, instance, **kwargs):
+    """Recount the rollup buckets of a deleted post and, in one query, of the comments deleted with it"""
+    creator_id = UserProfile.objects.filter(user_id=instance.author_id).values_list('id', flat=True).first()
+    mark_deleted(creator_id, instance.created_at, *Comment.objects.filter(post=instance).dates('created_at', 'day'))
+
+
+@receiver(post_delete, sender=Comment)
+def mark_deleted_comment(sender, instance, origin=None, **kwargs):
+    """Recount the comment rollup bucket of a comment deleted on its own"""
+    if _deleting_posts(origin):
+        return
+    post = Post.objects.filter(pk=instance.post_id).values_list('author__profile__id', flat=True)
+    mark_deleted(post.first(), instance.created_at)
+
+
+def _profile_user_id(profile_id):
+    return UserProfile.objects.filter(pk=profile_id).values_list('user_id', flat=True).first()
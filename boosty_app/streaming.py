@@ -0,0 +1,62 @@
+"""Streamed JSON arrays for large unpaginated list responses
+
+A streamed list reads its rows from a server-side cursor, serializes them
+one chunk at a time through a fast serializer (see
+:mod:`boosty_app.fast_serializers`) and sends each chunk as soon as it is
+encoded. Neither the list of dicts nor the encoded body is ever held in
+memory in full, and the first bytes leave before the last row is read.
+"""
+
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+
+from .renderers import dumps
+
+# Rows fetched per database round trip; each chunk is serialized (and its batch loads run) together
+CHUNK_SIZE = 500
+
+_DONE = object()
+
+
+def serialized_chunks(serializer, queryset, chunk_size=CHUNK_SIZE):
+    """Yield ``queryset`` serialized by the fast ``serializer`` as lists of at most ``chunk_size`` items"""
+    rows = serializer.rows(queryset).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        yield serializer.serialize(chunk)
+
+
+def json_array(chunks):
+    """Encode lists of items as the elements of one JSON array, one piece of output per list"""
+    separator = b'['
+    for items in chunks:
+        if items:
+            # Encode the whole chunk in one call and drop its brackets
+            yield separator + dumps(items)[1:-1]
+            separator = b','
+    yield b'[]' if separator == b'[' else b']'
+
+
+class SyncStreamingHttpResponse(StreamingHttpResponse):
+    """A response streamed from a synchronous iterator, chunk by chunk under WSGI and ASGI alike
+
+    Django's ASGI handler drains a synchronous iterator into a list before
+    sending anything. Here each chunk is pulled on the request's sync thread
+    (where its database connection and server-side cursor live) and sent
+    before the next one is produced.
+    """
+
+    async def __aiter__(self):
+        parts = iter(self.streaming_content)
+        pull = sync_to_async(next, thread_sensitive=True)
+        while (part := await pull(parts, _DONE)) is not _DONE:
+            yield part
+
+
+class StreamingJSONResponse(SyncStreamingHttpResponse):
+    """A JSON array response whose body is produced by :func:`json_array` while it is sent"""
+
+    def __init__(self, chunks, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(json_array(chunks), **kwargs)
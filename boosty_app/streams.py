@@ -0,0 +1,201 @@
+"""Server-Sent Events endpoints served as a bare ASGI application
+
+Streams bypass Django's request/response cycle: once the viewer is
+authenticated and authorised, a connection is just a coroutine waiting on a
+:class:`~boosty_app.events.Subscriber` queue, so a process can keep
+thousands of idle streams open. A heartbeat comment goes out whenever the
+stream has been quiet for ``SSE_HEARTBEAT_SECONDS`` so proxies keep the
+connection open and dead clients are noticed. The ASGI server's flow control
+makes ``send`` wait for slow clients; if a client falls ``EVENT_STREAM_QUEUE_SIZE``
+events behind it gets a ``reset`` event and is disconnected, and should
+reconnect and reload.
+
+EventSource cannot send an ``Authorization`` header, so browsers authenticate
+with ``?ticket=`` from ``POST /api/stream-tickets/``. The query string ends up
+in server and proxy access logs, so it never carries an API token: a ticket
+is signed, names only the user and expires after ``STREAM_TICKET_TTL``
+seconds, which is long enough to open (or re-open) one stream.
+"""
+
+import asyncio
+import json
+import re
+from importlib import import_module
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.db import close_old_connections
+
+from .events import StreamOverflow, bus, creator_posts_channel, post_comments_channel
+
+STREAM_PREFIX = '/api/stream/'
+RETRY_MS = 5000
+TICKET_SALT = 'boosty_app.streams.ticket'
+
+
+def issue_stream_ticket(user):
+    """A short-lived signed ticket that lets ``user`` open a stream from a URL"""
+    return signing.dumps({'u': user.pk}, salt=TICKET_SALT)
+
+
+def _ticket_user(ticket):
+    from django.contrib.auth.models import AnonymousUser, User
+
+    try:
+        claims = signing.loads(ticket, salt=TICKET_SALT, max_age=settings.STREAM_TICKET_TTL)
+    except signing.BadSignature:
+        return AnonymousUser()
+    return User.objects.filter(pk=claims['u'], is_active=True).first() or AnonymousUser()
+
+
+def _authenticate(headers, query):
+    """Resolve the viewer from an API token header, a ``?ticket=`` or a session"""
+    from django.contrib import auth
+    from django.contrib.auth.models import AnonymousUser
+
+    from .authentication import resolve_token
+
+    authorization = headers.get(b'authorization', b'').decode()
+    if authorization.startswith('Token '):
+        token = resolve_token(authorization[6:].strip())
+        return token.user if token and token.user.is_active else AnonymousUser()
+
+    ticket = query.get('ticket', [''])[0]
+    if ticket:
+        return _ticket_user(ticket)
+
+    cookies = headers.get(b'cookie', b'').decode()
+    session_key = dict(part.strip().split('=', 1) for part in cookies.split(';') if '=' in part).get(
+        settings.SESSION_COOKIE_NAME
+    )
+    if session_key:
+        session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+        return auth.get_user(SimpleNamespace(session=session))
+    return AnonymousUser()
+
+
+def _post_comment_channels(user, post_id):
+    from .entitlements import discussable_posts
+
+    if discussable_posts(user).filter(pk=post_id).exists():
+        return [post_comments_channel(post_id)]
+    return None
+
+
+def _feed_channels(user):
+    from .models import Subscription
+
+    if not user.is_authenticated:
+        return None
+    creator_ids = Subscription.objects.filter(subscriber=user).values_list('creator__user_id', flat=True)
+    return [creator_posts_channel(creator_id) for creator_id in creator_ids]
+
+
+@sync_to_async
+def _resolve(route, params, headers, query):
+    """Authenticate and return the channels the viewer may subscribe to, or None if forbidden"""
+    try:
+        user = _authenticate(headers, query)
+        if route == 'post-comments':
+            return _post_comment_channels(user, int(params['post_id']))
+        return _feed_channels(user)
+    finally:
+        close_old_connections()
+
+
+ROUTES = [
+    (re.compile(r'^posts/(?P<post_id>\d+)/comments/$'), 'post-comments'),
+    (re.compile(r'^feed/$'), 'feed'),
+]
+
+
+def format_event(event_id, name, data):
+    return f'id: {event_id}\nevent: {name}\ndata: {json.dumps(data, default=str)}\n\n'.encode()
+
+
+async def _reject(send, status, message):
+    await send(
+        {
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json')],
+        }
+    )
+    await send({'type': 'http.response.body', 'body': json.dumps({'detail': message}).encode()})
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def sse_application(scope, receive, send):
+    path = scope['path'][len(STREAM_PREFIX) :]
+    for pattern, route in ROUTES:
+        match = pattern.match(path)
+        if match:
+            break
+    else:
+        return await _reject(send, 404, 'Not found.')
+
+    if scope['method'] != 'GET':
+        return await _reject(send, 405, f'Method "{scope["method"]}" not allowed.')
+
+    headers = dict(scope['headers'])
+    query = parse_qs(scope.get('query_string', b'').decode())
+    channels = await _resolve(route, match.groupdict(), headers, query)
+    if channels is None:
+        return await _reject(send, 403, 'You do not have permission to follow this stream.')
+
+    subscriber = bus.subscribe(channels)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+    heartbeat = getattr(settings, 'SSE_HEARTBEAT_SECONDS', 15)
+    try:
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [
+                    (b'content-type', b'text/event-stream'),
+                    (b'cache-control', b'no-cache'),
+                    (b'x-accel-buffering', b'no'),
+                ],
+            }
+        )
+        await send({'type': 'http.response.body', 'body': f'retry: {RETRY_MS}\n\n'.encode(), 'more_body': True})
+
+        event_id = 0
+        while not disconnected.done():
+            next_event = asyncio.ensure_future(subscriber.get())
+            done, _ = await asyncio.wait({next_event, disconnected}, timeout=heartbeat, return_when='FIRST_COMPLETED')
+            if next_event not in done:
+                next_event.cancel()
+                if not done:
+                    await send({'type': 'http.response.body', 'body': b': ping\n\n', 'more_body': True})
+                continue
+            try:
+                _, event = next_event.result()
+            except StreamOverflow:
+                await send(
+                    {
+                        'type': 'http.response.body',
+                        'body': format_event(event_id + 1, 'reset', {'reason': 'overflow'}),
+                        'more_body': True,
+                    }
+                )
+                break
+            event_id += 1
+            await send(
+                {'type': 'http.response.body', 'body': format_event(event_id, event['type'], event), 'more_body': True}
+            )
+        if not disconnected.done():
+            await send({'type': 'http.response.body', 'body': b''})
+    except OSError:
+        # The client went away mid-write
+        pass
+    finally:
+        subscriber.close()
+        disconnected.cancel()
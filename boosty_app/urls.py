@@ -12,22 +12,19 @@ router.register(r'tier-subscriptions', views.TierSubscriptionViewSet, basename='
 router.register(r'categories', views.CategoryViewSet)
 router.register(r'posts', views.PostViewSet, basename='post')
 router.register(r'comments', views.CommentViewSet)
+router.register(r'notifications', views.NotificationViewSet, basename='notification')
 
 app_name = 'boosty_app'
 
-
-# Create a csrf_exempt wrapper for DRF auth URLs
-@csrf_exempt
-def csrf_exempt_auth(request, *args, **kwargs):
-    from rest_framework.views import obtain_auth_token
-
-    return obtain_auth_token(request, *args, **kwargs)
-
-
 urlpatterns = [
     path('', include(router.urls)),
+    path('batch/', views.BatchView.as_view(), name='batch'),
+    path('stream-tickets/', views.StreamTicketView.as_view(), name='stream-ticket'),
     # Custom auth endpoints (CSRF exempt)
     path('auth/register/', csrf_exempt(views.AuthViewSet.as_view()), {'action': 'register'}, name='auth-register'),
     path('auth/login/', csrf_exempt(views.AuthViewSet.as_view()), {'action': 'login'}, name='auth-login'),
-    path('auth/token/', csrf_exempt_auth, name='obtain-auth-token'),
+    path('auth/token/', csrf_exempt(views.AuthViewSet.as_view()), {'action': 'login'}, name='obtain-auth-token'),
+    path('auth/rotate/', csrf_exempt(views.AuthViewSet.as_view()), {'action': 'rotate'}, name='auth-rotate'),
+    path('auth/refresh/', csrf_exempt(views.AuthViewSet.as_view()), {'action': 'refresh'}, name='auth-refresh'),
+    path('auth/logout/', csrf_exempt(views.AuthViewSet.as_view()), {'action': 'logout'}, name='auth-logout'),
 ]
@@ -0,0 +1,109 @@
+"""In-process, write-buffered post view counters"""
+
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+# Posts updated per UPDATE ... FROM (VALUES ...) statement
+FLUSH_BATCH_SIZE = 1000
+
+
+class ViewCounterBuffer:
+    """Aggregate view increments in memory and flush them in one batched UPDATE
+
+    Increments only touch a dict under a lock, so reads never contend on the
+    post row. A daemon thread flushes every ``interval`` seconds, and a final
+    flush runs at interpreter exit, so database writes scale with the number of
+    distinct posts viewed per interval rather than with page views.
+    """
+
+    def __init__(self, interval=None):
+        self._interval = interval
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    @property
+    def interval(self):
+        if self._interval is not None:
+            return self._interval
+        return getattr(settings, 'POST_VIEW_FLUSH_INTERVAL', 10)
+
+    def increment(self, post_id, amount=1):
+        with self._lock:
+            self._counts[post_id] += amount
+        self._ensure_thread()
+
+    def pending(self, post_id):
+        with self._lock:
+            return self._counts.get(post_id, 0)
+
+    def flush(self):
+        """Write buffered increments to the database; returns the number of posts updated"""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return 0
+
+        items = list(counts.items())
+        try:
+            with transaction.atomic():
+                for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                    self._write(items[start : start + FLUSH_BATCH_SIZE])
+        except Exception:
+            # Keep the increments for the next attempt instead of dropping them
+            with self._lock:
+                self._counts.update(counts)
+            raise
+        return len(items)
+
+    def _write(self, items):
+        table = Post._meta.db_table
+        values = ', '.join(['(%s::bigint, %s::bigint)'] * len(items))
+        params = [value for item in items for value in item]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} AS p SET view_count = p.view_count + v.delta '
+                f'FROM (VALUES {values}) AS v(id, delta) WHERE p.id = v.id',
+                params,
+            )
+
+    def _ensure_thread(self):
+        if self._thread is not None or not self.interval:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='post-view-flusher', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to flush post view counts')
+            finally:
+                # The flusher thread owns its own connection; don't keep it open between flushes
+                connection.close()
+
+    def stop(self):
+        """Stop the flusher thread and write any remaining increments"""
+        self._stopped.set()
+        try:
+            self.flush()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Failed to flush post view counts at shutdown')
+
+
+post_views = ViewCounterBuffer()
@@ -1,18 +1,50 @@
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from rest_framework import permissions, status, viewsets
-from rest_framework.authtoken.models import Token
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Category, Comment, Post, Subscription, SubscriptionTier, TierSubscription, UserProfile
+from .access_tokens import issue_access_token, revoke_access_tokens
+from .authentication import issue_token, rotate_token
+from .batch import BatchError, parse_batch, run_batch
+from .bulk import (
+    MAX_IDS,
+    POST_OPERATIONS,
+    TIER_SUBSCRIPTION_OPERATIONS,
+    delete_posts,
+    update_posts,
+    update_tier_subscriptions,
+)
+from .creator_page import build_creator_page
+from .entitlements import discussable_posts
+from .fast_serializers import FastPostSummarySerializer, FastSubscriptionTierSerializer, FastUserProfileSerializer
+from .fieldsets import parse_fieldset
+from .loaders import annotated_profiles
+from .models import (
+    Category,
+    Comment,
+    DeviceToken,
+    Notification,
+    Post,
+    Subscription,
+    SubscriptionTier,
+    TierSubscription,
+    UserProfile,
+)
+from .notifications import mark_read, unread_count
+from .pagination import CommentReplyPagination, CommentThreadPagination, NotificationPagination
+from .reactions import KINDS, add_reaction, reaction_counts, remove_reaction
+from .renderers import ORJSONRenderer
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
+    NotificationSerializer,
     PostCreateSerializer,
     PostSerializer,
+    PostSummarySerializer,
     PostUpdateSerializer,
     SubscriptionSerializer,
     SubscriptionTierCreateSerializer,
@@ -22,10 +54,121 @@ from .serializers import (
     UserProfileSerializer,
     UserRegistrationSerializer,
 )
+from .streaming import StreamingJSONResponse, serialized_chunks
+from .streams import issue_stream_ticket
+from .view_counter import post_views
+
+
+class SparseFieldsetMixin:
+    """Read requests honour ``?fields=`` and ``?expand=`` (see :mod:`boosty_app.fieldsets`)"""
+
+    @property
+    def fieldset(self):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return None
+        return parse_fieldset(self.request.query_params)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        fieldset = self.fieldset
+        if fieldset is not None:
+            context['fieldset'] = fieldset
+        return context
+
+
+def _fast_list(view, fast_class):
+    """Paginated list action served by a values-based fast serializer"""
+    serializer = fast_class(view.get_serializer_context())
+    rows = serializer.rows(view.filter_queryset(view.get_queryset()))
+    page = view.paginate_queryset(rows)
+    if page is None:
+        return Response(serializer.serialize(rows))
+    return view.get_paginated_response(serializer.serialize(page))
+
+
+def _streamed_list(view, fast_class, queryset):
+    """Unpaginated list action; JSON responses are streamed chunk by chunk instead of built in memory"""
+    serializer = fast_class(view.get_serializer_context())
+    if isinstance(view.request.accepted_renderer, ORJSONRenderer):
+        return StreamingJSONResponse(serialized_chunks(serializer, queryset))
+    # The browsable API renders the whole list into its page
+    return Response(serializer.serialize(serializer.rows(queryset)))
+
+
+def _bulk_error(request, operations):
+    """Why a bulk action request is invalid, or None"""
+    ids, operation = request.data.get('ids'), request.data.get('operation')
+    if operation not in operations:
+        return f'operation must be one of: {", ".join(operations)}'
+    if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+        return 'ids must be a list of integers'
+    if len(ids) > MAX_IDS:
+        return f'At most {MAX_IDS} ids per request'
+    return None
+
+
+def _react(request, target):
+    """Add (POST) or remove (DELETE) the requester's reaction; both are idempotent"""
+    kind = request.data.get('kind') or request.query_params.get('kind')
+    if kind not in KINDS:
+        return Response(
+            {'error': f"kind must be one of: {', '.join(sorted(KINDS))}"}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if request.method == 'POST':
+        add_reaction(request.user, target, kind)
+    else:
+        remove_reaction(request.user, target, kind)
+
+    return Response(
+        {
+            'kind': kind,
+            'reacted': request.method == 'POST',
+            'reaction_counts': reaction_counts([target])[target.pk],
+        }
+    )
+
+
+class BatchView(APIView):
+    """Resolve several GET API requests in one round trip with a single authentication"""
+
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        try:
+            items = parse_batch(request.data)
+        except BatchError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'responses': run_batch(request, items)})
+
+
+class StreamTicketView(APIView):
+    """Issue a short-lived ticket for opening an event stream, since EventSource cannot send headers"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        return Response({'ticket': issue_stream_ticket(request.user), 'expires_in': settings.STREAM_TICKET_TTL})
+
+
+def _device_name(request):
+    """The client-chosen ``device`` id a token is issued to, or '' when none was sent
+
+    Never derived from the User-Agent: machines running the same browser build
+    would share a name and each login would revoke the other's token.
+    """
+    return str(request.data.get('device') or '')[:100]
+
+
+def _token_response(user, token, key, **kwargs):
+    data = {'token': key, 'expires_at': token.expires_at, 'user': UserProfileSerializer(user.profile).data}
+    if settings.AUTH_ACCESS_TOKENS:
+        data['access'], data['access_expires_at'] = issue_access_token(user)
+    return Response(data, **kwargs)
 
 
 class AuthViewSet(APIView):
-    """Authentication views for registration and login"""
+    """Authentication views for registration, login, token rotation and logout"""
 
     permission_classes = [permissions.AllowAny]
 
@@ -33,33 +176,57 @@ class AuthViewSet(APIView):
         setattr(request, '_dont_enforce_csrf_checks', True)
         return super().dispatch(request, *args, **kwargs)
 
+    # Actions that need the device token itself, not an access token or a session
+    DEVICE_TOKEN_ACTIONS = {'rotate', 'refresh', 'logout'}
+
     def post(self, request, **kwargs):
         action = kwargs.get('action')
-        if action == 'register':
-            serializer = UserRegistrationSerializer(data=request.data)
-            if serializer.is_valid():
-                user = serializer.save()
-                token, created = Token.objects.get_or_create(user=user)
-                return Response(
-                    {'token': token.key, 'user': UserProfileSerializer(user.profile).data},
-                    status=status.HTTP_201_CREATED,
-                )
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-        elif action == 'login':
-            serializer = UserLoginSerializer(data=request.data)
-            if serializer.is_valid():
-                user = authenticate(
-                    username=serializer.validated_data['username'], password=serializer.validated_data['password']
-                )
-                if user:
-                    token, created = Token.objects.get_or_create(user=user)
-                    return Response({'token': token.key, 'user': UserProfileSerializer(user.profile).data})
-                return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-
-class UserProfileViewSet(viewsets.ModelViewSet):
+        if action in self.DEVICE_TOKEN_ACTIONS and not isinstance(request.auth, DeviceToken):
+            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+        return getattr(self, f'_{action}')(request)
+
+    def _register(self, request):
+        serializer = UserRegistrationSerializer(data=request.data)
+        if serializer.is_valid():
+            user = serializer.save()
+            token, key = issue_token(user, _device_name(request))
+            return _token_response(user, token, key, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def _login(self, request):
+        serializer = UserLoginSerializer(data=request.data)
+        if serializer.is_valid():
+            user = authenticate(
+                username=serializer.validated_data['username'], password=serializer.validated_data['password']
+            )
+            if user:
+                token, key = issue_token(user, _device_name(request))
+                return _token_response(user, token, key)
+            return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def _rotate(self, request):
+        token, key = rotate_token(request.auth)
+        return _token_response(request.user, token, key)
+
+    def _refresh(self, request):
+        """A fresh access token for the device token's user, with current entitlements"""
+        if not settings.AUTH_ACCESS_TOKENS:
+            return Response({'error': 'Access tokens are disabled'}, status=status.HTTP_400_BAD_REQUEST)
+        access, expires_at = issue_access_token(request.user)
+        return Response({'access': access, 'access_expires_at': expires_at})
+
+    def _logout(self, request):
+        """Revoke this device's token, or every device's with {"all": true}"""
+        tokens = DeviceToken.objects.filter(user=request.user)
+        if not request.data.get('all'):
+            tokens = tokens.filter(pk=request.auth.pk)
+        revoked, _ = tokens.delete()
+        revoke_access_tokens(request.user.pk)
+        return Response({'revoked': revoked})
+
+
+class UserProfileViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for user profiles"""
 
     queryset = UserProfile.objects.all()
@@ -131,8 +298,8 @@ class UserProfileViewSet(viewsets.ModelViewSet):
             # Get creators who have published posts in this category
             creators = creators.filter(user__posts__category_id=category_id, user__posts__status='published').distinct()
 
-        serializer = self.get_serializer(creators, many=True)
-        return Response(serializer.data)
+        serializer = FastUserProfileSerializer(self.get_serializer_context())
+        return Response(serializer.serialize(serializer.rows(creators)))
 
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def following(self, request):
@@ -140,8 +307,7 @@ class UserProfileViewSet(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
         following = UserProfile.objects.filter(subscribers__subscriber=request.user)
-        serializer = self.get_serializer(following, many=True)
-        return Response(serializer.data)
+        return _streamed_list(self, FastUserProfileSerializer, following)
 
     @action(detail=True, methods=['get'], permission_classes=[permissions.AllowAny])
     def tiers(self, request, pk=None):
@@ -150,19 +316,27 @@ class UserProfileViewSet(viewsets.ModelViewSet):
         if not creator.is_creator:
             return Response({'error': 'This user is not a creator'}, status=status.HTTP_400_BAD_REQUEST)
         tiers = SubscriptionTier.objects.filter(creator=creator, is_active=True).order_by('order', 'price')
-        serializer = SubscriptionTierSerializer(tiers, many=True)
+        serializer = SubscriptionTierSerializer(tiers, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'], permission_classes=[permissions.AllowAny])
+    def page(self, request, pk=None):
+        """Get the creator page: profile, tiers, first page of posts and the viewer's subscription state"""
+        profile = get_object_or_404(annotated_profiles(), pk=pk)
+        if not profile.is_creator:
+            return Response({'error': 'This user is not a creator'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(build_creator_page(request, profile))
+
     @action(detail=True, methods=['get'], permission_classes=[permissions.AllowAny])
     def posts(self, request, pk=None):
         """Get a creator's posts (free + locked paid posts for non-subscribers)"""
         creator = self.get_object()
         posts = Post.objects.filter(author=creator.user, status='published').order_by('-created_at')
-        serializer = PostSerializer(posts, many=True, context={'request': request})
-        return Response(serializer.data)
+        serializer = FastPostSummarySerializer(self.get_serializer_context())
+        return Response(serializer.serialize(serializer.rows(posts)))
 
 
-class SubscriptionViewSet(viewsets.ModelViewSet):
+class SubscriptionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for managing subscriptions"""
 
     queryset = Subscription.objects.all()
@@ -192,7 +366,7 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         return obj
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for categories"""
 
     queryset = Category.objects.all()
@@ -200,7 +374,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for posts with enhanced functionality"""
 
     queryset = Post.objects.all()  # Default queryset for router
@@ -249,11 +423,24 @@ class PostViewSet(viewsets.ModelViewSet):
             return PostCreateSerializer
         elif self.action in ['update', 'partial_update']:
             return PostUpdateSerializer
+        elif self.action in ['list', 'my_posts', 'feed']:
+            return PostSummarySerializer
         return PostSerializer
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        # Summaries only: the body and the full comment thread are served by retrieve
+        return _fast_list(self, FastPostSummarySerializer)
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        # Buffered in memory and flushed in batches to avoid hot-row contention on popular posts
+        # Keyed by the URL, since ?fields= may leave the id out of the response
+        post_views.increment(int(self.kwargs[self.lookup_url_kwarg or self.lookup_field]))
+        return response
+
     @action(detail=True, methods=['post'])
     def publish(self, request, pk=None):
         """Publish a draft post"""
@@ -274,14 +461,28 @@ class PostViewSet(viewsets.ModelViewSet):
             return Response({'status': 'post archived'})
         return Response({'error': 'You can only archive your own published posts'}, status=status.HTTP_403_FORBIDDEN)
 
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    def bulk(self, request):
+        """Apply one operation to many posts at once; staff may select any post, creators their own"""
+        error = _bulk_error(request, [*POST_OPERATIONS, 'delete'])
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        operation = request.data['operation']
+        posts = Post.objects.filter(pk__in=request.data['ids'])
+        if not request.user.is_staff:
+            posts = posts.filter(author=request.user)
+
+        if operation == 'delete':
+            return Response({'operation': operation, 'deleted': delete_posts(posts)})
+        return Response({'operation': operation, 'updated': update_posts(posts, operation)})
+
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def my_posts(self, request):
         """Get current user's posts (all statuses)"""
         if not request.user.is_authenticated:
             return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
         posts = Post.objects.filter(author=request.user)
-        serializer = self.get_serializer(posts, many=True)
-        return Response(serializer.data)
+        return _streamed_list(self, FastPostSummarySerializer, posts)
 
     @action(detail=False, methods=['get'])
     def feed(self, request):
@@ -293,19 +494,27 @@ class PostViewSet(viewsets.ModelViewSet):
         following_creators = UserProfile.objects.filter(subscribers__subscriber=request.user)
         posts = Post.objects.filter(author__profile__in=following_creators, status='published').order_by('-created_at')
 
-        serializer = self.get_serializer(posts, many=True)
-        return Response(serializer.data)
+        serializer = FastPostSummarySerializer(self.get_serializer_context())
+        return Response(serializer.serialize(serializer.rows(posts)))
 
     @action(detail=True, methods=['get'])
     def comments(self, request, pk=None):
-        """Get comments for a specific post"""
+        """Get top-level comments for a specific post, cursor-paginated; replies load via comments/{id}/replies/"""
         post = self.get_object()
-        comments = post.comments.all()
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        comments = post.comments.filter(parent__isnull=True)
+        paginator = CommentThreadPagination()
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['post', 'delete'], permission_classes=[permissions.IsAuthenticated])
+    def reactions(self, request, pk=None):
+        """React to a post; only posts the user may discuss accept reactions"""
+        post = get_object_or_404(discussable_posts(request.user), pk=pk)
+        return _react(request, post)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for comments"""
 
     queryset = Comment.objects.all()
@@ -315,22 +524,10 @@ class CommentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter comments - show comments on free posts to everyone, paid posts only to subscribers"""
         # Comments on free published posts are visible to everyone
-        # Comments on paid published posts are only visible to subscribers
+        # Comments on paid published posts are visible to followers and to subscribers of one of the post's tiers
         # Comments on own posts (any status) are visible to authenticated users
-        if self.request.user.is_authenticated:
-            # Get creators the user is subscribed to
-            subscribed_creators = UserProfile.objects.filter(subscribers__subscriber=self.request.user)
-            subscribed_author_ids = [creator.user.id for creator in subscribed_creators]
-
-            # Comments on free published posts OR paid posts from subscribed creators OR own posts
-            return Comment.objects.filter(
-                Q(post__status='published', post__is_free=True)
-                | Q(post__status='published', post__is_free=False, post__author_id__in=subscribed_author_ids)
-                | Q(post__author=self.request.user)
-            ).distinct()
-        else:
-            # Unauthenticated users can only see comments on free published posts
-            return Comment.objects.filter(post__status='published', post__is_free=True)
+        # Visibility is a single semi-join on post_id, so no DISTINCT is needed
+        return Comment.objects.filter(post_id__in=discussable_posts(self.request.user).values('id'))
 
     def perform_create(self, serializer):
         # Check if user can access the post before creating comment
@@ -341,22 +538,10 @@ class CommentViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("You must be logged in to comment")
 
         post = serializer.validated_data.get('post')
-        if post:
-            # Users can always comment on their own posts
-            if post.author == self.request.user:
-                serializer.save(author=self.request.user)
-                return
-
-            # Check if post is accessible for authenticated users
-            # Authenticated users can comment on free posts or paid posts if they're subscribed
-            subscribed_creators = UserProfile.objects.filter(subscribers__subscriber=self.request.user)
-            subscribed_author_ids = [creator.user.id for creator in subscribed_creators]
-
-            # Allow if free published post OR paid published post with subscription
-            if not (post.status == 'published' and (post.is_free or post.author_id in subscribed_author_ids)):
-                from rest_framework.exceptions import PermissionDenied
+        if post and not discussable_posts(self.request.user).filter(pk=post.pk).exists():
+            from rest_framework.exceptions import PermissionDenied
 
-                raise PermissionDenied("You must be a subscriber to comment on this post")
+            raise PermissionDenied("You must be a subscriber to comment on this post")
 
         serializer.save(author=self.request.user)
 
@@ -377,6 +562,29 @@ class CommentViewSet(viewsets.ModelViewSet):
 
         return obj
 
+    @action(detail=True, methods=['get'])
+    def replies(self, request, pk=None):
+        """Get the replies below a comment in thread order; ?depth=N limits how many levels are expanded"""
+        comment = self.get_object()
+        replies = comment.subtree()
+
+        depth = request.query_params.get('depth')
+        if depth:
+            try:
+                replies = replies.filter(depth__lte=comment.depth + max(int(depth), 1))
+            except ValueError:
+                return Response({'error': 'depth must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        paginator = CommentReplyPagination()
+        page = paginator.paginate_queryset(replies, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['post', 'delete'], permission_classes=[permissions.IsAuthenticated])
+    def reactions(self, request, pk=None):
+        """React to a comment"""
+        return _react(request, self.get_object())
+
     def update(self, request, *args, **kwargs):
         """Override update to check permissions"""
         obj = self.get_object()
@@ -405,7 +613,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
-class SubscriptionTierViewSet(viewsets.ModelViewSet):
+class SubscriptionTierViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for managing subscription tiers"""
 
     queryset = SubscriptionTier.objects.filter(is_active=True)
@@ -432,6 +640,9 @@ class SubscriptionTierViewSet(viewsets.ModelViewSet):
             return SubscriptionTierCreateSerializer
         return SubscriptionTierSerializer
 
+    def list(self, request, *args, **kwargs):
+        return _fast_list(self, FastSubscriptionTierSerializer)
+
     def perform_create(self, serializer):
         """Create tier for current user's profile"""
         if not self.request.user.profile.is_creator:
@@ -464,7 +675,7 @@ class SubscriptionTierViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class TierSubscriptionViewSet(viewsets.ModelViewSet):
+class TierSubscriptionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet for managing tier subscriptions (user subscriptions to tiers)"""
 
     queryset = TierSubscription.objects.all()
@@ -520,6 +731,19 @@ class TierSubscriptionViewSet(viewsets.ModelViewSet):
             }
         )
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Deactivate or cancel many tier subscriptions at once; staff may select anyone's"""
+        error = _bulk_error(request, TIER_SUBSCRIPTION_OPERATIONS)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        operation = request.data['operation']
+        subscriptions = TierSubscription.objects.filter(pk__in=request.data['ids'])
+        if not request.user.is_staff:
+            subscriptions = subscriptions.filter(subscriber=request.user)
+
+        return Response({'operation': operation, 'updated': update_tier_subscriptions(subscriptions, operation)})
+
     @action(detail=False, methods=['get'])
     def my_subscriptions(self, request):
         """Get current user's active tier subscriptions"""
@@ -539,3 +763,37 @@ class TierSubscriptionViewSet(viewsets.ModelViewSet):
         )
         serializer = self.get_serializer(subscriptions, many=True)
         return Response(serializer.data)
+
+
+class NotificationViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
+    """The current user's inbox, cursor-paginated over the (recipient, created_at, id) index"""
+
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationPagination
+
+    def get_queryset(self):
+        notifications = Notification.objects.filter(recipient=self.request.user)
+        fieldset = self.fieldset
+        # Only join what the requested fields read
+        if fieldset is None or fieldset.includes('author'):
+            return notifications.select_related('post__author')
+        if fieldset.includes('post_title'):
+            return notifications.select_related('post')
+        return notifications
+
+    @action(detail=False, methods=['get'])
+    def unread(self, request):
+        """Get the number of unread notifications from the per-user counter"""
+        return Response({'unread': unread_count(request.user)})
+
+    @action(detail=False, methods=['post'])
+    def read(self, request):
+        """Mark notifications read; pass ``ids`` to mark only some of them"""
+        ids = request.data.get('ids')
+        if ids is not None and (
+            not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids)
+        ):
+            return Response({'error': 'ids must be a list of integers'}, status=status.HTTP_400_BAD_REQUEST)
+        changed = mark_read(request.user, ids)
+        return Response({'marked': changed, 'unread': unread_count(request.user)})
@@ -1,11 +1,27 @@
 """
 ASGI config for boosty_project project.
+
+Everything is served by Django except the Server-Sent Events streams under
+``/api/stream/``, which are long-lived and handled by a lightweight ASGI app.
 """
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'boosty_project.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+if settings.DEBUG:
+    # Serve static files in development, as runserver did
+    django_application = ASGIStaticFilesHandler(django_application)
+
+from boosty_app.streams import STREAM_PREFIX, sse_application  # noqa: E402  (needs the app registry)
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'].startswith(STREAM_PREFIX):
+        return await sse_application(scope, receive, send)
+    return await django_application(scope, receive, send)
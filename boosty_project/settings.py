@@ -3,6 +3,7 @@ Django settings for boosty_project project.
 """
 
 import os
+from datetime import timedelta
 from pathlib import Path
 
 from decouple import config
@@ -79,6 +80,46 @@ DATABASES = {
     }
 }
 
+# Cache - local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared cache in production
+# (required, see boosty_app.checks, with more than one API worker or with AUTH_ACCESS_TOKENS)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# API worker processes (read by uvicorn too); more than one needs a shared cache
+API_WORKERS = config('WEB_CONCURRENCY', default=1, cast=int)
+
+# Seconds creator dashboard statistics stay cached (signals invalidate them earlier on change)
+CREATOR_STATS_CACHE_TIMEOUT = 300
+
+# Paginated list counts: tables the planner estimates above this many rows are never counted in full;
+# unfiltered lists over them report the estimate and filtered ones are counted up to COUNT_CAP rows
+COUNT_ESTIMATE_THRESHOLD = config('COUNT_ESTIMATE_THRESHOLD', default=100_000, cast=int)
+COUNT_CAP = config('COUNT_CAP', default=10_000, cast=int)
+# Seconds an exact list count stays cached (writes to the tables it reads expire it earlier)
+COUNT_CACHE_TIMEOUT = 300
+
+# Seconds between flushes of buffered post view counts (0 disables the background flusher)
+POST_VIEW_FLUSH_INTERVAL = config('POST_VIEW_FLUSH_INTERVAL', default=10, cast=int)
+
+# Reaction totals are spread over this many counter rows per target and kind
+REACTION_COUNTER_SHARDS = config('REACTION_COUNTER_SHARDS', default=16, cast=int)
+REACTION_COUNTS_CACHE_TIMEOUT = 60
+
+# Live event streams: LocalBackend for a single process, PostgresBackend (LISTEN/NOTIFY) across processes
+EVENT_BUS_BACKEND = config('EVENT_BUS_BACKEND', default='boosty_app.events.LocalBackend')
+EVENT_STREAM_QUEUE_SIZE = 100
+SSE_HEARTBEAT_SECONDS = 15
+# Seconds a ?ticket= for opening a stream stays valid (tickets are logged with the URL, so keep this short)
+STREAM_TICKET_TTL = 60
+
+# /api/batch/: sub-requests per batch and threads used to resolve them concurrently
+BATCH_MAX_REQUESTS = 20
+BATCH_MAX_WORKERS = config('BATCH_MAX_WORKERS', default=4, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -137,13 +178,56 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Page counts are cached, estimated or capped instead of a COUNT(*) per request
+    'DEFAULT_PAGINATION_CLASS': 'boosty_app.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 10,
+    # Expiring per-device tokens, resolved from memory or the cache instead of a query per request
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'boosty_app.authentication.CachedTokenAuthentication',
+        'boosty_app.access_tokens.AccessTokenAuthentication',
+    ],
+    # orjson-backed drop-ins for DRF's stdlib JSON renderer and parser
+    'DEFAULT_RENDERER_CLASSES': [
+        'boosty_app.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'boosty_app.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 }
 
+# MessagePack (application/msgpack) for clients that ask for it, when msgpack is installed
+try:
+    import msgpack  # noqa: F401
+
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].insert(1, 'boosty_app.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].insert(1, 'boosty_app.renderers.MessagePackParser')
+except ImportError:
+    pass
+
+# Lifetime of an API token issued at login or registration
+AUTH_TOKEN_TTL = timedelta(days=config('AUTH_TOKEN_TTL_DAYS', default=30, cast=int))
+
+# Seconds a resolved token stays in the shared cache
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+
+# Seconds a resolved token stays in each process's memory; bounds how long a revoked token works elsewhere
+AUTH_TOKEN_LOCAL_TIMEOUT = 5
+
+# Seconds between batched writes of token last-used times (0 leaves them to explicit flushes)
+AUTH_TOKEN_LAST_USED_INTERVAL = 60
+
+# Also issue stateless signed access tokens ("Authorization: Bearer") that carry the user's entitlements
+AUTH_ACCESS_TOKENS = config('AUTH_ACCESS_TOKENS', default=False, cast=bool)
+
+# Seconds an access token, and the entitlement snapshot in it, stays valid
+AUTH_ACCESS_TOKEN_TTL = 300
+
+# Payment provider used for subscription renewals; the fake one charges nobody, so it is only the default with DEBUG
+PAYMENT_BACKEND = config('PAYMENT_BACKEND', default='boosty_app.payments.FakePaymentBackend' if DEBUG else '')
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
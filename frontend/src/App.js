@@ -83,6 +83,8 @@ function App() {
   };
 
   const handleLogout = () => {
+    // Revoke this device's token on the server; the local copy is dropped either way
+    axios.post(getApiUrl('/api/auth/logout/')).catch(() => {});
     localStorage.removeItem('token');
     delete axios.defaults.headers.common['Authorization'];
     setUser(null);
@@ -20,27 +20,11 @@ function CreatorProfile({ creator, onBack, user, onSubscribe, onCreatePost }) {
       const token = localStorage.getItem('token');
       const config = token ? { headers: { Authorization: `Token ${token}` } } : {};
 
-      // Fetch creator's posts
-      const postsResponse = await axios.get(
-        getApiUrl(`/api/profiles/${creator.id}/posts/`),
-        config
-      );
-      setPosts(postsResponse.data);
-
-      // Fetch creator's tiers
-      const tiersResponse = await axios.get(
-        getApiUrl(`/api/profiles/${creator.id}/tiers/`)
-      );
-      setTiers(tiersResponse.data);
-
-      // Fetch user's subscriptions to this creator (if logged in)
-      if (user && token) {
-        const subsResponse = await axios.get(
-          getApiUrl(`/api/tier-subscriptions/by_creator/?creator_id=${creator.id}`),
-          config
-        );
-        setUserSubscriptions(subsResponse.data);
-      }
+      // Profile, tiers, posts with lock state and the viewer's subscriptions in one response
+      const response = await axios.get(getApiUrl(`/api/profiles/${creator.id}/page/`), config);
+      setPosts(response.data.posts.results);
+      setTiers(response.data.tiers);
+      setUserSubscriptions(response.data.viewer.subscriptions);
 
       setLoading(false);
     } catch (err) {
@@ -122,7 +122,7 @@ function FreePosts({ onPostSelect, user }) {
                   )}
 
                   <p className="text-muted-foreground line-clamp-3 text-sm leading-relaxed">
-                    {post.content}
+                    {post.excerpt}
                   </p>
                 </div>
               </div>
@@ -2,8 +2,10 @@ import React, { useState, useEffect, useCallback } from 'react';
 import axios from 'axios';
 import { ArrowLeft, Send, Calendar, Tag, MessageCircle } from 'lucide-react';
 import { getApiUrl } from '../../config/api';
+import { useEventStream } from '../../hooks/use-event-stream';
 
 function PostDetail({ post, onBack, user }) {
+  const [content, setContent] = useState(null);
   const [comments, setComments] = useState([]);
   const [loading, setLoading] = useState(true);
   const [commentContent, setCommentContent] = useState('');
@@ -30,6 +32,30 @@ function PostDetail({ post, onBack, user }) {
     }
   }, [post, fetchComments]);
 
+  // List items carry only an excerpt; the body comes from the post itself
+  useEffect(() => {
+    if (!post) return;
+    setContent(null);
+    const token = localStorage.getItem('token');
+    axios
+      .get(getApiUrl(`/api/posts/${post.id}/?fields=content&expand=`), {
+        headers: token ? { Authorization: `Token ${token}` } : {}
+      })
+      .then((response) => setContent(response.data.content))
+      .catch((err) => console.error('Error fetching post:', err));
+  }, [post]);
+
+  // New top-level comments arrive live; replies are loaded with their thread
+  useEventStream(post ? `/api/stream/posts/${post.id}/comments/` : null, {
+    comment: (comment) => {
+      if (comment.parent) return;
+      setComments((current) =>
+        current.some((existing) => existing.id === comment.id) ? current : [...current, comment]
+      );
+    },
+    reset: fetchComments,
+  });
+
   const handleSubmitComment = async (e) => {
     e.preventDefault();
     if (!user || !commentContent.trim()) return;
@@ -50,7 +76,9 @@ function PostDetail({ post, onBack, user }) {
         }
       );
 
-      setComments([...comments, response.data]);
+      setComments((current) =>
+        current.some((existing) => existing.id === response.data.id) ? current : [...current, response.data]
+      );
       setCommentContent('');
       setSubmitting(false);
     } catch (err) {
@@ -129,7 +157,7 @@ function PostDetail({ post, onBack, user }) {
           </h1>
 
           <div className="prose prose-lg dark:prose-invert max-w-none text-foreground/90 leading-relaxed">
-            <p className="whitespace-pre-wrap">{post.content}</p>
+            <p className="whitespace-pre-wrap">{content ?? post.excerpt}</p>
           </div>
         </div>
 
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { ArrowLeft, ArrowRight, MessageCircle, Calendar, Tag } from 'lucide-react';
 import { getApiUrl } from '../../config/api';
+import { useEventStream } from '../../hooks/use-event-stream';
 
 function PostFeed({ onBack, user }) {
   const [posts, setPosts] = useState([]);
@@ -14,6 +15,24 @@ function PostFeed({ onBack, user }) {
     }
   }, [user]);
 
+  // Prepend newly published posts without re-running the whole feed query
+  useEventStream(user ? '/api/stream/feed/' : null, {
+    post: async ({ id }) => {
+      try {
+        const token = localStorage.getItem('token');
+        const response = await axios.get(getApiUrl(`/api/posts/${id}/?expand=author,category`), {
+          headers: { Authorization: `Token ${token}` }
+        });
+        setPosts((current) =>
+          current.some((existing) => existing.id === id) ? current : [response.data, ...current]
+        );
+      } catch (err) {
+        console.error('Error fetching new post:', err);
+      }
+    },
+    reset: () => fetchFeed(),
+  });
+
   const fetchFeed = async () => {
     try {
       const token = localStorage.getItem('token');
@@ -145,7 +164,7 @@ function PostFeed({ onBack, user }) {
                 )}
 
                 <div className="prose prose-sm dark:prose-invert max-w-none text-muted-foreground">
-                  <p>{post.content.substring(0, 300)}...</p>
+                  <p>{post.excerpt}...</p>
                 </div>
 
                 <div className="pt-4 flex items-center justify-between border-t border-border/50">
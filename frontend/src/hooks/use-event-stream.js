@@ -0,0 +1,77 @@
+import { useEffect, useRef } from "react";
+import axios from "axios";
+import { getApiUrl } from "../config/api";
+
+// Subscribe to a Server-Sent Events stream while the component is mounted.
+// `handlers` maps event names to callbacks receiving the parsed JSON payload.
+// EventSource reconnects on its own; a "reset" event means events were missed
+// and the caller should reload its data.
+export function useEventStream(endpoint, handlers) {
+  const handlersRef = useRef(handlers);
+  handlersRef.current = handlers;
+
+  useEffect(() => {
+    if (!endpoint || typeof window.EventSource === "undefined") {
+      return undefined;
+    }
+
+    let source = null;
+    let listeners = [];
+    let retry = null;
+    let closed = false;
+
+    // EventSource cannot send an Authorization header, and URLs end up in access logs,
+    // so signed-in users open the stream with a short-lived ticket instead of their token
+    const ticketQuery = async () => {
+      const token = localStorage.getItem("token");
+      if (!token) {
+        return "";
+      }
+      const response = await axios.post(getApiUrl("/api/stream-tickets/"), null, {
+        headers: { Authorization: `Token ${token}` }
+      });
+      const separator = endpoint.includes("?") ? "&" : "?";
+      return `${separator}ticket=${encodeURIComponent(response.data.ticket)}`;
+    };
+
+    const open = async () => {
+      let query = "";
+      try {
+        query = await ticketQuery();
+      } catch (err) {
+        console.error("Error fetching stream ticket:", err);
+      }
+      if (closed) {
+        return;
+      }
+      source = new EventSource(getApiUrl(`${endpoint}${query}`));
+      listeners = Object.keys(handlersRef.current).map((name) => {
+        const listener = (message) => {
+          const handler = handlersRef.current[name];
+          if (handler) {
+            handler(JSON.parse(message.data));
+          }
+        };
+        source.addEventListener(name, listener);
+        return [name, listener];
+      });
+      // A refused reconnect (e.g. an expired ticket) closes the source; start over with a new ticket
+      source.onerror = () => {
+        if (source.readyState === EventSource.CLOSED && !closed) {
+          retry = setTimeout(open, 5000);
+        }
+      };
+    };
+
+    open();
+
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      if (source) {
+        listeners.forEach(([name, listener]) => source.removeEventListener(name, listener));
+        source.close();
+      }
+    };
+  }, [endpoint]);
+}
@@ -56,6 +56,9 @@ else
     echo "✅ Data already exists (${USER_COUNT} users found). Skipping sample data creation."
 fi
 
-# Start the Django development server
-echo "🌟 Starting Django development server..."
-exec python manage.py runserver 0.0.0.0:8000
+# Start the ASGI server (needed for the /api/stream/ event streams); reload on code changes in development
+echo "🌟 Starting uvicorn..."
+if [ "${DEBUG:-0}" = "1" ]; then
+    exec uvicorn boosty_project.asgi:application --host 0.0.0.0 --port 8000 --reload
+fi
+exec uvicorn boosty_project.asgi:application --host 0.0.0.0 --port 8000
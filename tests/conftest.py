@@ -3,12 +3,43 @@ Pytest configuration and fixtures for API tests
 """
 import pytest
 from django.contrib.auth.models import User
-from rest_framework.authtoken.models import Token
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
+from boosty_app.authentication import issue_token
 from boosty_app.models import Category, Comment, Post, Subscription, UserProfile
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache"""
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def token_caches(settings):
+    """Resolve tokens from a cold process cache and keep last-used times buffered"""
+    from boosty_app.authentication import last_used, local_tokens
+
+    settings.AUTH_TOKEN_LAST_USED_INTERVAL = 0
+    local_tokens.clear()
+    last_used._times.clear()
+    yield
+    local_tokens.clear()
+    last_used._times.clear()
+
+
+@pytest.fixture(autouse=True)
+def post_view_buffer(settings):
+    """Keep view counts in the buffer until a test flushes them explicitly"""
+    from boosty_app.view_counter import post_views
+
+    settings.POST_VIEW_FLUSH_INTERVAL = 0
+    post_views._counts.clear()
+    yield post_views
+    post_views._counts.clear()
+
+
 @pytest.fixture
 def api_client():
     """API client for making requests"""
@@ -76,16 +107,16 @@ def regular_user(db):
 @pytest.fixture
 def authenticated_client(api_client, user):
     """API client authenticated as regular user"""
-    token = Token.objects.create(user=user)
-    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    _, key = issue_token(user)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
     return api_client
 
 
 @pytest.fixture
 def creator_client(api_client, creator):
     """API client authenticated as creator"""
-    token = Token.objects.create(user=creator)
-    api_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    _, key = issue_token(creator)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
     return api_client
 
 
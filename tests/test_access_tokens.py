@@ -0,0 +1,168 @@
+"""
+Tests for stateless signed access tokens carrying entitlement claims
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core import signing
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.access_tokens import ACCESS_SALT, AccessTokenAuthentication, issue_access_token, read_access_token
+from boosty_app.checks import check_shared_cache
+from boosty_app.models import TierSubscription
+
+
+@pytest.fixture(autouse=True)
+def access_tokens_on(settings):
+    settings.AUTH_ACCESS_TOKENS = True
+
+
+@pytest.fixture
+def tier_subscription(user, paid_post):
+    return TierSubscription.objects.create(subscriber=user, tier=paid_post.tiers.get())
+
+
+def _authenticate(access, method='get'):
+    request = getattr(APIRequestFactory(), method)('/api/posts/', HTTP_AUTHORIZATION=f'Bearer {access}')
+    return AccessTokenAuthentication().authenticate(request)
+
+
+def _bearer(api_client, access):
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+    return api_client
+
+
+@pytest.mark.django_db
+class TestClaims:
+    """Test issuing and reading access tokens"""
+
+    def test_login_returns_access_token(self, api_client, user, tier_subscription):
+        response = api_client.post('/api/auth/login/', {'username': 'testuser', 'password': 'testpass123'})
+
+        assert response.status_code == status.HTTP_200_OK
+        claims = read_access_token(response.data['access'])
+        assert claims.user_id == user.id
+        assert claims.tier_ids == {tier_subscription.tier_id}
+        assert response.data['access_expires_at'] > timezone.now()
+
+    def test_login_without_access_tokens(self, api_client, user, settings):
+        settings.AUTH_ACCESS_TOKENS = False
+
+        response = api_client.post('/api/auth/login/', {'username': 'testuser', 'password': 'testpass123'})
+
+        assert 'access' not in response.data
+
+    def test_reads_run_no_queries(self, creator, django_assert_num_queries):
+        access, _ = issue_access_token(creator)
+
+        with django_assert_num_queries(0):
+            user, claims = _authenticate(access)
+
+        assert user.pk == creator.pk
+        assert user.username == creator.username
+        assert claims.is_creator
+
+    def test_writes_load_the_user(self, user, django_assert_num_queries):
+        access, _ = issue_access_token(user)
+
+        with django_assert_num_queries(1):
+            loaded, _ = _authenticate(access, 'post')
+
+        assert loaded.email == user.email
+
+    def test_expiry_is_capped_by_subscription_end(self, user, tier_subscription):
+        end_date = timezone.now() + timedelta(seconds=30)
+        TierSubscription.objects.filter(pk=tier_subscription.pk).update(end_date=end_date)
+
+        _, expires_at = issue_access_token(user)
+
+        assert expires_at == end_date.replace(microsecond=0)
+
+    def test_tampered_and_expired_tokens(self, user, settings):
+        access, _ = issue_access_token(user)
+        claims = signing.loads(access, salt=ACCESS_SALT)
+        forged = signing.dumps({**claims, 'f': 7}, salt=ACCESS_SALT, key='not-the-secret', compress=True)
+        expired = signing.dumps({**claims, 'x': 0}, salt=ACCESS_SALT, compress=True)
+
+        for value in (access[:-2], forged, expired):
+            with pytest.raises(AuthenticationFailed):
+                _authenticate(value)
+
+    def test_ignored_when_disabled(self, user, settings):
+        access, _ = issue_access_token(user)
+        settings.AUTH_ACCESS_TOKENS = False
+
+        assert _authenticate(access) is None
+
+
+@pytest.mark.django_db
+class TestEntitlements:
+    """Test paid-content checks answered from the claims"""
+
+    def test_paid_post_without_subscription_query(self, api_client, user, paid_post, tier_subscription):
+        access, _ = issue_access_token(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = _bearer(api_client, access).get(f'/api/posts/{paid_post.id}/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['content'] == paid_post.content
+        sql = ' '.join(query['sql'] for query in queries.captured_queries)
+        assert 'boosty_app_tiersubscription' not in sql
+        assert f'"auth_user"."id" = {user.id} ' not in sql
+
+    def test_subscription_change_forces_refresh(self, api_client, user, paid_post, tier_subscription):
+        device = api_client.post('/api/auth/login/', {'username': 'testuser', 'password': 'testpass123'}).data
+        _bearer(api_client, device['access'])
+        assert api_client.get(f'/api/posts/{paid_post.id}/').status_code == status.HTTP_200_OK
+
+        tier_subscription.is_active = False
+        tier_subscription.save()
+
+        assert api_client.get(f'/api/posts/{paid_post.id}/').status_code == status.HTTP_401_UNAUTHORIZED
+
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {device["token"]}')
+        refreshed = api_client.post('/api/auth/refresh/')
+        assert refreshed.status_code == status.HTTP_200_OK
+        assert read_access_token(refreshed.data['access']).tier_ids == frozenset()
+
+    def test_refresh_requires_device_token(self, api_client, user):
+        access, _ = issue_access_token(user)
+
+        response = _bearer(api_client, access).post('/api/auth/refresh/')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_revokes_access_tokens(self, api_client, user):
+        device = api_client.post('/api/auth/login/', {'username': 'testuser', 'password': 'testpass123'}).data
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {device["token"]}')
+        api_client.post('/api/auth/logout/')
+
+        assert read_access_token(device['access']) is None
+
+
+class TestSharedCacheCheck:
+    """Test the system check requiring a shared cache"""
+
+    def test_local_cache_with_access_tokens(self):
+        assert [error.id for error in check_shared_cache(None)] == ['boosty_app.E001']
+
+    def test_local_cache_with_several_workers(self, settings):
+        settings.AUTH_ACCESS_TOKENS = False
+        settings.API_WORKERS = 4
+
+        assert [error.id for error in check_shared_cache(None)] == ['boosty_app.E001']
+
+    def test_single_worker_or_shared_cache(self, settings):
+        settings.AUTH_ACCESS_TOKENS = False
+        assert check_shared_cache(None) == []
+
+        settings.AUTH_ACCESS_TOKENS = True
+        settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+        assert check_shared_cache(None) == []
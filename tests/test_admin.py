@@ -0,0 +1,147 @@
+"""
+Tests for admin changelists: annotated counts, joined relations and autocomplete widgets
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.admin import site
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import DateField, DateTimeField
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from boosty_app.models import Category, Comment, Post, Subscription, SubscriptionTier, TierSubscription
+
+
+@pytest.fixture
+def admin_client(client, settings):
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }
+    client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'adminpass123'))
+    return client
+
+
+def _populate(creator, count, start=0):
+    """Add ``count`` followers, tiers, tier subscriptions, posts and comments"""
+    for i in range(start, start + count):
+        fan = User.objects.create_user(username=f'fan{creator.id}_{i}', password='testpass123')
+        Subscription.objects.create(subscriber=fan, creator=creator.profile)
+        tier = SubscriptionTier.objects.create(creator=creator.profile, name=f'Tier {i}', price='5.00')
+        TierSubscription.objects.create(subscriber=fan, tier=tier)
+        post = Post.objects.create(author=creator, title=f'Post {i}', content='Body', status='published')
+        Comment.objects.create(post=post, author=fan, content='Nice')
+
+
+def _changelist_queries(admin_client, path):
+    cache.clear()  # recount every time: the count is cached until the tables are written
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(path)
+    assert response.status_code == 200
+    return len(queries.captured_queries)
+
+
+@pytest.mark.django_db
+class TestChangelists:
+    """Test that changelist query counts do not grow with the rows shown"""
+
+    @pytest.mark.parametrize(
+        'model',
+        ['userprofile', 'subscription', 'post', 'comment', 'subscriptiontier', 'tiersubscription', 'reaction'],
+    )
+    def test_queries_independent_of_rows(self, admin_client, creator, model):
+        _populate(creator, 1)
+        path = f'/admin/boosty_app/{model}/'
+        few = _changelist_queries(admin_client, path)
+
+        _populate(creator, 5, start=1)
+
+        assert _changelist_queries(admin_client, path) == few
+
+    def test_profile_counts(self, admin_client, creator):
+        _populate(creator, 3)
+
+        response = admin_client.get('/admin/boosty_app/userprofile/')
+
+        profile = next(p for p in response.context['cl'].result_list if p.pk == creator.profile.pk)
+        assert (profile.follower_total, profile.following_total) == (3, 0)
+
+    def test_tier_counts(self, admin_client, creator):
+        _populate(creator, 2)
+        TierSubscription.objects.filter(tier__name='Tier 0').update(is_active=False)
+
+        response = admin_client.get('/admin/boosty_app/subscriptiontier/')
+
+        totals = {tier.name: tier.subscriber_total for tier in response.context['cl'].result_list}
+        assert totals == {'Tier 0': 0, 'Tier 1': 1}
+
+    def test_days_remaining(self, admin_client, creator):
+        _populate(creator, 2)
+        TierSubscription.objects.filter(tier__name='Tier 0').update(
+            end_date=timezone.now() + timedelta(days=3, hours=1)
+        )
+        TierSubscription.objects.filter(tier__name='Tier 1').update(end_date=timezone.now() - timedelta(days=2))
+
+        response = admin_client.get('/admin/boosty_app/tiersubscription/')
+
+        for subscription in response.context['cl'].result_list:
+            assert subscription.days_left == subscription.days_remaining
+        assert sorted(s.days_left for s in response.context['cl'].result_list) == [0, 3]
+
+    def test_no_full_result_count(self, admin_client, creator):
+        _populate(creator, 2)
+
+        response = admin_client.get('/admin/boosty_app/post/?q=Post+1')
+
+        assert response.context['cl'].full_result_count is None
+        assert 'date_hierarchy' not in response.content.decode()
+
+
+@pytest.mark.django_db
+class TestForms:
+    """Test that change forms do not load every user or tier"""
+
+    def test_post_form_uses_autocomplete(self, admin_client, creator, published_post):
+        _populate(creator, 3)
+
+        response = admin_client.get(f'/admin/boosty_app/post/{published_post.id}/change/')
+
+        form = response.context['adminform'].form
+        for name in ('author', 'category', 'tiers'):
+            assert form.fields[name].widget.widget.__class__.__name__.startswith('Autocomplete')
+        assert 'Tier 1' not in response.content.decode()
+
+    def test_tier_autocomplete(self, admin_client, creator):
+        _populate(creator, 3)
+        params = {'app_label': 'boosty_app', 'model_name': 'post', 'field_name': 'tiers'}
+
+        def search(term):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.get('/admin/autocomplete/', {**params, 'term': term})
+            assert response.status_code == 200
+            return len(response.json()['results']), len(queries.captured_queries)
+
+        one, many = search('Tier 1'), search('Tier')
+
+        assert (one[0], many[0]) == (1, 3)
+        assert one[1] == many[1]
+
+
+@pytest.mark.parametrize(
+    'model_admin',
+    [model_admin for model, model_admin in site._registry.items() if model._meta.app_label == 'boosty_app'],
+)
+def test_date_filters_are_indexed(model_admin):
+    """Every date filter on a large table ranges over an index led by that column"""
+    meta = model_admin.model._meta
+    if meta.model is Category:
+        return  # a short lookup table
+    leading = {index.fields[0].lstrip('-') for index in meta.indexes}
+    for name in model_admin.list_filter:
+        if isinstance(name, str) and isinstance(meta.get_field(name), (DateField, DateTimeField)):
+            assert name in leading, f'{meta.label}.{name}'
@@ -0,0 +1,160 @@
+"""Tests for creator daily analytics rollups"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+from boosty_app.analytics import STAT_FIELDS, backfill, run_incremental_rollup
+from boosty_app.models import (
+    Comment,
+    CreatorDailyStats,
+    Post,
+    RollupDirtyBucket,
+    RollupWatermark,
+    Subscription,
+    SubscriptionTier,
+    TierSubscription,
+)
+
+
+@pytest.fixture
+def activity(creator, user, category):
+    """One follower, one paid tier subscriber, one post and one comment today"""
+    tier = SubscriptionTier.objects.create(
+        creator=creator.profile, name='Basic', description='Basic tier', price=Decimal('5.00')
+    )
+    Subscription.objects.create(subscriber=user, creator=creator.profile)
+    TierSubscription.objects.create(subscriber=user, tier=tier, payment_status='completed')
+    post = Post.objects.create(title='Post', content='Content', author=creator, category=category, status='published')
+    Comment.objects.create(post=post, author=user, content='Nice')
+    return tier
+
+
+@pytest.mark.django_db
+class TestIncrementalRollup:
+    """Test watermark-driven rollup updates"""
+
+    def test_rollup_aggregates_today(self, creator, activity):
+        run_incremental_rollup()
+
+        stats = CreatorDailyStats.objects.get(creator=creator.profile, day=timezone.now().date())
+        assert stats.new_followers == 1
+        assert stats.new_tier_subscribers == 1
+        assert stats.revenue == Decimal('5.00')
+        assert stats.posts == 1
+        assert stats.comments == 1
+
+    def test_rollup_advances_watermark(self, creator, activity):
+        now = timezone.now()
+        run_incremental_rollup(now=now)
+        assert RollupWatermark.objects.get().value == now
+
+    def test_rollup_only_processes_changed_rows(self, creator, activity):
+        later = timezone.now() + timedelta(hours=1)
+        run_incremental_rollup(now=later)
+        # Rows older than the watermark (minus the overlap) are not recomputed
+        assert run_incremental_rollup(now=later + timedelta(hours=1)) == 0
+
+    def test_rollup_picks_up_new_rows(self, creator, activity, multiple_creators):
+        run_incremental_rollup()
+        Subscription.objects.create(subscriber=multiple_creators[0], creator=creator.profile)
+        run_incremental_rollup()
+
+        stats = CreatorDailyStats.objects.get(creator=creator.profile)
+        assert stats.new_followers == 2
+
+    def test_rollup_folds_in_deletions(self, creator, user, activity):
+        later = timezone.now() + timedelta(hours=1)
+        run_incremental_rollup(now=later)
+
+        Subscription.objects.filter(subscriber=user).delete()
+        TierSubscription.objects.filter(subscriber=user).delete()
+        Post.objects.filter(author=creator).delete()
+        run_incremental_rollup(now=later + timedelta(hours=1))
+
+        stats = CreatorDailyStats.objects.filter(creator=creator.profile).values(*STAT_FIELDS).get()
+        assert stats == {field: 0 for field in STAT_FIELDS}
+        assert not RollupDirtyBucket.objects.exists()
+
+    def test_rollup_folds_in_deleted_comment(self, creator, activity):
+        run_incremental_rollup()
+        Comment.objects.get().delete()
+        run_incremental_rollup(now=timezone.now() + timedelta(hours=1))
+
+        assert CreatorDailyStats.objects.get(creator=creator.profile).comments == 0
+
+    def test_rollup_skips_deleted_creators(self, creator, activity):
+        creator.delete()
+
+        run_incremental_rollup()
+
+        assert not CreatorDailyStats.objects.exists()
+        assert not RollupDirtyBucket.objects.exists()
+
+    def test_management_command(self, creator, activity):
+        call_command('rollup_creator_stats')
+        assert CreatorDailyStats.objects.filter(creator=creator.profile).exists()
+
+
+@pytest.mark.django_db
+class TestBackfill:
+    """Test rebuilding rollup history"""
+
+    def test_backfill_rebuilds_range(self, creator, activity):
+        today = timezone.now().date()
+        CreatorDailyStats.objects.create(creator=creator.profile, day=today - timedelta(days=3), posts=99)
+
+        written = backfill(today - timedelta(days=10), today, chunk_days=4, workers=1)
+
+        assert written == 1
+        assert not CreatorDailyStats.objects.filter(day=today - timedelta(days=3)).exists()
+        assert CreatorDailyStats.objects.get(creator=creator.profile, day=today).posts == 1
+
+    def test_backfill_command(self, creator, activity):
+        call_command('backfill_creator_stats', '--days', '7', '--workers', '1')
+        assert CreatorDailyStats.objects.filter(creator=creator.profile).count() == 1
+
+
+@pytest.mark.django_db
+class TestAnalyticsEndpoint:
+    """Test creator analytics range endpoint"""
+
+    @pytest.fixture
+    def client(self, creator):
+        client = Client()
+        client.force_login(creator)
+        return client
+
+    def test_returns_zero_filled_range(self, client, creator, activity):
+        run_incremental_rollup()
+        today = timezone.now().date()
+        start = today - timedelta(days=6)
+
+        response = client.get(f'/creator/analytics/?start={start}&end={today}')
+
+        assert response.status_code == 200
+        days = response.json()['days']
+        assert len(days) == 7
+        assert days[0]['posts'] == 0
+        assert days[-1] == {
+            'day': today.isoformat(),
+            'new_followers': 1,
+            'new_tier_subscribers': 1,
+            'revenue': '5.00',
+            'posts': 1,
+            'comments': 1,
+        }
+
+    def test_rejects_invalid_range(self, client):
+        assert client.get('/creator/analytics/?start=2025-02-01&end=2025-01-01').status_code == 400
+        assert client.get('/creator/analytics/?start=2020-01-01&end=2025-01-01').status_code == 400
+        assert client.get('/creator/analytics/?start=yesterday').status_code == 400
+
+    def test_requires_creator(self, user):
+        client = Client()
+        client.force_login(user)
+        assert client.get('/creator/analytics/').status_code == 403
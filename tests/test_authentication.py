@@ -0,0 +1,197 @@
+"""
+Tests for cached, expiring per-device token authentication
+"""
+
+import importlib
+from datetime import timedelta
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.authentication import (
+    CachedTokenAuthentication,
+    issue_token,
+    last_used,
+    local_tokens,
+    resolve_token,
+    token_digest,
+)
+from boosty_app.models import DeviceToken
+
+
+def _authenticate(key):
+    request = APIRequestFactory().get('/api/profiles/me/', HTTP_AUTHORIZATION=f'Token {key}')
+    return CachedTokenAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+class TestResolution:
+    """Test token lookup and its caches"""
+
+    def test_only_digest_is_stored(self, user):
+        token, key = issue_token(user, 'Phone')
+
+        assert token.digest == token_digest(key)
+        assert not DeviceToken.objects.filter(digest=key).exists()
+
+    def test_cache_hits_run_no_queries(self, user, django_assert_num_queries):
+        _, key = issue_token(user)
+        with django_assert_num_queries(1):
+            assert _authenticate(key)[0] == user
+
+        # Warm in this process
+        with django_assert_num_queries(0):
+            assert _authenticate(key)[0] == user
+
+        # Warm in the shared cache only, as in another process
+        local_tokens.clear()
+        with django_assert_num_queries(0):
+            assert _authenticate(key)[0] == user
+
+    def test_unknown_and_expired_tokens(self, user):
+        token, key = issue_token(user)
+        DeviceToken.objects.filter(pk=token.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        assert resolve_token('nope') is None
+        assert resolve_token(key) is None
+
+    def test_cached_token_expires(self, user):
+        token, key = issue_token(user)
+        assert resolve_token(key) is not None
+
+        cached = local_tokens.get(token.digest)
+        cached.expires_at = timezone.now() - timedelta(seconds=1)
+        local_tokens.set(token.digest, cached)
+
+        assert resolve_token(key) is None
+
+    def test_deactivated_user_is_evicted(self, api_client, user):
+        _, key = issue_token(user)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        assert api_client.get('/api/profiles/me/').status_code == status.HTTP_200_OK
+
+        user.is_active = False
+        user.save()
+
+        assert api_client.get('/api/profiles/me/').status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_profile_demotion_is_evicted(self, user):
+        user.is_staff = True
+        user.save()
+        _, key = issue_token(user)
+        assert resolve_token(key).user.is_staff
+
+        profile = user.profile
+        profile.refresh_from_db()
+        profile.is_staff = False
+        profile.save()
+
+        assert not resolve_token(key).user.is_staff
+
+    def test_last_used_is_batched(self, user, django_assert_num_queries):
+        token, key = issue_token(user)
+        _authenticate(key)
+        _authenticate(key)
+
+        assert DeviceToken.objects.get(pk=token.pk).last_used_at is None
+        assert last_used.pending(token.pk) is not None
+        with django_assert_num_queries(1):
+            assert last_used.flush() == 1
+        assert DeviceToken.objects.get(pk=token.pk).last_used_at is not None
+
+
+@pytest.mark.django_db
+class TestTokenEndpoints:
+    """Test issuing, rotating and revoking tokens"""
+
+    def _login(self, api_client, device):
+        response = api_client.post(
+            '/api/auth/login/', {'username': 'testuser', 'password': 'testpass123', 'device': device}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['expires_at'] > timezone.now()
+        return response.data['token']
+
+    def test_one_token_per_device(self, api_client, user):
+        first = self._login(api_client, 'Phone')
+        self._login(api_client, 'Laptop')
+        again = self._login(api_client, 'Phone')
+
+        assert sorted(DeviceToken.objects.filter(user=user).values_list('device', flat=True)) == ['Laptop', 'Phone']
+        assert resolve_token(first) is None
+        assert resolve_token(again).device == 'Phone'
+
+    def test_same_browser_without_device_keeps_both(self, api_client, user):
+        api_client.credentials(HTTP_USER_AGENT='Mozilla/5.0 Firefox/128.0')
+        first = self._login(api_client, '')
+        second = self._login(api_client, '')
+
+        assert DeviceToken.objects.filter(user=user).count() == 2
+        assert resolve_token(first) is not None
+        assert resolve_token(second) is not None
+
+    def test_rotate(self, api_client, user):
+        old = self._login(api_client, 'Phone')
+        resolve_token(old)  # cache it
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {old}')
+
+        response = api_client.post('/api/auth/rotate/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert resolve_token(old) is None
+        assert resolve_token(response.data['token']).device == 'Phone'
+
+    def test_logout_revokes_cached_token(self, api_client, user):
+        key = self._login(api_client, 'Phone')
+        other = self._login(api_client, 'Laptop')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        assert api_client.get('/api/profiles/me/').status_code == status.HTTP_200_OK
+
+        response = api_client.post('/api/auth/logout/')
+
+        assert response.data == {'revoked': 1}
+        assert api_client.get('/api/profiles/me/').status_code == status.HTTP_401_UNAUTHORIZED
+        assert resolve_token(other) is not None
+
+    def test_logout_everywhere(self, api_client, user):
+        key = self._login(api_client, 'Phone')
+        self._login(api_client, 'Laptop')
+        api_client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+
+        response = api_client.post('/api/auth/logout/', {'all': True}, format='json')
+
+        assert response.data == {'revoked': 2}
+        assert not DeviceToken.objects.filter(user=user).exists()
+
+    def test_rotate_requires_token(self, api_client):
+        response = api_client.post('/api/auth/rotate/')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_purge_expired_tokens(user):
+    expired, _ = issue_token(user, 'Old')
+    DeviceToken.objects.filter(pk=expired.pk).update(expires_at=timezone.now() - timedelta(days=1))
+    current, _ = issue_token(user, 'New')
+
+    call_command('purge_expired_tokens', '--batch-size', '1')
+
+    assert list(DeviceToken.objects.values_list('pk', flat=True)) == [current.pk]
+
+
+@pytest.mark.django_db
+def test_drf_tokens_are_carried_over(user):
+    legacy = Token.objects.create(user=user)
+    migration = importlib.import_module('boosty_app.migrations.0016_device_tokens')
+
+    migration.import_drf_tokens(apps, None)
+
+    token = resolve_token(legacy.key)
+    assert token.user == user
+    assert token.device == 'legacy'
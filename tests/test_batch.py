@@ -0,0 +1,145 @@
+"""Tests for the batch request endpoint"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from boosty_app.authentication import issue_token
+
+
+def _by_id(response):
+    return {item['id']: item for item in response.data['responses']}
+
+
+@pytest.mark.django_db
+class TestBatchEndpoint:
+    """Test /api/batch/"""
+
+    def test_resolves_sub_requests(self, authenticated_client, creator, published_post):
+        profile_id = creator.profile.id
+        response = authenticated_client.post(
+            '/api/batch/',
+            {
+                'requests': [
+                    {'id': 'posts', 'path': f'/api/profiles/{profile_id}/posts/'},
+                    {'id': 'tiers', 'path': f'/api/profiles/{profile_id}/tiers/'},
+                    {'id': 'subs', 'path': f'/api/tier-subscriptions/by_creator/?creator_id={profile_id}'},
+                ]
+            },
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        results = _by_id(response)
+        assert [item['id'] for item in response.data['responses']] == ['posts', 'tiers', 'subs']
+        assert all(item['status'] == 200 for item in results.values())
+        assert results['posts']['body'] == authenticated_client.get(f'/api/profiles/{profile_id}/posts/').data
+        assert (
+            results['subs']['body']
+            == authenticated_client.get(f'/api/tier-subscriptions/by_creator/?creator_id={profile_id}').data
+        )
+
+    def test_plain_paths_are_accepted(self, api_client, published_post):
+        response = api_client.post('/api/batch/', {'requests': [f'/api/posts/{published_post.id}/']}, format='json')
+
+        item = response.data['responses'][0]
+        assert item['id'] == 0
+        assert item['body']['title'] == published_post.title
+
+    def test_token_is_looked_up_once(self, authenticated_client, published_post, creator):
+        paths = [f'/api/posts/{published_post.id}/', '/api/posts/', f'/api/profiles/{creator.profile.id}/tiers/']
+        with CaptureQueriesContext(connection) as queries:
+            authenticated_client.post('/api/batch/', {'requests': paths}, format='json')
+
+        token_queries = [q for q in queries.captured_queries if 'boosty_app_devicetoken' in q['sql']]
+        assert len(token_queries) == 1
+
+    def test_identical_paths_run_once(self, api_client, published_post):
+        path = f'/api/posts/{published_post.id}/'
+        # Warm the reaction counts cache so both measured batches do the same work
+        api_client.post('/api/batch/', {'requests': [path]}, format='json')
+        with CaptureQueriesContext(connection) as single:
+            api_client.post('/api/batch/', {'requests': [path]}, format='json')
+        with CaptureQueriesContext(connection) as double:
+            response = api_client.post(
+                '/api/batch/', {'requests': [{'id': 'a', 'path': path}, {'id': 'b', 'path': path}]}, format='json'
+            )
+
+        assert len(double.captured_queries) == len(single.captured_queries)
+        results = _by_id(response)
+        assert results['a']['body'] == results['b']['body']
+
+    def test_sub_request_permissions_apply(self, api_client, draft_post):
+        response = api_client.post(
+            '/api/batch/',
+            {
+                'requests': [
+                    {'id': 'inbox', 'path': '/api/notifications/'},
+                    {'id': 'draft', 'path': f'/api/posts/{draft_post.id}/'},
+                ]
+            },
+            format='json',
+        )
+
+        results = _by_id(response)
+        assert results['inbox']['status'] == status.HTTP_401_UNAUTHORIZED
+        assert results['draft']['status'] == status.HTTP_404_NOT_FOUND
+
+    def test_unroutable_paths(self, api_client):
+        response = api_client.post(
+            '/api/batch/',
+            {
+                'requests': [
+                    {'id': 'missing', 'path': '/api/nothing-here/'},
+                    {'id': 'nested', 'path': '/api/batch/'},
+                    {'id': 'admin', 'path': '/admin/'},
+                ]
+            },
+            format='json',
+        )
+
+        results = _by_id(response)
+        assert results['missing']['status'] == status.HTTP_404_NOT_FOUND
+        assert results['nested']['status'] == status.HTTP_400_BAD_REQUEST
+        assert results['admin']['status'] == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize(
+        'payload',
+        [
+            {},
+            {'requests': []},
+            {'requests': 'not-a-list'},
+            {'requests': [{'path': '/api/posts/', 'method': 'POST'}]},
+            {'requests': [{'id': 'no-path'}]},
+        ],
+    )
+    def test_malformed_batches(self, api_client, payload):
+        response = api_client.post('/api/batch/', payload, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_batch_size_limit(self, settings, api_client):
+        settings.BATCH_MAX_REQUESTS = 2
+        response = api_client.post('/api/batch/', {'requests': ['/api/posts/'] * 3}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sub_requests_run_concurrently_outside_transactions(settings, user, creator, category):
+    from boosty_app.models import Post
+
+    settings.BATCH_MAX_WORKERS = 4
+    posts = [
+        Post.objects.create(title=f'Post {i}', content='Content', author=creator, category=category, status='published')
+        for i in range(4)
+    ]
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {issue_token(user)[1]}')
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post('/api/batch/', {'requests': [f'/api/posts/{post.id}/' for post in posts]}, format='json')
+
+    assert [item['body']['title'] for item in response.data['responses']] == [post.title for post in posts]
+    # Post lookups ran on worker threads' own connections, not the request's
+    assert not [q for q in queries.captured_queries if 'boosty_app_post' in q['sql']]
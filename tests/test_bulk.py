@@ -0,0 +1,234 @@
+"""
+Tests for set-based bulk actions on posts and tier subscriptions
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import pre_save
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from boosty_app import bulk
+from boosty_app.creator_stats import CACHE_KEY
+from boosty_app.models import Comment, NotificationFanout, Post, SubscriptionTier, TierSubscription
+from boosty_app.pagination import COUNT_VERSION_KEY, deferred_count_invalidation, invalidate_counts
+
+
+@pytest.fixture
+def staff_client(api_client):
+    staff = User.objects.create_user(username='moderator', password='testpass123', is_staff=True)
+    api_client.force_authenticate(user=staff)
+    return api_client
+
+
+@pytest.fixture
+def drafts(creator, category):
+    return [
+        Post.objects.create(title=f'Draft {i}', content='Body', author=creator, category=category, status='draft')
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def tier_subscriptions(user, creator):
+    tier = SubscriptionTier.objects.create(creator=creator.profile, name='Basic', price='5.00')
+    fans = [User.objects.create_user(username=f'fan{i}', password='testpass123') for i in range(2)]
+    return [TierSubscription.objects.create(subscriber=subscriber, tier=tier) for subscriber in [user, *fans]]
+
+
+@pytest.mark.django_db
+class TestBulkPosts:
+    """Test POST /api/posts/bulk/"""
+
+    def test_publish_in_one_update(self, creator_client, creator, drafts, published_post):
+        saves = []
+        pre_save.connect(lambda **kwargs: saves.append(kwargs), sender=Post, weak=False, dispatch_uid='count-saves')
+        ids = [post.id for post in drafts] + [published_post.id]
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = creator_client.post('/api/posts/bulk/', {'ids': ids, 'operation': 'publish'}, format='json')
+        finally:
+            pre_save.disconnect(sender=Post, dispatch_uid='count-saves')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'operation': 'publish', 'updated': 3}
+        assert set(Post.objects.filter(id__in=ids).values_list('status', flat=True)) == {'published'}
+        assert saves == []
+        assert sum(q['sql'].startswith('UPDATE "boosty_app_post"') for q in queries.captured_queries) == 1
+
+    def test_publish_queues_fanout_once(self, creator_client, drafts, monkeypatch):
+        events = []
+        monkeypatch.setattr(bulk, 'publish', lambda channel, event: events.append(event['id']))
+        ids = [post.id for post in drafts]
+        NotificationFanout.objects.create(post=drafts[0])
+
+        creator_client.post('/api/posts/bulk/', {'ids': ids, 'operation': 'publish'}, format='json')
+
+        assert NotificationFanout.objects.filter(post__in=drafts).count() == 3
+        assert sorted(events) == sorted(ids[1:])
+
+    @pytest.mark.parametrize(
+        'operation,field,before,after',
+        [
+            ('archive', 'status', 'published', 'archived'),
+            ('make_free', 'is_free', False, True),
+            ('make_paid', 'is_free', True, False),
+        ],
+    )
+    def test_operations(self, creator_client, published_post, operation, field, before, after):
+        Post.objects.filter(pk=published_post.pk).update(**{field: before})
+
+        response = creator_client.post(
+            '/api/posts/bulk/', {'ids': [published_post.id], 'operation': operation}, format='json'
+        )
+
+        assert response.data['updated'] == 1
+        assert getattr(Post.objects.get(pk=published_post.pk), field) == after
+
+    def test_invalidates_creator_stats(self, creator_client, creator, drafts):
+        cache.set(CACHE_KEY.format(user_id=creator.id), {'posts': 0})
+
+        creator_client.post('/api/posts/bulk/', {'ids': [drafts[0].id], 'operation': 'publish'}, format='json')
+
+        assert cache.get(CACHE_KEY.format(user_id=creator.id)) is None
+
+    def test_delete(self, creator_client, published_post, comment, drafts):
+        ids = [published_post.id, drafts[0].id]
+
+        response = creator_client.post('/api/posts/bulk/', {'ids': ids, 'operation': 'delete'}, format='json')
+
+        assert response.data == {'operation': 'delete', 'deleted': 2}
+        assert not Post.objects.filter(id__in=ids).exists()
+        assert not Comment.objects.filter(pk=comment.pk).exists()
+
+    def test_creators_only_touch_own_posts(self, authenticated_client, drafts):
+        response = authenticated_client.post(
+            '/api/posts/bulk/', {'ids': [post.id for post in drafts], 'operation': 'publish'}, format='json'
+        )
+
+        assert response.data['updated'] == 0
+        assert not Post.objects.filter(status='published').exists()
+
+    def test_staff_touch_any_post(self, staff_client, drafts):
+        response = staff_client.post('/api/posts/bulk/', {'ids': [drafts[0].id], 'operation': 'publish'}, format='json')
+
+        assert response.data['updated'] == 1
+
+    @pytest.mark.parametrize(
+        'payload',
+        [
+            {'ids': [1], 'operation': 'explode'},
+            {'ids': '1,2', 'operation': 'publish'},
+            {'ids': [1, 'x'], 'operation': 'publish'},
+            {'ids': list(range(bulk.MAX_IDS + 1)), 'operation': 'publish'},
+        ],
+    )
+    def test_invalid_requests(self, creator_client, payload):
+        response = creator_client.post('/api/posts/bulk/', payload, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'error' in response.data
+
+    def test_requires_authentication(self, api_client, drafts):
+        response = api_client.post('/api/posts/bulk/', {'ids': [drafts[0].id], 'operation': 'publish'}, format='json')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestBulkTierSubscriptions:
+    """Test POST /api/tier-subscriptions/bulk/"""
+
+    def test_deactivate_own(self, authenticated_client, user, tier_subscriptions):
+        ids = [subscription.id for subscription in tier_subscriptions]
+
+        response = authenticated_client.post(
+            '/api/tier-subscriptions/bulk/', {'ids': ids, 'operation': 'deactivate'}, format='json'
+        )
+
+        assert response.data == {'operation': 'deactivate', 'updated': 1}
+        assert list(TierSubscription.objects.filter(is_active=False).values_list('subscriber', flat=True)) == [user.id]
+
+    def test_staff_deactivate_and_cancel(self, staff_client, creator, tier_subscriptions):
+        ids = [subscription.id for subscription in tier_subscriptions]
+        cache.set(CACHE_KEY.format(user_id=creator.id), {'subscribers': 3})
+
+        deactivated = staff_client.post(
+            '/api/tier-subscriptions/bulk/', {'ids': ids, 'operation': 'deactivate'}, format='json'
+        )
+        cancelled = staff_client.post(
+            '/api/tier-subscriptions/bulk/', {'ids': ids, 'operation': 'cancel'}, format='json'
+        )
+
+        assert deactivated.data['updated'] == 3
+        assert cancelled.data['updated'] == 3
+        assert not TierSubscription.objects.filter(cancelled_at__isnull=True).exists()
+        assert cache.get(CACHE_KEY.format(user_id=creator.id)) is None
+        updated = TierSubscription.objects.get(pk=ids[0]).updated_at
+        assert timezone.now() - updated < timedelta(minutes=1)
+
+    def test_invalid_operation(self, authenticated_client, tier_subscriptions):
+        response = authenticated_client.post(
+            '/api/tier-subscriptions/bulk/', {'ids': [tier_subscriptions[0].id], 'operation': 'publish'}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_deferred_count_invalidation():
+    key = COUNT_VERSION_KEY.format(table='boosty_app_post')
+    invalidate_counts('boosty_app_post')
+    before = cache.get(key)
+
+    with deferred_count_invalidation():
+        invalidate_counts('boosty_app_post')
+        invalidate_counts('boosty_app_post')
+        assert cache.get(key) == before
+
+    assert cache.get(key) == before + 1
+
+
+@pytest.mark.django_db
+class TestAdminActions:
+    """Test the bulk changelist actions"""
+
+    @pytest.fixture
+    def admin_client(self, client, settings):
+        settings.STORAGES = {
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        }
+        client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'adminpass123'))
+        return client
+
+    def test_publish_action(self, admin_client, drafts):
+        response = admin_client.post(
+            '/admin/boosty_app/post/',
+            {'action': 'publish_posts', '_selected_action': [post.id for post in drafts[:2]]},
+        )
+
+        assert response.status_code == 302
+        assert Post.objects.filter(status='published').count() == 2
+
+    def test_delete_selected(self, admin_client, drafts):
+        response = admin_client.post(
+            '/admin/boosty_app/post/',
+            {'action': 'delete_selected', 'post': 'yes', '_selected_action': [post.id for post in drafts]},
+        )
+
+        assert response.status_code == 302
+        assert not Post.objects.exists()
+
+    def test_deactivate_action(self, admin_client, tier_subscriptions):
+        admin_client.post(
+            '/admin/boosty_app/tiersubscription/',
+            {'action': 'deactivate_subscriptions', '_selected_action': [tier_subscriptions[0].id]},
+        )
+
+        assert TierSubscription.objects.filter(is_active=True).count() == 2
@@ -118,6 +118,100 @@ class TestCommentList:
         assert comment.id in comment_ids
 
 
+@pytest.mark.django_db
+class TestCommentVisibility:
+    """Test set-based comment visibility"""
+
+    def test_tier_subscriber_sees_paid_post_comments(self, authenticated_client, user, creator, paid_post):
+        """Test an active tier subscription unlocks comments without following"""
+        from boosty_app.models import Comment, TierSubscription
+
+        comment = Comment.objects.create(post=paid_post, author=creator, content='Tier only')
+        TierSubscription.objects.create(subscriber=user, tier=paid_post.tiers.get())
+
+        response = authenticated_client.get('/api/comments/')
+
+        assert comment.id in [c['id'] for c in response.data['results']]
+
+    def test_tier_subscriber_can_comment_on_paid_post(self, authenticated_client, user, paid_post):
+        """Test an active tier subscription allows commenting"""
+        from boosty_app.models import TierSubscription
+
+        TierSubscription.objects.create(subscriber=user, tier=paid_post.tiers.get())
+        data = {'post': paid_post.id, 'content': 'Thanks!'}
+
+        response = authenticated_client.post('/api/comments/', data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_expired_tier_subscription_hides_comments(self, authenticated_client, user, creator, paid_post):
+        """Test lapsed tier subscriptions no longer grant access"""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from boosty_app.models import Comment, TierSubscription
+
+        comment = Comment.objects.create(post=paid_post, author=creator, content='Tier only')
+        TierSubscription.objects.create(
+            subscriber=user, tier=paid_post.tiers.get(), end_date=timezone.now() - timedelta(days=1)
+        )
+
+        response = authenticated_client.get('/api/comments/')
+
+        assert comment.id not in [c['id'] for c in response.data['results']]
+
+    def test_visibility_query_has_no_distinct(self, user):
+        """Test the visibility filter is a semi-join rather than a DISTINCT over joins"""
+        from boosty_app.entitlements import discussable_posts
+        from boosty_app.models import Comment
+
+        queryset = Comment.objects.filter(post_id__in=discussable_posts(user).values('id'))
+
+        assert 'DISTINCT' not in str(queryset.query)
+
+    def test_paid_post_without_tiers_is_discussable(self, authenticated_client, creator, category):
+        """Test paid posts without tiers are open to comments, as user_has_access treats them"""
+        from django.contrib.auth.models import AnonymousUser
+
+        from boosty_app.entitlements import discussable_posts
+        from boosty_app.models import Comment, Post
+
+        post = Post.objects.create(
+            title='Untiered', content='Content', author=creator, category=category, status='published', is_free=False
+        )
+        comment = Comment.objects.create(post=post, author=creator, content='Open')
+
+        assert discussable_posts(AnonymousUser()).filter(pk=post.pk).exists()
+        response = authenticated_client.get('/api/comments/')
+        assert comment.id in [c['id'] for c in response.data['results']]
+
+        response = authenticated_client.post('/api/comments/', {'post': post.id, 'content': 'Hi'}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_readable_filter_matches_user_has_access(self, user, creator, category, paid_post, free_post):
+        """Test the SQL rule agrees with Post.user_has_access post by post"""
+        from django.contrib.auth.models import AnonymousUser
+
+        from boosty_app.entitlements import readable_post_filter
+        from boosty_app.models import Post, SubscriptionTier, TierSubscription
+
+        Post.objects.create(title='Untiered', content='Content', author=creator, category=category, is_free=False)
+        other_tier_post = Post.objects.create(
+            title='Other', content='Content', author=creator, category=category, is_free=False
+        )
+        other_tier_post.tiers.add(
+            SubscriptionTier.objects.create(creator=creator.profile, name='Gold', description='Gold', price='20.00')
+        )
+        TierSubscription.objects.create(subscriber=user, tier=paid_post.tiers.get())
+        posts = list(Post.objects.all())
+
+        for viewer in (AnonymousUser(), user, creator):
+            expected = {post.id for post in posts if post.user_has_access(viewer)}
+            readable = set(Post.objects.filter(readable_post_filter(viewer)).values_list('id', flat=True))
+            assert readable == expected
+
+
 @pytest.mark.django_db
 class TestCommentDetail:
     """Test comment detail endpoint"""
@@ -230,3 +324,98 @@ class TestCommentDetail:
         response = authenticated_client.delete(f'/api/comments/{comment.id}/')
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestCommentThreads:
+    """Test threaded replies stored as materialized paths"""
+
+    def test_reply_builds_path_and_counts(self, authenticated_client, published_post, comment):
+        """Test replying through the API extends the parent's path"""
+        from boosty_app.models import Comment
+
+        data = {'post': published_post.id, 'parent': comment.id, 'content': 'A reply'}
+        response = authenticated_client.post('/api/comments/', data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['depth'] == 1
+        reply = Comment.objects.get(id=response.data['id'])
+        assert reply.path.startswith(Comment.objects.get(id=comment.id).path)
+        assert reply.ancestor_ids == [comment.id]
+        comment.refresh_from_db()
+        assert comment.reply_count == 1
+
+    def test_saving_a_stale_parent_keeps_reply_count(self, published_post, comment, user):
+        """Test a full save of a parent loaded before a reply does not reset its count"""
+        from boosty_app.models import Comment
+
+        stale = Comment.objects.get(pk=comment.pk)
+        Comment.objects.create(post=published_post, author=user, parent=comment, content='Reply')
+
+        stale.content = 'Edited'
+        stale.save()
+
+        comment.refresh_from_db()
+        assert (comment.content, comment.reply_count) == ('Edited', 1)
+
+    def test_reply_must_match_post(self, authenticated_client, comment, free_post):
+        """Test a reply cannot attach to a comment on another post"""
+        data = {'post': free_post.id, 'parent': comment.id, 'content': 'Wrong post'}
+        response = authenticated_client.post('/api/comments/', data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_post_comments_lists_top_level_only(self, api_client, published_post, comment, user):
+        """Test the post comments endpoint pages top-level comments with reply counts"""
+        from boosty_app.models import Comment
+
+        Comment.objects.create(post=published_post, author=user, parent=comment, content='Reply')
+
+        response = api_client.get(f'/api/posts/{published_post.id}/comments/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [c['id'] for c in response.data['results']] == [comment.id]
+        assert response.data['results'][0]['reply_count'] == 1
+        assert 'next' in response.data
+
+    def test_post_comments_cursor_pagination(self, api_client, published_post, user):
+        """Test top-level comments are walked with cursors"""
+        from boosty_app.models import Comment
+
+        for i in range(25):
+            Comment.objects.create(post=published_post, author=user, content=f'Comment {i}')
+
+        first = api_client.get(f'/api/posts/{published_post.id}/comments/')
+        assert len(first.data['results']) == 20
+        second = api_client.get(first.data['next'])
+        assert len(second.data['results']) == 5
+        assert second.data['results'][-1]['content'] == 'Comment 24'
+
+    def test_replies_return_subtree_in_thread_order(self, api_client, published_post, comment, user):
+        """Test replies load depth-first and can be limited by depth"""
+        from boosty_app.models import Comment
+
+        first = Comment.objects.create(post=published_post, author=user, parent=comment, content='First')
+        second = Comment.objects.create(post=published_post, author=user, parent=comment, content='Second')
+        nested = Comment.objects.create(post=published_post, author=user, parent=first, content='Nested')
+
+        response = api_client.get(f'/api/comments/{comment.id}/replies/')
+        assert [c['id'] for c in response.data['results']] == [first.id, nested.id, second.id]
+
+        response = api_client.get(f'/api/comments/{comment.id}/replies/?depth=1')
+        assert [c['id'] for c in response.data['results']] == [first.id, second.id]
+
+    def test_deleting_reply_updates_ancestor_counts(self, published_post, comment, user):
+        """Test deleting a subtree decrements every ancestor"""
+        from boosty_app.models import Comment
+
+        child = Comment.objects.create(post=published_post, author=user, parent=comment, content='Child')
+        Comment.objects.create(post=published_post, author=user, parent=child, content='Grandchild')
+        comment.refresh_from_db()
+        assert comment.reply_count == 2
+
+        Comment.objects.get(id=child.id).delete()
+
+        comment.refresh_from_db()
+        assert comment.reply_count == 0
+        assert not comment.subtree().exists()
@@ -0,0 +1,185 @@
+"""
+Tests for cached, estimated and capped list counts
+"""
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from boosty_app.authentication import issue_token
+from boosty_app.models import (
+    Category,
+    DeviceToken,
+    Post,
+    Reaction,
+    Subscription,
+    SubscriptionTier,
+    TierSubscription,
+)
+from boosty_app.pagination import (
+    COUNT_VERSION_KEY,
+    EstimatedCountPagination,
+    EstimatedCountPaginator,
+    count_rows,
+    invalidate_counts,
+    query_tables,
+)
+
+
+def _counts(queries):
+    return [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT COUNT(*)')]
+
+
+def _analyze(model):
+    with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+
+@pytest.mark.django_db
+class TestExactCounts:
+    """Small tables are counted exactly and cached until written"""
+
+    def test_count_is_cached(self, api_client, published_post):
+        api_client.get('/api/posts/')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/posts/')
+
+        assert response.data['count'] == 1
+        assert response.data['count_is_approximate'] is False
+        assert _counts(queries) == []
+
+    def test_write_invalidates(self, api_client, published_post, creator):
+        api_client.get('/api/posts/')
+        Post.objects.create(title='Another', content='Body', author=creator, status='published')
+
+        assert api_client.get('/api/posts/').data['count'] == 2
+
+    def test_joined_table_write_invalidates(self, creator, published_post):
+        queryset = Post.objects.filter(author__username=creator.username)
+        assert count_rows(queryset) == (1, False)
+
+        User.objects.filter(pk=creator.pk).update(username='renamed')
+        invalidate_counts(User._meta.db_table)
+
+        assert count_rows(queryset) == (0, False)
+
+    def test_m2m_change_invalidates(self, creator, published_post):
+        tier = SubscriptionTier.objects.create(creator=creator.profile, name='Gold', price='5.00')
+        queryset = Post.objects.filter(tiers=tier)
+        assert count_rows(queryset) == (0, False)
+
+        published_post.tiers.add(tier)
+
+        assert count_rows(queryset) == (1, False)
+
+    def test_subquery_table_write_invalidates(self, user, paid_post):
+        tier = paid_post.tiers.get()
+        tier_ids = TierSubscription.objects.filter(subscriber=user, is_active=True).values('tier_id')
+        by_in = Post.objects.filter(tiers__in=tier_ids)
+        by_exists = Post.objects.filter(Exists(tier_ids.filter(tier=OuterRef('tiers'))))
+        assert count_rows(by_in) == count_rows(by_exists) == (0, False)
+
+        TierSubscription.objects.bulk_create(
+            [TierSubscription(subscriber=user, tier=tier, end_date=paid_post.created_at)]
+        )
+        invalidate_counts(TierSubscription._meta.db_table)
+
+        assert count_rows(by_in) == count_rows(by_exists) == (1, False)
+
+    def test_query_tables(self, user):
+        subscribed = Subscription.objects.filter(subscriber=user).values('creator__user_id')
+        queryset = Post.objects.filter(author__in=subscribed).annotate(
+            reacted=Exists(Reaction.objects.filter(post=OuterRef('pk')))
+        )
+
+        assert query_tables(queryset.query) == {
+            'auth_user',
+            'boosty_app_post',
+            'boosty_app_subscription',
+            'boosty_app_userprofile',
+            'boosty_app_reaction',
+        }
+
+    def test_unlisted_writes_keep_counts(self, user):
+        key = COUNT_VERSION_KEY.format(table=DeviceToken._meta.db_table)
+
+        issue_token(user)
+
+        assert cache.get(key) is None
+
+    def test_distinct_queries_are_cached_apart(self, published_post, draft_post):
+        assert count_rows(Post.objects.filter(status='published')) == (1, False)
+        assert count_rows(Post.objects.filter(status='draft')) == (1, False)
+        assert count_rows(Post.objects.none()) == (0, False)
+
+    def test_list_paginator(self):
+        paginator = EstimatedCountPaginator(list(range(25)), 10)
+
+        assert (paginator.count, paginator.approximate, paginator.num_pages) == (25, False, 3)
+
+
+@pytest.mark.django_db
+class TestLargeTables:
+    """Tables estimated above COUNT_ESTIMATE_THRESHOLD are never counted in full"""
+
+    @pytest.fixture(autouse=True)
+    def large(self, settings):
+        settings.COUNT_ESTIMATE_THRESHOLD = 1
+        settings.COUNT_CAP = 2
+
+    def test_unfiltered_list_reports_estimate(self, api_client, db):
+        for name in ('Art', 'Music', 'Games'):
+            Category.objects.create(name=name)
+        _analyze(Category)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/categories/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 3
+        assert response.data['count_is_approximate'] is True
+        assert _counts(queries) == []
+
+    def test_filtered_list_is_capped(self, api_client, multiple_posts):
+        _analyze(Post)
+
+        response = api_client.get('/api/posts/')
+
+        assert response.data['count'] == 2
+        assert response.data['count_is_approximate'] is True
+        # The page still holds every row; whether another follows is read from the rows, not the count
+        assert len(response.data['results']) == len(multiple_posts)
+        assert response.data['next'] is None
+
+    def test_pages_past_an_estimate(self, api_client, multiple_posts, monkeypatch):
+        monkeypatch.setattr(EstimatedCountPagination, 'page_size', 1)
+        _analyze(Post)
+
+        response = api_client.get('/api/posts/?page=4')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 1
+        assert response.data['next'] is not None
+
+    def test_unanalyzed_table_is_counted(self, published_post):
+        assert count_rows(Post.objects.filter(status='published')) == (1, False)
+
+
+@pytest.mark.django_db
+def test_admin_changelist(client, settings, published_post):
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    }
+    client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'adminpass123'))
+
+    response = client.get('/admin/boosty_app/post/')
+
+    assert response.status_code == 200
+    assert isinstance(response.context['cl'].paginator, EstimatedCountPaginator)
+    assert response.context['cl'].result_count == 1
@@ -83,6 +83,42 @@ class TestCreatorDashboard:
         assert response.status_code == 200
         assert len(response.context['recent_posts']) >= 1
 
+    def test_dashboard_tier_statistics(self, creator_client, creator, user):
+        """Test dashboard aggregates tier subscribers and revenue"""
+        from decimal import Decimal
+
+        from boosty_app.models import SubscriptionTier, TierSubscription
+
+        tier = SubscriptionTier.objects.create(
+            creator=creator.profile, name='Gold', description='Gold tier', price=Decimal('7.50')
+        )
+        SubscriptionTier.objects.create(
+            creator=creator.profile, name='Old', description='Old tier', price=Decimal('3.00'), is_active=False
+        )
+        TierSubscription.objects.create(subscriber=user, tier=tier)
+        Subscription.objects.create(subscriber=user, creator=creator.profile)
+
+        response = creator_client.get('/creator/')
+        assert response.context['total_tiers'] == 2
+        assert response.context['active_tiers'] == 1
+        assert response.context['total_tier_subscribers'] == 1
+        assert response.context['monthly_revenue'] == Decimal('7.50')
+        assert response.context['subscriber_count'] == 1
+
+    def test_dashboard_statistics_are_cached(self, creator_client, creator, django_assert_max_num_queries):
+        """Test repeat dashboard loads reuse cached statistics"""
+        creator_client.get('/creator/')
+        with django_assert_max_num_queries(8):
+            creator_client.get('/creator/')
+
+    def test_dashboard_statistics_invalidated_on_change(self, creator_client, creator, category):
+        """Test cached statistics are dropped when a post is created"""
+        assert creator_client.get('/creator/').context['total_posts'] == 0
+        Post.objects.create(title='New', content='Content', author=creator, category=category, status='draft')
+        response = creator_client.get('/creator/')
+        assert response.context['total_posts'] == 1
+        assert response.context['draft_posts'] == 1
+
 
 @pytest.mark.django_db
 class TestCreatorPostsList:
@@ -503,3 +539,63 @@ class TestCreatorSubscribers:
         assert response.status_code == 200
         assert len(response.context['subscriptions']) == 0
         assert response.context['subscriber_count'] == 0
+
+
+@pytest.mark.django_db
+class TestDashboardKeysetPagination:
+    """Test keyset pagination on dashboard listings"""
+
+    @pytest.fixture
+    def small_pages(self, monkeypatch):
+        monkeypatch.setattr('boosty_app.creator_views.DASHBOARD_PAGE_SIZE', 2)
+
+    def test_subscribers_paginate_with_cursor(self, small_pages, creator_client, creator, multiple_creators, user):
+        """Test walking all subscriber pages via next cursors"""
+        for follower in multiple_creators + [user]:
+            Subscription.objects.create(subscriber=follower, creator=creator.profile)
+
+        first = creator_client.get('/creator/subscribers/')
+        assert len(first.context['subscriptions']) == 2
+        assert first.context['subscriptions'].has_next
+        assert first.context['subscriber_count'] == 4
+
+        second = creator_client.get('/creator/subscribers/' + first.context['subscriptions'].next_query)
+        assert len(second.context['subscriptions']) == 2
+        assert not second.context['subscriptions'].has_next
+
+        seen = [s.subscriber.username for s in first.context['subscriptions']]
+        seen += [s.subscriber.username for s in second.context['subscriptions']]
+        assert sorted(seen) == sorted(u.username for u in multiple_creators + [user])
+
+    def test_posts_cursor_keeps_status_filter(self, small_pages, creator_client, creator, category):
+        """Test next page link preserves the status filter"""
+        for i in range(3):
+            Post.objects.create(title=f'Draft {i}', content='Content', author=creator, category=category)
+        Post.objects.create(title='Live', content='Content', author=creator, category=category, status='published')
+
+        first = creator_client.get('/creator/posts/?status=draft')
+        assert first.context['post_count'] == 3
+        next_query = first.context['posts'].next_query
+        assert 'status=draft' in next_query
+
+        second = creator_client.get('/creator/posts/' + next_query)
+        assert [p.status for p in second.context['posts']] == ['draft']
+
+    def test_invalid_cursor_returns_first_page(self, small_pages, creator_client, creator, category):
+        """Test a malformed cursor falls back to the first page"""
+        Post.objects.create(title='Post', content='Content', author=creator, category=category)
+        response = creator_client.get('/creator/posts/?cursor=not-a-cursor')
+        assert response.status_code == 200
+        assert len(response.context['posts']) == 1
+
+    def test_comment_count_is_capped(self, creator_client, creator, published_post, user, monkeypatch):
+        """Test comment totals stop counting at the cap"""
+        from boosty_app import pagination
+
+        monkeypatch.setattr(pagination.capped_count, '__defaults__', (2,))
+        for i in range(3):
+            Comment.objects.create(post=published_post, author=user, content=f'Comment {i}')
+
+        response = creator_client.get('/creator/comments/')
+        assert response.context['comment_count'] == 2
+        assert response.context['comment_count_capped'] is True
@@ -0,0 +1,118 @@
+"""Tests for streaming creator exports"""
+
+import csv
+import gzip
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.test import Client
+
+from boosty_app.models import Comment, Subscription, SubscriptionTier, TierSubscription
+
+
+@pytest.fixture
+def creator_django_client(creator):
+    client = Client()
+    client.force_login(creator)
+    return client
+
+
+def _body(response):
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.django_db
+class TestCreatorExports:
+    """Test /creator/export/<dataset>/"""
+
+    def test_subscribers_csv(self, creator_django_client, creator, user):
+        Subscription.objects.create(subscriber=user, creator=creator.profile)
+
+        response = creator_django_client.get('/creator/export/subscribers/')
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'text/csv'
+        assert 'subscribers.csv' in response['Content-Disposition']
+        rows = list(csv.reader(io.StringIO(_body(response).decode())))
+        assert rows[0] == ['id', 'username', 'email', 'subscribed_at']
+        assert rows[1][1:3] == ['testuser', 'testuser@example.com']
+        assert len(rows) == 2
+
+    def test_tier_subscribers_ndjson(self, creator_django_client, creator, user):
+        tier = SubscriptionTier.objects.create(
+            creator=creator.profile, name='Gold', description='Gold tier', price=Decimal('9.99')
+        )
+        TierSubscription.objects.create(subscriber=user, tier=tier, payment_status='completed')
+
+        response = creator_django_client.get('/creator/export/tier-subscribers/?format=ndjson')
+
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = _body(response).decode().splitlines()
+        record = json.loads(lines[0])
+        assert record['username'] == 'testuser'
+        assert record['tier'] == 'Gold'
+        assert record['price'] == '9.99'
+        assert record['payment_status'] == 'completed'
+
+    def test_comments_json(self, creator_django_client, published_post, user):
+        for i in range(2):
+            Comment.objects.create(post=published_post, author=user, content=f'Comment {i}')
+
+        response = creator_django_client.get('/creator/export/comments/?format=json')
+
+        assert response['Content-Type'] == 'application/json'
+        assert 'comments.json' in response['Content-Disposition']
+        records = json.loads(_body(response))
+        assert [record['content'] for record in records] == ['Comment 0', 'Comment 1']
+
+    def test_empty_json(self, creator_django_client):
+        response = creator_django_client.get('/creator/export/subscribers/?format=json')
+
+        assert json.loads(_body(response)) == []
+
+    def test_comments_gzip(self, creator_django_client, published_post, user):
+        for i in range(3):
+            Comment.objects.create(post=published_post, author=user, content=f'Comment, "quoted" {i}')
+
+        response = creator_django_client.get('/creator/export/comments/?compress=gzip')
+
+        assert response['Content-Type'] == 'application/gzip'
+        assert 'comments.csv.gz' in response['Content-Disposition']
+        rows = list(csv.reader(io.StringIO(gzip.decompress(_body(response)).decode())))
+        assert len(rows) == 4
+        assert rows[1][4] == 'Comment, "quoted" 0'
+
+    def test_csv_formulas_are_escaped(self, creator_django_client, published_post, user):
+        for content in ('=HYPERLINK("http://evil")', '+1', '-1', '@SUM(A1)', 'a=b'):
+            Comment.objects.create(post=published_post, author=user, content=content)
+
+        response = creator_django_client.get('/creator/export/comments/')
+
+        rows = list(csv.reader(io.StringIO(_body(response).decode())))
+        assert [row[4] for row in rows[1:]] == ["'=HYPERLINK(\"http://evil\")", "'+1", "'-1", "'@SUM(A1)", 'a=b']
+
+    def test_json_formulas_are_unchanged(self, creator_django_client, published_post, user):
+        Comment.objects.create(post=published_post, author=user, content='=1+1')
+
+        response = creator_django_client.get('/creator/export/comments/?format=json')
+
+        assert json.loads(_body(response))[0]['content'] == '=1+1'
+
+    def test_only_own_data_is_exported(self, creator_django_client, multiple_creators, user):
+        Subscription.objects.create(subscriber=user, creator=multiple_creators[0].profile)
+        response = creator_django_client.get('/creator/export/subscribers/?format=ndjson')
+        assert _body(response) == b''
+
+    def test_unknown_dataset(self, creator_django_client):
+        assert creator_django_client.get('/creator/export/passwords/').status_code == 404
+
+    def test_unknown_format(self, creator_django_client):
+        assert creator_django_client.get('/creator/export/subscribers/?format=xml').status_code == 400
+
+    def test_requires_creator(self, user):
+        client = Client()
+        client.force_login(user)
+        assert client.get('/creator/export/subscribers/').status_code == 403
@@ -0,0 +1,215 @@
+"""
+Tests for the values-based fast-path list serializers
+"""
+
+import io
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.fast_serializers import (
+    FastPostSerializer,
+    FastSerializer,
+    FastSubscriptionTierSerializer,
+    FastUserProfileSerializer,
+)
+from boosty_app.models import Comment, Post, Subscription, SubscriptionTier, TierSubscription, UserProfile
+from boosty_app.reactions import add_reaction
+from boosty_app.renderers import ORJSONRenderer
+from boosty_app.serializers import (
+    PostSerializer,
+    PostSummarySerializer,
+    SubscriptionTierSerializer,
+    UserProfileSerializer,
+)
+from boosty_app.view_counter import post_views
+
+
+def _context(user):
+    request = Request(APIRequestFactory().get('/api/posts/'))
+    request.user = user
+    return {'request': request}
+
+
+def assert_parity(fast_class, queryset, user):
+    """The fast serializer renders exactly the bytes the model serializer renders"""
+    slow = fast_class.serializer_class(queryset, many=True, context=_context(user)).data
+    fast = fast_class(_context(user))
+    rendered = ORJSONRenderer().render(fast.serialize(fast.rows(queryset)))
+
+    assert rendered == ORJSONRenderer().render(slow)
+    return rendered
+
+
+@pytest.fixture
+def dataset(db, user, creator, category, paid_post, free_post, published_post, draft_post):
+    """Posts in every access state, with comments, replies, reactions, tiers and followers"""
+    other = User.objects.create_user(username='other_creator', password='testpass123', first_name='Other')
+    # Set without the avatar resize signal, which needs the file on disk
+    UserProfile.objects.filter(user=other).update(is_creator=True, avatar='avatars/other.png')
+    other.refresh_from_db()
+    basic = SubscriptionTier.objects.create(creator=other.profile, name='Basic', price='4.50', order=1)
+    gold = SubscriptionTier.objects.create(creator=other.profile, name='Gold', price='12.00', order=2, is_active=False)
+
+    unlocked = Post.objects.create(
+        title='Unlocked', content='Paid content ' * 20, author=other, category=category, status='published'
+    )
+    unlocked.tiers.set([basic, gold])
+    locked = Post.objects.create(title='Locked', content='Short paid', author=other, status='published')
+    locked.tiers.set([gold])
+    Post.objects.create(title='No tiers', content='Untiered', author=other, status='published')
+
+    TierSubscription.objects.create(
+        subscriber=user, tier=basic, is_active=True, end_date=timezone.now() + timedelta(days=30)
+    )
+    Subscription.objects.create(subscriber=user, creator=other.profile)
+
+    root = Comment.objects.create(post=published_post, author=user, content='First')
+    Comment.objects.create(post=published_post, author=other, parent=root, content='Reply')
+    Comment.objects.create(post=unlocked, author=creator, content='Hello')
+    add_reaction(user, published_post, 'like')
+    add_reaction(other, published_post, 'fire')
+    post_views.increment(published_post.id, 3)
+    return {'other': other}
+
+
+@pytest.mark.django_db
+class TestParity:
+    """Byte-for-byte parity with the model serializers"""
+
+    @pytest.mark.parametrize('viewer', ['anonymous', 'subscriber', 'creator'])
+    def test_posts(self, dataset, user, creator, viewer):
+        viewer = {'anonymous': AnonymousUser(), 'subscriber': user, 'creator': creator}[viewer]
+
+        assert_parity(FastPostSerializer, Post.objects.filter(status='published'), viewer)
+
+    def test_all_posts_including_drafts(self, dataset, creator):
+        assert_parity(FastPostSerializer, Post.objects.all(), creator)
+
+    def test_profiles(self, dataset, user):
+        rendered = assert_parity(FastUserProfileSerializer, UserProfile.objects.all(), user)
+
+        assert b'http://testserver/media/avatars/other.png' in rendered
+
+    def test_tiers(self, dataset, user):
+        assert_parity(FastSubscriptionTierSerializer, SubscriptionTier.objects.all(), user)
+
+    def test_without_request(self, dataset):
+        queryset = Post.objects.filter(status='published')
+        fast = FastPostSerializer()
+
+        assert ORJSONRenderer().render(fast.serialize(fast.rows(queryset))) == ORJSONRenderer().render(
+            PostSerializer(queryset, many=True).data
+        )
+
+    def test_empty(self, db, user):
+        assert_parity(FastPostSerializer, Post.objects.none(), user)
+
+
+class TestFieldPlan:
+    """Test plan compilation"""
+
+    def test_plan_follows_serializer_field_order(self):
+        names = [name for name, *_ in FastPostSerializer.plan()]
+
+        assert names == list(PostSerializer().fields)
+
+    def test_unplanned_field_is_rejected(self):
+        class ExtendedTierSerializer(SubscriptionTierSerializer):
+            reviews = serializers.SerializerMethodField()
+
+            class Meta(SubscriptionTierSerializer.Meta):
+                fields = SubscriptionTierSerializer.Meta.fields + ['reviews']
+
+        class Incomplete(FastSubscriptionTierSerializer):
+            serializer_class = ExtendedTierSerializer
+
+        with pytest.raises(ImproperlyConfigured, match='get_reviews'):
+            Incomplete.plan()
+
+    def test_raw_fields_skip_formatting(self):
+        kinds = {name: kind for name, _, kind, _ in FastUserProfileSerializer.plan()}
+
+        assert kinds['username'] == 'raw'
+        assert kinds['avatar'] == 'file'
+        assert kinds['created_at'] == 'datetime'
+        assert kinds['subscriber_count'] == 'method'
+        assert issubclass(FastUserProfileSerializer, FastSerializer)
+
+
+@pytest.mark.django_db
+class TestEndpoints:
+    """The hot list endpoints serve the fast output"""
+
+    def test_post_list(self, authenticated_client, dataset, user):
+        response = authenticated_client.get('/api/posts/')
+
+        assert response.status_code == status.HTTP_200_OK
+        queryset = Post.objects.filter(status='published').distinct()[:10]
+        expected = PostSummarySerializer(queryset, many=True, context=_context(user)).data
+        assert ORJSONRenderer().render(response.data['results']) == ORJSONRenderer().render(expected)
+        assert response.data['count'] == Post.objects.filter(status='published').count()
+
+    def test_post_list_query_count_is_flat(self, api_client, dataset, creator, category):
+        def count_queries():
+            # Start without cached list counts, so both requests count the same way
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                assert api_client.get('/api/posts/').status_code == status.HTTP_200_OK
+            return len(queries.captured_queries)
+
+        before = count_queries()
+        for i in range(4):
+            post = Post.objects.create(
+                title=f'More {i}', content='More', author=creator, category=category, status='published'
+            )
+            Comment.objects.create(post=post, author=creator, content='Self comment')
+
+        assert count_queries() == before
+
+    def test_creators(self, api_client, dataset):
+        response = api_client.get('/api/profiles/creators/')
+
+        assert response.status_code == status.HTTP_200_OK
+        expected = UserProfileSerializer(
+            UserProfile.objects.filter(is_creator=True), many=True, context=_context(AnonymousUser())
+        ).data
+        assert ORJSONRenderer().render(response.data) == ORJSONRenderer().render(expected)
+
+    def test_creators_by_category(self, api_client, dataset, creator, category):
+        response = api_client.get(f'/api/profiles/creators/?category={category.id}')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {profile['username'] for profile in response.data} == {creator.username, 'other_creator'}
+
+    def test_tier_list(self, api_client, dataset):
+        response = api_client.get('/api/tiers/')
+
+        assert response.status_code == status.HTTP_200_OK
+        expected = SubscriptionTierSerializer(
+            SubscriptionTier.objects.filter(is_active=True).order_by('order', 'price'),
+            many=True,
+            context=_context(AnonymousUser()),
+        ).data
+        assert ORJSONRenderer().render(response.data['results']) == ORJSONRenderer().render(expected)
+
+
+@pytest.mark.django_db
+def test_benchmark_command(dataset):
+    out = io.StringIO()
+
+    call_command('benchmark_serializers', iterations=1, stdout=out)
+
+    assert 'posts: 6 rows' in out.getvalue()
+    assert 'post summaries: 6 rows' in out.getvalue()
+    assert 'tiers:' in out.getvalue()
@@ -0,0 +1,195 @@
+"""
+Tests for sparse fieldsets (?fields=) and expansion control (?expand=)
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.fast_serializers import FastPostSerializer
+from boosty_app.fieldsets import FieldSet, parse_fieldset
+from boosty_app.models import Comment, Notification, Post, SubscriptionTier
+from boosty_app.renderers import ORJSONRenderer
+from boosty_app.serializers import PostSerializer
+
+
+def _sql(queries):
+    return ' '.join(q['sql'] for q in queries.captured_queries)
+
+
+class TestFieldSet:
+    """Test parsing and selection"""
+
+    def test_parse(self):
+        assert parse_fieldset({}) is None
+        assert parse_fieldset({'fields': ''}) is None
+        assert parse_fieldset({'fields': 'id, title,'}) == FieldSet(fields=frozenset({'id', 'title'}))
+        assert parse_fieldset({'expand': ''}) == FieldSet(expand=frozenset())
+
+    def test_select_prunes_in_field_order(self):
+        selection = FieldSet(fields=frozenset({'title', 'id'})).select(['id', 'author', 'title'], {})
+
+        assert list(selection) == ['id', 'title']
+
+    def test_unexpanded_relations_collapse_or_drop(self):
+        expandable = {'author': 'author_id', 'comments': None}
+        selection = FieldSet(expand=frozenset()).select(['id', 'author', 'comments'], expandable)
+
+        assert selection == {'id': None, 'author': 'author_id'}
+
+    def test_expanded_relation(self):
+        expandable = {'author': 'author_id', 'comments': None}
+        selection = FieldSet(expand=frozenset({'comments'})).select(['id', 'author', 'comments'], expandable)
+
+        assert selection == {'id': None, 'author': 'author_id', 'comments': None}
+
+    def test_unknown_names(self):
+        with pytest.raises(ValidationError):
+            FieldSet(fields=frozenset({'nope'})).select(['id'], {})
+        with pytest.raises(ValidationError):
+            FieldSet(expand=frozenset({'id'})).select(['id'], {})
+
+
+@pytest.mark.django_db
+class TestPostFieldsets:
+    """Test ?fields= and ?expand= on the post endpoints"""
+
+    def test_fields(self, api_client, published_post, comment):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/posts/?fields=id,title')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'] == [{'id': published_post.id, 'title': published_post.title}]
+        sql = _sql(queries)
+        for table in ('boosty_app_comment', 'boosty_app_userprofile', 'boosty_app_post_tiers', 'reaction'):
+            assert table not in sql
+        assert 'content' not in sql
+
+    def test_collapsed_relations(self, api_client, published_post, comment, creator, category):
+        response = api_client.get('/api/posts/?expand=author')
+
+        post = response.data['results'][0]
+        assert post['author']['username'] == creator.username
+        assert post['category'] == category.id
+        assert 'comments_preview' not in post
+
+    def test_nothing_expanded(self, api_client, published_post, creator):
+        response = api_client.get('/api/posts/?expand=&fields=id,author')
+
+        assert response.data['results'] == [{'id': published_post.id, 'author': creator.id}]
+
+    def test_nested_serializers_are_whole(self, api_client, published_post, comment):
+        response = api_client.get('/api/posts/?fields=id,comments_preview')
+
+        nested = response.data['results'][0]['comments_preview'][0]
+        assert nested['content'] == comment.content
+        assert nested['author']['id'] == comment.author.profile.id
+
+    def test_unknown_field(self, api_client, published_post):
+        response = api_client.get('/api/posts/?fields=id,secret')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'secret' in str(response.data['fields'])
+
+    def test_retrieve(self, api_client, published_post, comment):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(f'/api/posts/{published_post.id}/?fields=id,title,is_locked')
+
+        assert response.data == {'id': published_post.id, 'title': published_post.title, 'is_locked': False}
+        assert 'boosty_app_comment' not in _sql(queries)
+
+    def test_retrieve_without_id(self, api_client, published_post, post_view_buffer):
+        response = api_client.get(f'/api/posts/{published_post.id}/?fields=content&expand=')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'content': published_post.content}
+        assert post_view_buffer.pending(published_post.id) == 1
+
+    @pytest.mark.parametrize(
+        'params',
+        [
+            {'fields': 'id,content,is_locked,tiers'},
+            {'fields': 'id,comments_count,reaction_counts,view_count'},
+            {'expand': 'category'},
+            {'expand': ''},
+        ],
+    )
+    def test_fast_path_parity(self, user, paid_post, published_post, comment, params):
+        request = Request(APIRequestFactory().get('/api/posts/', params))
+        request.user = user
+        context = {'request': request, 'fieldset': parse_fieldset(request.query_params)}
+        queryset = Post.objects.filter(status='published')
+        fast = FastPostSerializer(context)
+
+        assert ORJSONRenderer().render(fast.serialize(fast.rows(queryset))) == ORJSONRenderer().render(
+            PostSerializer(queryset, many=True, context=context).data
+        )
+
+    def test_writes_ignore_fieldset(self, creator_client, category):
+        response = creator_client.post(
+            '/api/posts/?fields=id', {'title': 'New', 'content': 'Body', 'category': category.id}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['title'] == 'New'
+
+
+@pytest.mark.django_db
+class TestOtherFieldsets:
+    """Test pruning on the other viewsets"""
+
+    def test_comments(self, api_client, comment):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/comments/?fields=id,content')
+
+        assert response.data['results'] == [{'id': comment.id, 'content': comment.content}]
+        assert 'boosty_app_userprofile' not in _sql(queries)
+
+    def test_tiers(self, api_client, creator):
+        tier = SubscriptionTier.objects.create(creator=creator.profile, name='Basic', price='5.00')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/tiers/?fields=id,name,price')
+
+        assert response.data['results'] == [{'id': tier.id, 'name': 'Basic', 'price': '5.00'}]
+        assert 'boosty_app_tiersubscription' not in _sql(queries)
+
+    def test_tier_creator_collapsed(self, api_client, creator):
+        SubscriptionTier.objects.create(creator=creator.profile, name='Basic', price='5.00')
+
+        response = api_client.get('/api/tiers/?fields=creator&expand=')
+
+        assert response.data['results'] == [{'creator': creator.profile.id}]
+
+    def test_creators(self, api_client, creator):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/profiles/creators/?fields=id,username')
+
+        assert response.data == [{'id': creator.profile.id, 'username': creator.username}]
+        assert 'boosty_app_subscription' not in _sql(queries)
+
+    def test_notifications(self, authenticated_client, user, published_post):
+        Notification.objects.create(recipient=user, post=published_post, kind='new_post')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get('/api/notifications/?fields=id,kind')
+
+        assert response.data['results'][0]['kind'] == 'new_post'
+        assert set(response.data['results'][0]) == {'id', 'kind'}
+        assert 'JOIN' not in queries.captured_queries[-1]['sql']
+
+    def test_profile_detail(self, api_client, creator):
+        response = api_client.get(f'/api/profiles/{creator.profile.id}/?fields=username,bio')
+
+        assert response.data == {'username': creator.username, 'bio': creator.profile.bio}
+
+    def test_comment_thread_action(self, api_client, published_post, comment):
+        Comment.objects.create(post=published_post, author=comment.author, parent=comment, content='Reply')
+
+        response = api_client.get(f'/api/posts/{published_post.id}/comments/?fields=id,reply_count&expand=')
+
+        assert response.data['results'] == [{'id': comment.id, 'reply_count': 1}]
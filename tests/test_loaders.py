@@ -0,0 +1,125 @@
+"""
+Tests for the request-scoped profile loader used by nested serializers
+"""
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from boosty_app.loaders import ProfileLoader, profile_loader
+from boosty_app.models import Comment, Post, Subscription, SubscriptionTier
+from boosty_app.serializers import AnnotatedProfileSerializer, PostSerializer, UserProfileSerializer
+
+
+def _profile_queries(queries):
+    return [q for q in queries.captured_queries if 'FROM "boosty_app_userprofile"' in q['sql']]
+
+
+@pytest.fixture
+def authors(db, category):
+    """Four creators with two published posts each"""
+    users = []
+    for i in range(4):
+        author = User.objects.create_user(username=f'author{i}', password='testpass123')
+        author.profile.is_creator = True
+        author.profile.save()
+        for n in range(2):
+            Post.objects.create(
+                title=f'Post {n} by {i}', content='Content', author=author, category=category, status='published'
+            )
+        users.append(author)
+    return users
+
+
+@pytest.mark.django_db
+class TestProfileLoader:
+    """Test batching and memoization"""
+
+    def test_primed_keys_load_in_one_query(self, authors):
+        loader = ProfileLoader(AnnotatedProfileSerializer)
+        loader.prime_users([author.id for author in authors])
+
+        with CaptureQueriesContext(connection) as queries:
+            fragments = [loader.for_user(author.id) for author in authors]
+            loader.for_user(authors[0].id)
+
+        assert len(queries.captured_queries) == 1
+        assert [fragment['username'] for fragment in fragments] == [author.username for author in authors]
+
+    def test_fragment_matches_profile_serializer(self, user, creator, subscription):
+        loader = ProfileLoader(AnnotatedProfileSerializer)
+
+        assert loader.for_user(creator.id) == UserProfileSerializer(creator.profile).data
+        assert loader.for_profile(creator.profile.id)['subscriber_count'] == 1
+        assert loader.for_user(user.id)['following_count'] == 1
+
+    def test_missing_user(self, db):
+        assert ProfileLoader(AnnotatedProfileSerializer).for_user(999999) is None
+
+    def test_shared_across_serializers_in_a_request(self, rf, published_post):
+        request = rf.get('/')
+        first = profile_loader({'request': request}, AnnotatedProfileSerializer)
+
+        assert profile_loader({'request': request}, AnnotatedProfileSerializer) is first
+        assert profile_loader({'request': rf.get('/')}, AnnotatedProfileSerializer) is not first
+
+    def test_serializer_without_request_batches_its_own_items(self, authors):
+        posts = Post.objects.filter(status='published')
+
+        with CaptureQueriesContext(connection) as queries:
+            data = PostSerializer(posts, many=True).data
+
+        assert len(_profile_queries(queries)) == 1
+        assert {item['author']['username'] for item in data} == {author.username for author in authors}
+
+
+@pytest.mark.django_db
+class TestNestedProfiles:
+    """Each endpoint loads the profiles it embeds once per request"""
+
+    def test_post_list(self, api_client, authors):
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/posts/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(_profile_queries(queries)) == 1
+        for post in response.data['results']:
+            assert post['author']['username'].startswith('author')
+
+    def test_comment_list(self, authenticated_client, published_post, authors):
+        for author in authors:
+            for _ in range(2):
+                Comment.objects.create(post=published_post, author=author, content='Nice')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(f'/api/comments/?post={published_post.id}')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(_profile_queries(queries)) == 1
+
+    def test_tier_list(self, api_client, authors):
+        for author in authors:
+            SubscriptionTier.objects.create(creator=author.profile, name='Basic', price='5.00')
+            SubscriptionTier.objects.create(creator=author.profile, name='Gold', price='15.00')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get('/api/tiers/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(_profile_queries(queries)) == 1
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        assert {tier['creator']['username'] for tier in results} == {author.username for author in authors}
+
+    def test_subscription_list(self, authenticated_client, user, authors):
+        for author in authors:
+            Subscription.objects.create(subscriber=user, creator=author.profile)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get('/api/subscriptions/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(_profile_queries(queries)) == 1
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        assert all(item['creator']['subscriber_count'] == 1 for item in results)
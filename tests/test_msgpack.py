@@ -0,0 +1,140 @@
+"""
+Tests for the MessagePack renderer and parser
+"""
+
+import datetime
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.fast_serializers import FastPostSummarySerializer
+from boosty_app.models import Comment, Post, SubscriptionTier, TierSubscription
+from boosty_app.renderers import MessagePackParser, MessagePackRenderer
+from boosty_app.serializers import PostSummarySerializer
+
+msgpack = pytest.importorskip('msgpack')
+
+MSGPACK = 'application/msgpack'
+
+
+def _unpack(response):
+    return msgpack.unpackb(response.content, timestamp=3)
+
+
+class TestMessagePackRenderer:
+    """Test encoding"""
+
+    def test_native_types(self):
+        created = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+        rendered = MessagePackRenderer().render(
+            {'price': Decimal('9.99'), 'created_at': created, 'day': created.date()}
+        )
+
+        assert msgpack.unpackb(rendered, timestamp=3) == {'price': '9.99', 'created_at': created, 'day': '2024-05-01'}
+
+    def test_datetimes_are_timestamps(self):
+        created = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+
+        assert len(MessagePackRenderer().render(created)) < len(created.isoformat())
+        assert MessagePackRenderer().render(created.replace(tzinfo=None)) == msgpack.packb('2024-05-01T12:30:00')
+
+    def test_none(self):
+        assert MessagePackRenderer().render(None) == b''
+
+
+class TestMessagePackParser:
+    """Test decoding"""
+
+    def test_round_trip(self):
+        created = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+        body = MessagePackRenderer().render({'title': 'Привет', 'created_at': created})
+
+        assert MessagePackParser().parse(io.BytesIO(body)) == {'title': 'Привет', 'created_at': created}
+
+    @pytest.mark.parametrize('body', [b'', b'\xc1', b'\x92\x01'])
+    def test_invalid(self, body):
+        with pytest.raises(ParseError, match='MessagePack parse error'):
+            MessagePackParser().parse(io.BytesIO(body))
+
+
+@pytest.mark.django_db
+class TestNegotiation:
+    """Test serving and accepting application/msgpack"""
+
+    def test_post_list(self, api_client, published_post, comment):
+        response = api_client.get('/api/posts/', HTTP_ACCEPT=MSGPACK)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == MSGPACK
+        post = _unpack(response)['results'][0]
+        assert post['created_at'] == published_post.created_at
+        assert post['comments_preview'][0]['created_at'] == comment.created_at
+        assert post['author']['created_at'] == published_post.author.profile.created_at
+        assert post.keys() == api_client.get('/api/posts/').json()['results'][0].keys()
+
+    def test_json_is_the_default(self, api_client, published_post):
+        response = api_client.get('/api/posts/')
+
+        assert response['Content-Type'] == 'application/json'
+        assert isinstance(response.json()['results'][0]['created_at'], str)
+
+    def test_format_override(self, api_client, published_post):
+        response = api_client.get('/api/posts/?format=msgpack')
+
+        assert response['Content-Type'] == MSGPACK
+
+    def test_tier_subscriptions(self, authenticated_client, user, creator):
+        tier = SubscriptionTier.objects.create(creator=creator.profile, name='Gold', price='9.99')
+        subscription = TierSubscription.objects.create(
+            subscriber=user, tier=tier, is_active=True, end_date=timezone.now() + timedelta(days=30)
+        )
+
+        response = authenticated_client.get('/api/tier-subscriptions/', HTTP_ACCEPT=MSGPACK)
+
+        data = _unpack(response)
+        item = (data['results'] if isinstance(data, dict) else data)[0]
+        assert item['end_date'] == subscription.end_date
+        assert item['tier']['price'] == '9.99'
+
+    def test_msgpack_request_body(self, creator_client, published_post):
+        body = msgpack.packb({'post': published_post.id, 'content': 'Packed'})
+
+        response = creator_client.post('/api/comments/', data=body, content_type=MSGPACK)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Comment.objects.get(id=response.json()['id']).content == 'Packed'
+
+    def test_malformed_body(self, creator_client):
+        response = creator_client.post('/api/comments/', data=b'\xc1', content_type=MSGPACK)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_fast_path_parity(self, user, paid_post, published_post, comment):
+        request = Request(APIRequestFactory().get('/api/posts/'))
+        request.user = user
+        request.accepted_renderer = MessagePackRenderer()
+        context = {'request': request}
+        queryset = Post.objects.filter(status='published')
+        fast = FastPostSummarySerializer(context)
+
+        assert MessagePackRenderer().render(fast.serialize(fast.rows(queryset))) == MessagePackRenderer().render(
+            PostSummarySerializer(queryset, many=True, context=context).data
+        )
+
+
+@pytest.mark.django_db
+def test_benchmark_command(published_post):
+    out = io.StringIO()
+
+    call_command('benchmark_msgpack', iterations=1, stdout=out)
+
+    assert 'posts: 1 items' in out.getvalue()
+    assert 'msgpack size:' in out.getvalue()
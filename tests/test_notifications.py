@@ -0,0 +1,178 @@
+"""Tests for post notification fan-out and the inbox API"""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+
+from boosty_app.models import Notification, NotificationFanout, Post, Subscription, SubscriptionTier, TierSubscription
+from boosty_app.notifications import FanoutWorker, unread_count
+
+
+@pytest.fixture
+def audience_users(creator):
+    """Five followers, two of whom also pay for a tier, plus one tier-only subscriber"""
+    tier = SubscriptionTier.objects.create(
+        creator=creator.profile, name='Basic', description='Basic tier', price=Decimal('5.00')
+    )
+    users = [User.objects.create_user(username=f'fan{i}', password='testpass123') for i in range(6)]
+    for fan in users[:5]:
+        Subscription.objects.create(subscriber=fan, creator=creator.profile)
+    for fan in users[3:]:
+        TierSubscription.objects.create(subscriber=fan, tier=tier, end_date=timezone.now() + timedelta(days=10))
+    return users
+
+
+@pytest.mark.django_db
+class TestFanoutQueue:
+    """Test when fan-out jobs are created"""
+
+    def test_publish_action_queues_fanout(self, creator_client, draft_post):
+        assert not NotificationFanout.objects.filter(post=draft_post).exists()
+
+        creator_client.post(f'/api/posts/{draft_post.id}/publish/')
+        assert NotificationFanout.objects.filter(post=draft_post, status='pending').exists()
+
+    def test_post_is_fanned_out_once(self, creator_client, draft_post):
+        creator_client.post(f'/api/posts/{draft_post.id}/publish/')
+        creator_client.post(f'/api/posts/{draft_post.id}/archive/')
+        Post.objects.filter(pk=draft_post.pk).update(status='draft')
+        creator_client.post(f'/api/posts/{draft_post.id}/publish/')
+
+        assert NotificationFanout.objects.filter(post=draft_post).count() == 1
+
+
+@pytest.mark.django_db
+class TestFanoutWorker:
+    """Test batched delivery"""
+
+    def test_delivers_to_followers_and_tier_subscribers_once(self, audience_users, published_post):
+        stats = FanoutWorker(batch_size=2).run()
+
+        assert stats.posts == 1
+        assert stats.delivered == 6
+        recipients = Notification.objects.filter(post=published_post).values_list('recipient_id', flat=True)
+        assert sorted(recipients) == sorted(u.id for u in audience_users)
+        assert all(unread_count(u) == 1 for u in audience_users)
+        job = NotificationFanout.objects.get(post=published_post)
+        assert job.status == 'done'
+        assert job.delivered == 6
+
+    def test_paid_post_skips_subscribers_of_other_tiers(self, audience_users, paid_post):
+        FanoutWorker().run()
+
+        recipients = set(Notification.objects.filter(post=paid_post).values_list('recipient_id', flat=True))
+        # Followers are told about the post; tier-only subscribers only if their tier unlocks it
+        assert recipients == {u.id for u in audience_users[:5]}
+
+    def test_author_is_not_notified(self, creator, audience_users, published_post):
+        Subscription.objects.create(subscriber=creator, creator=creator.profile)
+        FanoutWorker().run()
+
+        assert not Notification.objects.filter(recipient=creator).exists()
+
+    def test_resumes_after_failure(self, audience_users, published_post):
+        worker = FanoutWorker(batch_size=2)
+        notify = worker._notify
+        calls = []
+
+        def flaky(post, recipient_ids):
+            calls.append(recipient_ids)
+            if len(calls) == 2:
+                raise RuntimeError('worker died')
+            return notify(post, recipient_ids)
+
+        with mock.patch.object(worker, '_notify', side_effect=flaky):
+            with pytest.raises(RuntimeError):
+                worker.run()
+
+        job = NotificationFanout.objects.get(post=published_post)
+        assert job.status == 'pending'
+        assert job.delivered == 2
+
+        FanoutWorker(batch_size=2).run()
+        assert Notification.objects.filter(post=published_post).count() == 6
+        assert all(unread_count(u) == 1 for u in audience_users)
+
+    def test_completed_jobs_are_not_rerun(self, audience_users, published_post):
+        FanoutWorker().run()
+        stats = FanoutWorker().run()
+
+        assert stats.posts == 0
+        assert Notification.objects.count() == 6
+
+    def test_unpublished_post_is_skipped(self, audience_users, published_post):
+        Post.objects.filter(pk=published_post.pk).update(status='archived')
+        FanoutWorker().run()
+
+        assert not Notification.objects.exists()
+        assert NotificationFanout.objects.get(post=published_post).status == 'done'
+
+    def test_management_command(self, audience_users, published_post):
+        call_command('fanout_notifications', '--batch-size', '4')
+        assert Notification.objects.count() == 6
+
+
+@pytest.mark.django_db
+class TestInboxAPI:
+    """Test the notification inbox endpoints"""
+
+    @pytest.fixture
+    def inbox(self, user, creator, category, subscription):
+        posts = [
+            Post.objects.create(
+                title=f'Post {i}', content='Content', author=creator, category=category, status='published'
+            )
+            for i in range(3)
+        ]
+        FanoutWorker().run()
+        return posts
+
+    def test_list_newest_first(self, authenticated_client, inbox):
+        response = authenticated_client.get('/api/notifications/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [n['post'] for n in response.data['results']] == [p.id for p in reversed(inbox)]
+        assert response.data['results'][0]['post_title'] == 'Post 2'
+
+    def test_cursor_pagination(self, authenticated_client, inbox):
+        with mock.patch('boosty_app.pagination.NotificationPagination.page_size', 2):
+            first = authenticated_client.get('/api/notifications/')
+            second = authenticated_client.get(first.data['next'])
+
+        ids = [n['post'] for n in first.data['results'] + second.data['results']]
+        assert ids == [p.id for p in reversed(inbox)]
+        assert second.data['next'] is None
+
+    def test_only_own_notifications(self, creator_client, inbox):
+        response = creator_client.get('/api/notifications/')
+        assert response.data['results'] == []
+
+    def test_unread_count_and_mark_read(self, authenticated_client, user, inbox):
+        assert authenticated_client.get('/api/notifications/unread/').data == {'unread': 3}
+
+        first_id = Notification.objects.filter(recipient=user).values_list('id', flat=True).first()
+        response = authenticated_client.post('/api/notifications/read/', {'ids': [first_id]}, format='json')
+        assert response.data == {'marked': 1, 'unread': 2}
+
+        # Marking an already-read notification does not move the counter
+        response = authenticated_client.post('/api/notifications/read/', {'ids': [first_id]}, format='json')
+        assert response.data == {'marked': 0, 'unread': 2}
+
+        response = authenticated_client.post('/api/notifications/read/', {}, format='json')
+        assert response.data == {'marked': 2, 'unread': 0}
+
+    def test_mark_read_rejects_non_integer_ids(self, authenticated_client, inbox):
+        for ids in ('1', ['x'], [{}], [True], [1.5]):
+            response = authenticated_client.post('/api/notifications/read/', {'ids': ids}, format='json')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        assert authenticated_client.get('/api/notifications/unread/').data == {'unread': 3}
+
+    def test_requires_authentication(self, api_client):
+        assert api_client.get('/api/notifications/').status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,155 @@
+"""
+Tests for post summaries on the list endpoints
+"""
+
+import json
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boosty_app.fast_serializers import FastPostSummarySerializer
+from boosty_app.models import Comment, Post, Subscription, SubscriptionTier
+from boosty_app.models.post import EXCERPT_LENGTH, make_excerpt
+from boosty_app.renderers import ORJSONRenderer
+from boosty_app.serializers import COMMENTS_PREVIEW_SIZE, PostSummarySerializer, summary_queryset
+
+LONG_CONTENT = 'Long body text. ' * 40
+
+
+def _context(user):
+    request = Request(APIRequestFactory().get('/api/posts/'))
+    request.user = user
+    return {'request': request}
+
+
+@pytest.fixture
+def long_paid_post(db, creator):
+    tier = SubscriptionTier.objects.create(creator=creator.profile, name='Gold', price='20.00')
+    post = Post.objects.create(title='Long paid', content=LONG_CONTENT, author=creator, status='published')
+    post.tiers.set([tier])
+    return post
+
+
+@pytest.mark.django_db
+class TestExcerpt:
+    """Test the stored excerpt"""
+
+    def test_long_content_is_cut(self, long_paid_post):
+        assert long_paid_post.excerpt == LONG_CONTENT[:EXCERPT_LENGTH]
+
+    def test_short_content_has_no_excerpt(self, published_post):
+        assert published_post.excerpt == ''
+
+    def test_updated_with_content(self, published_post):
+        published_post.content = LONG_CONTENT
+        published_post.save(update_fields=['content'])
+
+        published_post.refresh_from_db()
+        assert published_post.excerpt == make_excerpt(LONG_CONTENT)
+
+    def test_locked_teaser_is_built_from_excerpt(self, api_client, long_paid_post, paid_post):
+        response = api_client.get('/api/posts/')
+
+        excerpts = {post['id']: post['excerpt'] for post in response.data['results']}
+        assert excerpts[long_paid_post.id] == LONG_CONTENT[:EXCERPT_LENGTH] + '... [Subscribe to read more]'
+        assert excerpts[paid_post.id] == '[This content is locked. Subscribe to view.]'
+
+    def test_reader_sees_excerpt_or_short_body(self, api_client, published_post, creator):
+        Post.objects.create(title='Long free', content=LONG_CONTENT, author=creator, status='published', is_free=True)
+
+        response = api_client.get('/api/posts/')
+
+        excerpts = {post['title']: post['excerpt'] for post in response.data['results']}
+        assert excerpts['Long free'] == LONG_CONTENT[:EXCERPT_LENGTH]
+        assert excerpts[published_post.title] == published_post.content
+
+
+@pytest.mark.django_db
+class TestSummaryList:
+    """Test the summary representation on /api/posts/, feed and my_posts"""
+
+    def test_list_has_no_body_or_thread(self, api_client, published_post, comment):
+        response = api_client.get('/api/posts/')
+
+        post = response.data['results'][0]
+        assert 'content' not in post
+        assert 'comments' not in post
+        assert post['comments_count'] == 1
+        assert post['comments_preview'][0]['content'] == comment.content
+
+    def test_content_column_is_never_selected(self, api_client, long_paid_post, published_post):
+        assert 'content' not in FastPostSummarySerializer(_context(AnonymousUser())).columns()
+
+        response = api_client.get('/api/posts/')
+
+        # Long bodies are only ever read through the excerpt; short ones via the COALESCE fallback
+        assert LONG_CONTENT not in ORJSONRenderer().render(response.data).decode()
+
+    def test_preview_is_first_top_level_comments(self, api_client, published_post, user):
+        comments = [
+            Comment.objects.create(post=published_post, author=user, content=f'Comment {i}')
+            for i in range(COMMENTS_PREVIEW_SIZE + 2)
+        ]
+        Comment.objects.create(post=published_post, author=user, parent=comments[0], content='Reply')
+
+        response = api_client.get('/api/posts/')
+
+        preview = response.data['results'][0]['comments_preview']
+        assert [c['id'] for c in preview] == [c.id for c in comments[:COMMENTS_PREVIEW_SIZE]]
+        assert response.data['results'][0]['comments_count'] == len(comments) + 1
+
+    def test_retrieve_keeps_full_representation(self, api_client, published_post, comment):
+        response = api_client.get(f'/api/posts/{published_post.id}/')
+
+        assert response.data['content'] == published_post.content
+        assert response.data['comments_preview'][0]['id'] == comment.id
+        assert 'comments' not in response.data
+
+    def test_retrieve_caps_comments(self, api_client, published_post, user):
+        comments = [
+            Comment.objects.create(post=published_post, author=user, content=f'Comment {i}')
+            for i in range(COMMENTS_PREVIEW_SIZE + 2)
+        ]
+        Comment.objects.create(post=published_post, author=user, parent=comments[0], content='Reply')
+
+        response = api_client.get(f'/api/posts/{published_post.id}/')
+
+        assert [c['id'] for c in response.data['comments_preview']] == [c.id for c in comments[:COMMENTS_PREVIEW_SIZE]]
+        assert response.data['comments_count'] == len(comments) + 1
+
+    def test_locked_posts_hide_comments(self, authenticated_client, user, paid_post):
+        Comment.objects.create(post=paid_post, author=paid_post.author, content='Subscribers only')
+
+        detail = authenticated_client.get(f'/api/posts/{paid_post.id}/')
+        listed = authenticated_client.get('/api/posts/')
+
+        assert detail.data['is_locked']
+        assert detail.data['comments_preview'] == []
+        assert [post['comments_preview'] for post in listed.data['results']] == [[]]
+
+    def test_feed_and_my_posts(self, authenticated_client, user, creator, long_paid_post):
+        Subscription.objects.create(subscriber=user, creator=creator.profile)
+        mine = Post.objects.create(title='Mine', content=LONG_CONTENT, author=user, status='draft')
+
+        feed = authenticated_client.get('/api/posts/feed/')
+        my_posts = authenticated_client.get('/api/posts/my_posts/')
+
+        assert feed.status_code == status.HTTP_200_OK
+        assert feed.data[0]['excerpt'].endswith('[Subscribe to read more]')
+        assert 'content' not in feed.data[0]
+        my_posts = json.loads(b''.join(my_posts.streaming_content))
+        assert my_posts[0]['id'] == mine.id
+        assert my_posts[0]['excerpt'] == LONG_CONTENT[:EXCERPT_LENGTH]
+
+    @pytest.mark.parametrize('viewer', ['anonymous', 'subscriber', 'author'])
+    def test_fast_parity(self, viewer, user, creator, long_paid_post, paid_post, published_post, comment):
+        viewer = {'anonymous': AnonymousUser(), 'subscriber': user, 'author': creator}[viewer]
+        queryset = Post.objects.filter(status='published')
+        fast = FastPostSummarySerializer(_context(viewer))
+
+        assert ORJSONRenderer().render(fast.serialize(fast.rows(queryset))) == ORJSONRenderer().render(
+            PostSummarySerializer(summary_queryset(queryset), many=True, context=_context(viewer)).data
+        )
@@ -1,6 +1,8 @@
 """
 API tests for post endpoints
 """
+import json
+
 import pytest
 from rest_framework import status
 
@@ -250,7 +252,7 @@ class TestMyPosts:
         response = creator_client.get('/api/posts/my_posts/')
 
         assert response.status_code == status.HTTP_200_OK
-        post_ids = [post['id'] for post in response.data]
+        post_ids = [post['id'] for post in json.loads(b''.join(response.streaming_content))]
         assert draft_post.id in post_ids
         assert published_post.id in post_ids
 
@@ -296,8 +298,8 @@ class TestPostComments:
         response = api_client.get(f'/api/posts/{published_post.id}/comments/')
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]['content'] == comment.content
+        assert len(response.data['results']) == 1
+        assert response.data['results'][0]['content'] == comment.content
 
 
 @pytest.mark.django_db
@@ -1,9 +1,21 @@
 """
 API tests for user profile endpoints
 """
+
+import json
+from datetime import timedelta
+
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
 
+from boosty_app.authentication import local_tokens
+from boosty_app.creator_page import POSTS_PER_PAGE
+from boosty_app.models import Comment, Post, TierSubscription
+
 
 @pytest.mark.django_db
 class TestProfileList:
@@ -163,18 +175,130 @@ class TestFollowingList:
         response = authenticated_client.get('/api/profiles/following/')
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]['username'] == 'creator'
+        following = json.loads(b''.join(response.streaming_content))
+        assert len(following) == 1
+        assert following[0]['username'] == 'creator'
 
     def test_get_following_no_subscriptions(self, authenticated_client, user):
         """Test getting following when user has no subscriptions"""
         response = authenticated_client.get('/api/profiles/following/')
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 0
+        assert json.loads(b''.join(response.streaming_content)) == []
 
     def test_get_following_unauthenticated(self, api_client):
         """Test getting following without authentication"""
         response = api_client.get('/api/profiles/following/')
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestCreatorPage:
+    """Test the composite creator page endpoint"""
+
+    @pytest.fixture
+    def page_tier(self, creator, category, user, paid_post, free_post):
+        """Premium tier unlocking five paid posts, next to one free post with a comment"""
+        tier = paid_post.tiers.get()
+        for i in range(4):
+            post = Post.objects.create(
+                title=f'Extra {i}',
+                content='x' * 200,
+                author=creator,
+                category=category,
+                status='published',
+                is_free=False,
+            )
+            post.tiers.add(tier)
+        Comment.objects.create(post=free_post, author=user, content='Nice post')
+        return tier
+
+    def _url(self, creator):
+        return f'/api/profiles/{creator.profile.id}/page/'
+
+    def test_anonymous_page(self, api_client, creator, page_tier, paid_post, free_post):
+        response = api_client.get(self._url(creator))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['profile']['username'] == creator.username
+        assert [t['name'] for t in response.data['tiers']] == ['Premium']
+        assert response.data['tiers'][0]['post_count'] == 5
+        posts = {p['id']: p for p in response.data['posts']['results']}
+        assert posts[free_post.id]['is_locked'] is False
+        assert posts[free_post.id]['comments_count'] == 1
+        assert posts[paid_post.id]['is_locked'] is True
+        assert posts[paid_post.id]['content'] != paid_post.content
+        assert response.data['viewer'] == {
+            'is_authenticated': False,
+            'is_owner': False,
+            'is_following': False,
+            'subscriptions': [],
+        }
+
+    def test_subscriber_sees_unlocked_posts(
+        self, authenticated_client, user, creator, subscription, page_tier, paid_post
+    ):
+        TierSubscription.objects.create(subscriber=user, tier=page_tier, end_date=timezone.now() + timedelta(days=5))
+
+        response = authenticated_client.get(self._url(creator))
+
+        posts = {p['id']: p for p in response.data['posts']['results']}
+        assert posts[paid_post.id]['is_locked'] is False
+        assert posts[paid_post.id]['content'] == paid_post.content
+        assert response.data['tiers'][0]['subscriber_count'] == 1
+        assert response.data['profile']['subscriber_count'] == 1
+        viewer = response.data['viewer']
+        assert viewer['is_following'] is True
+        assert [s['tier']['name'] for s in viewer['subscriptions']] == ['Premium']
+
+    def test_lock_state_matches_post_endpoint(self, authenticated_client, creator, page_tier):
+        page = authenticated_client.get(self._url(creator)).data['posts']['results']
+        for post in page:
+            detail = authenticated_client.get(f"/api/posts/{post['id']}/").data
+            assert post['is_locked'] == detail['is_locked']
+            assert post['content'] == detail['content']
+
+    def test_owner_sees_own_posts_unlocked(self, creator_client, creator, page_tier):
+        response = creator_client.get(self._url(creator))
+
+        assert response.data['viewer']['is_owner'] is True
+        assert not any(p['is_locked'] for p in response.data['posts']['results'])
+
+    def test_posts_are_keyset_paginated(self, api_client, creator, page_tier):
+        Post.objects.bulk_create(
+            [
+                Post(title=f'Bulk {i}', content='c', author=creator, status='published', is_free=True)
+                for i in range(POSTS_PER_PAGE)
+            ]
+        )
+        first = api_client.get(self._url(creator)).data['posts']
+        second = api_client.get(self._url(creator), {'cursor': first['next_cursor']}).data['posts']
+
+        assert len(first['results']) == POSTS_PER_PAGE
+        seen = [p['id'] for p in first['results'] + second['results']]
+        assert len(seen) == len(set(seen)) == Post.objects.filter(author=creator).count()
+        assert second['next_cursor'] is None
+
+    def test_fixed_query_budget(self, authenticated_client, user, creator, subscription, page_tier, category):
+        url = self._url(creator)
+        with CaptureQueriesContext(connection) as small:
+            authenticated_client.get(url)
+
+        for i in range(6):
+            post = Post.objects.create(
+                title=f'More {i}', content='c', author=creator, category=category, status='published', is_free=False
+            )
+            post.tiers.add(page_tier)
+        # Resolve the token from the database again, as in the first request
+        local_tokens.clear()
+        cache.clear()
+        with CaptureQueriesContext(connection) as large:
+            authenticated_client.get(url)
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+        assert len(large.captured_queries) <= 10
+
+    def test_non_creator(self, api_client, user):
+        response = api_client.get(f'/api/profiles/{user.profile.id}/page/')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
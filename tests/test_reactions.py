@@ -0,0 +1,149 @@
+"""
+Tests for post and comment reactions
+"""
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from boosty_app.models import Reaction, ReactionCounter
+from boosty_app.reactions import add_reaction, reaction_counts, remove_reaction, viewer_reactions
+
+
+@pytest.fixture
+def reactors(db):
+    return [User.objects.create_user(username=f'reactor{i}', password='testpass123') for i in range(6)]
+
+
+@pytest.mark.django_db
+class TestReactionCounters:
+    """Test membership rows and sharded totals"""
+
+    def test_add_is_idempotent(self, user, published_post):
+        assert add_reaction(user, published_post, 'like') is True
+        assert add_reaction(user, published_post, 'like') is False
+
+        assert Reaction.objects.filter(user=user, post=published_post).count() == 1
+        assert reaction_counts([published_post])[published_post.id] == {'like': 1}
+
+    def test_remove_is_idempotent(self, user, published_post):
+        add_reaction(user, published_post, 'like')
+
+        assert remove_reaction(user, published_post, 'like') is True
+        assert remove_reaction(user, published_post, 'like') is False
+        assert reaction_counts([published_post])[published_post.id] == {}
+
+    def test_totals_sum_across_shards(self, settings, reactors, published_post):
+        settings.REACTION_COUNTER_SHARDS = 4
+        for reactor in reactors:
+            add_reaction(reactor, published_post, 'fire')
+        add_reaction(reactors[0], published_post, 'like')
+        remove_reaction(reactors[1], published_post, 'fire')
+
+        assert reaction_counts([published_post])[published_post.id] == {'fire': 5, 'like': 1}
+        shards = ReactionCounter.objects.filter(post=published_post)
+        assert set(shards.values_list('shard', flat=True)) <= {0, 1, 2, 3}
+
+    def test_counts_are_cached_and_invalidated(self, user, published_post):
+        add_reaction(user, published_post, 'like')
+        reaction_counts([published_post])
+
+        with CaptureQueriesContext(connection) as queries:
+            assert reaction_counts([published_post])[published_post.id] == {'like': 1}
+        assert not queries.captured_queries
+
+        add_reaction(user, published_post, 'heart')
+        assert reaction_counts([published_post])[published_post.id] == {'like': 1, 'heart': 1}
+
+    def test_post_and_comment_totals_are_separate(self, user, published_post, comment):
+        add_reaction(user, published_post, 'like')
+        add_reaction(user, comment, 'like')
+        add_reaction(user, comment, 'laugh')
+
+        assert reaction_counts([published_post])[published_post.id] == {'like': 1}
+        assert reaction_counts([comment])[comment.id] == {'like': 1, 'laugh': 1}
+
+    def test_viewer_reactions(self, user, creator, published_post, free_post):
+        add_reaction(user, published_post, 'wow')
+        add_reaction(user, published_post, 'like')
+        add_reaction(creator, free_post, 'like')
+
+        mine = viewer_reactions(user, [published_post, free_post])
+        assert mine[published_post.id] == ['like', 'wow']
+        assert mine[free_post.id] == []
+
+
+@pytest.mark.django_db
+class TestReactionEndpoints:
+    """Test reaction API endpoints"""
+
+    def test_react_to_post(self, authenticated_client, published_post):
+        url = f'/api/posts/{published_post.id}/reactions/'
+        authenticated_client.post(url, {'kind': 'like'}, format='json')
+        response = authenticated_client.post(url, {'kind': 'like'}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'kind': 'like', 'reacted': True, 'reaction_counts': {'like': 1}}
+
+    def test_remove_post_reaction(self, authenticated_client, user, published_post):
+        add_reaction(user, published_post, 'like')
+        url = f'/api/posts/{published_post.id}/reactions/?kind=like'
+
+        response = authenticated_client.delete(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['reacted'] is False
+        assert response.data['reaction_counts'] == {}
+        assert authenticated_client.delete(url).status_code == status.HTTP_200_OK
+
+    def test_invalid_kind(self, authenticated_client, published_post):
+        response = authenticated_client.post(f'/api/posts/{published_post.id}/reactions/', {'kind': 'meh'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_requires_authentication(self, api_client, published_post):
+        response = api_client.post(f'/api/posts/{published_post.id}/reactions/', {'kind': 'like'})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_cannot_react_to_inaccessible_post(self, authenticated_client, paid_post, draft_post):
+        for post in (paid_post, draft_post):
+            response = authenticated_client.post(f'/api/posts/{post.id}/reactions/', {'kind': 'like'})
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not Reaction.objects.exists()
+
+    def test_react_to_comment(self, authenticated_client, comment):
+        response = authenticated_client.post(f'/api/comments/{comment.id}/reactions/', {'kind': 'laugh'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['reaction_counts'] == {'laugh': 1}
+
+    def test_post_detail_shows_reactions(self, authenticated_client, user, creator, published_post):
+        add_reaction(user, published_post, 'like')
+        add_reaction(creator, published_post, 'like')
+        add_reaction(creator, published_post, 'fire')
+
+        response = authenticated_client.get(f'/api/posts/{published_post.id}/')
+        assert response.data['reaction_counts'] == {'like': 2, 'fire': 1}
+        assert response.data['my_reactions'] == ['like']
+
+    def test_post_list_resolves_reactions_in_batch(self, authenticated_client, user, multiple_posts):
+        for post in multiple_posts[:3]:
+            add_reaction(user, post, 'heart')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get('/api/posts/')
+        reaction_queries = [q for q in queries.captured_queries if 'reaction' in q['sql']]
+        assert len(reaction_queries) == 2
+
+        by_id = {post['id']: post for post in response.data['results']}
+        assert by_id[multiple_posts[0].id]['my_reactions'] == ['heart']
+        assert by_id[multiple_posts[0].id]['reaction_counts'] == {'heart': 1}
+        assert by_id[multiple_posts[4].id]['my_reactions'] == []
+
+    def test_anonymous_list_has_no_viewer_reactions(self, api_client, user, published_post):
+        add_reaction(user, published_post, 'like')
+
+        response = api_client.get('/api/posts/')
+        post = next(p for p in response.data['results'] if p['id'] == published_post.id)
+        assert post['reaction_counts'] == {'like': 1}
+        assert post['my_reactions'] == []
@@ -0,0 +1,93 @@
+"""
+Tests for the orjson JSON renderer and parser
+"""
+
+import datetime
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from boosty_app.models import SubscriptionTier
+from boosty_app.renderers import ORJSONParser, ORJSONRenderer
+
+
+class TestORJSONRenderer:
+    """Test output against DRF's stdlib renderer"""
+
+    def test_matches_stdlib_renderer(self):
+        data = {'id': 1, 'title': 'Привет', 'tiers': [{'price': '10.00'}], 'nested': {'ok': True, 'none': None}}
+
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_native_types(self):
+        created = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc)
+        rendered = json.loads(ORJSONRenderer().render({'price': Decimal('9.99'), 'created_at': created}))
+
+        assert rendered == {'price': 9.99, 'created_at': '2024-05-01T12:30:00Z'}
+
+    def test_non_string_keys(self):
+        assert json.loads(ORJSONRenderer().render({1: 'a'})) == {'1': 'a'}
+
+    def test_escapes_line_separators(self):
+        assert ORJSONRenderer().render({'text': 'a\u2028b'}) == JSONRenderer().render({'text': 'a\u2028b'})
+
+    def test_indent(self):
+        rendered = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+
+        assert rendered == b'{\n  "a": 1\n}'
+
+    def test_none(self):
+        assert ORJSONRenderer().render(None) == b''
+
+
+class TestORJSONParser:
+    """Test request body parsing"""
+
+    def test_parse(self):
+        assert ORJSONParser().parse(io.BytesIO(b'{"title": "Hi", "tiers": [1, 2]}')) == {'title': 'Hi', 'tiers': [1, 2]}
+
+    def test_other_encoding(self):
+        body = '{"title": "Привет"}'.encode('utf-16')
+
+        assert ORJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'utf-16'}) == {'title': 'Привет'}
+
+    def test_invalid(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"title": '))
+
+
+@pytest.mark.django_db
+class TestAPIUsesORJSON:
+    """Test the renderer and parser are the API defaults"""
+
+    def test_list_response(self, api_client, creator):
+        SubscriptionTier.objects.create(creator=creator.profile, name='Basic', price='5.00')
+
+        response = api_client.get('/api/tiers/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert isinstance(response.accepted_renderer, ORJSONRenderer)
+        results = response.json()
+        results = results['results'] if isinstance(results, dict) else results
+        assert results[0]['price'] == '5.00'
+
+    def test_malformed_body(self, creator_client):
+        response = creator_client.post('/api/tiers/', data=b'{"name": ', content_type='application/json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'JSON parse error' in response.data['detail']
+
+    def test_benchmark_command(self, creator, published_post):
+        SubscriptionTier.objects.create(creator=creator.profile, name='Basic', price='5.00')
+        out = io.StringIO()
+
+        call_command('benchmark_renderers', iterations=2, stdout=out)
+
+        assert 'render: json' in out.getvalue()
+        assert 'parse: json' in out.getvalue()
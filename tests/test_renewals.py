@@ -0,0 +1,139 @@
+"""Tests for the batch subscription renewal engine"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.utils import timezone
+
+from boosty_app.checks import check_payment_backend
+from boosty_app.models import SubscriptionRenewal, SubscriptionTier, TierSubscription
+from boosty_app.models.subscription import SUBSCRIPTION_PERIOD
+from boosty_app.payments import FakePaymentBackend, get_payment_backend
+from boosty_app.renewals import RenewalEngine
+
+
+@pytest.fixture
+def tier(creator):
+    return SubscriptionTier.objects.create(
+        creator=creator.profile, name='Basic', description='Basic tier', price=Decimal('5.00')
+    )
+
+
+@pytest.fixture
+def due_subscription(user, tier):
+    return TierSubscription.objects.create(
+        subscriber=user, tier=tier, end_date=timezone.now() + timedelta(hours=2), payment_status='completed'
+    )
+
+
+@pytest.mark.django_db
+class TestRenewalEngine:
+    """Test RenewalEngine batch processing"""
+
+    def test_renews_due_subscription(self, due_subscription):
+        old_end = due_subscription.end_date
+        stats = RenewalEngine(backend=FakePaymentBackend()).run()
+
+        due_subscription.refresh_from_db()
+        assert stats.renewed == 1
+        assert due_subscription.end_date == old_end + SUBSCRIPTION_PERIOD
+        assert due_subscription.transaction_id.startswith('FAKE_')
+        renewal = SubscriptionRenewal.objects.get(subscription=due_subscription)
+        assert renewal.status == 'completed'
+        assert renewal.amount == Decimal('5.00')
+
+    def test_ignores_subscriptions_outside_window(self, user, tier):
+        TierSubscription.objects.create(subscriber=user, tier=tier, end_date=timezone.now() + timedelta(days=10))
+        stats = RenewalEngine(backend=FakePaymentBackend()).run()
+        assert stats.renewed == 0
+        assert not SubscriptionRenewal.objects.exists()
+
+    def test_ignores_cancelled_subscriptions(self, due_subscription):
+        due_subscription.cancel()
+        stats = RenewalEngine(backend=FakePaymentBackend()).run()
+        assert stats.renewed == 0
+
+    def test_period_is_renewed_only_once(self, due_subscription):
+        now = timezone.now()
+        engine = RenewalEngine(backend=FakePaymentBackend())
+        engine.run(now=now, window=timedelta(days=40))
+        # Re-running for the same period must not charge again; the next period is a new key
+        TierSubscription.objects.filter(pk=due_subscription.pk).update(end_date=due_subscription.end_date)
+        stats = engine.run(now=now, window=timedelta(days=40))
+
+        assert stats.renewed == 0
+        assert stats.skipped == 1
+        assert SubscriptionRenewal.objects.count() == 1
+
+    def test_failed_charge_schedules_retry(self, user, due_subscription):
+        now = timezone.now()
+        engine = RenewalEngine(backend=FakePaymentBackend(failing_subscribers=[user.id]), retry_schedule=[timedelta(hours=1)])
+        stats = engine.run(now=now)
+
+        renewal = SubscriptionRenewal.objects.get()
+        assert stats.failed == 1
+        assert renewal.status == 'failed'
+        assert renewal.attempts == 1
+        assert renewal.next_attempt_at == now + timedelta(hours=1)
+
+        # Not retried before the scheduled time
+        assert engine.run(now=now + timedelta(minutes=30)).skipped == 1
+
+    def test_retries_exhausted_deactivates_subscription(self, user, due_subscription):
+        now = timezone.now()
+        engine = RenewalEngine(backend=FakePaymentBackend(failing_subscribers=[user.id]), retry_schedule=[timedelta(hours=1)])
+        engine.run(now=now)
+        stats = engine.run(now=now + timedelta(hours=1))
+
+        due_subscription.refresh_from_db()
+        assert stats.exhausted == 1
+        assert due_subscription.is_active is False
+        assert due_subscription.payment_status == 'failed'
+        assert SubscriptionRenewal.objects.get().status == 'exhausted'
+
+    def test_retry_succeeds_after_failure(self, user, due_subscription):
+        now = timezone.now()
+        backend = FakePaymentBackend(failing_subscribers=[user.id])
+        engine = RenewalEngine(backend=backend, retry_schedule=[timedelta(hours=1)])
+        engine.run(now=now)
+        backend.failing_subscribers.clear()
+        stats = engine.run(now=now + timedelta(hours=1))
+
+        assert stats.renewed == 1
+        renewal = SubscriptionRenewal.objects.get()
+        assert renewal.status == 'completed'
+        assert renewal.attempts == 2
+
+    def test_processes_multiple_batches(self, user, tier):
+        end = timezone.now() + timedelta(hours=1)
+        TierSubscription.objects.bulk_create(
+            [TierSubscription(subscriber=user, tier=tier, end_date=end) for _ in range(7)]
+        )
+        stats = RenewalEngine(backend=FakePaymentBackend(), batch_size=3).run()
+
+        assert stats.renewed == 7
+        assert TierSubscription.objects.filter(end_date=end + SUBSCRIPTION_PERIOD).count() == 7
+
+    def test_management_command(self, due_subscription):
+        call_command('renew_subscriptions', '--window-hours', '24')
+        assert SubscriptionRenewal.objects.filter(status='completed').count() == 1
+
+
+class TestPaymentBackendSetting:
+    """Renewals refuse to run without a configured provider"""
+
+    def test_unset_backend_fails(self, settings):
+        settings.PAYMENT_BACKEND = ''
+
+        with pytest.raises(ImproperlyConfigured):
+            get_payment_backend()
+        assert [error.id for error in check_payment_backend(None)] == ['boosty_app.W001']
+
+    def test_configured_backend(self, settings):
+        settings.PAYMENT_BACKEND = 'boosty_app.payments.FakePaymentBackend'
+
+        assert isinstance(get_payment_backend(), FakePaymentBackend)
+        assert check_payment_backend(None) == []
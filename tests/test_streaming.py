@@ -0,0 +1,175 @@
+"""
+Tests for streamed JSON list responses
+"""
+
+import asyncio
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import Client
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from boosty_app import exports, streaming
+from boosty_app.authentication import issue_token
+from boosty_app.fast_serializers import FastPostSummarySerializer
+from boosty_app.models import Comment, Post
+from boosty_app.streaming import json_array, serialized_chunks
+from boosty_project.asgi import application
+
+
+def _stream(response):
+    chunks = list(response.streaming_content)
+    return chunks, json.loads(b''.join(chunks))
+
+
+class TestJSONArray:
+    """Test encoding chunks as one array"""
+
+    def test_chunks_are_joined(self):
+        body = b''.join(json_array([[{'id': 1}, {'id': 2}], [], [{'id': 3}]]))
+
+        assert json.loads(body) == [{'id': 1}, {'id': 2}, {'id': 3}]
+
+    @pytest.mark.parametrize('chunks', [[], [[]]])
+    def test_empty(self, chunks):
+        assert b''.join(json_array(chunks)) == b'[]'
+
+    def test_one_piece_per_chunk(self):
+        assert len(list(json_array([[1], [2], [3]]))) == 4
+
+
+@pytest.mark.django_db
+class TestStreamedLists:
+    """Test the streamed my_posts and following endpoints"""
+
+    def test_serialized_in_chunks(self, creator, multiple_posts):
+        request = Request(APIRequestFactory().get('/api/posts/my_posts/'))
+        request.user = AnonymousUser()
+        serializer = FastPostSummarySerializer({'request': request})
+
+        chunks = list(serialized_chunks(serializer, Post.objects.all(), chunk_size=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [post['id'] for chunk in chunks for post in chunk] == list(Post.objects.values_list('id', flat=True))
+
+    def test_my_posts_is_streamed(self, creator_client, creator, multiple_posts, draft_post):
+        response = creator_client.get('/api/posts/my_posts/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response['Content-Type'] == 'application/json'
+        _, posts = _stream(response)
+        assert [post['id'] for post in posts] == list(Post.objects.filter(author=creator).values_list('id', flat=True))
+        assert 'content' not in posts[0]
+
+    def test_following_is_streamed(self, authenticated_client, creator, subscription):
+        response = authenticated_client.get('/api/profiles/following/')
+
+        assert response.streaming
+        _, profiles = _stream(response)
+        assert [profile['username'] for profile in profiles] == [creator.username]
+
+    def test_fields_still_apply(self, creator_client, published_post):
+        response = creator_client.get('/api/posts/my_posts/?fields=id,title')
+
+        assert _stream(response)[1] == [{'id': published_post.id, 'title': published_post.title}]
+
+    def test_unknown_field_fails_before_streaming(self, creator_client, published_post):
+        response = creator_client.get('/api/posts/my_posts/?fields=secret')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_batched(self, authenticated_client, creator, subscription):
+        response = authenticated_client.post('/api/batch/', {'requests': ['/api/profiles/following/']}, format='json')
+
+        body = response.data['responses'][0]['body']
+        assert [profile['username'] for profile in body] == [creator.username]
+
+
+def _asgi_get(path, headers, produced):
+    """GET ``path`` through the ASGI application; returns the body messages with ``len(produced)`` as each was sent"""
+    sent = []
+
+    async def scenario():
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message['type'] == 'http.response.body' and message.get('body'):
+                sent.append((message['body'], len(produced)))
+
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': path.split('?')[0],
+            'query_string': path.partition('?')[2].encode(),
+            'headers': [(b'host', b'testserver'), *headers],
+        }
+        await application(scope, receive, send)
+
+    async_to_sync(scenario)()
+    return sent
+
+
+def _counting(produced, make_parts):
+    """Wrap a generator factory so every part it yields is recorded in ``produced``"""
+
+    def wrapper(*args, **kwargs):
+        for part in make_parts(*args, **kwargs):
+            produced.append(part)
+            yield part
+
+    return wrapper
+
+
+@pytest.mark.django_db(transaction=True)
+class TestASGIStreaming:
+    """Test streamed responses are sent part by part under the ASGI server, not drained into a list first"""
+
+    def test_export_is_streamed(self, monkeypatch, creator, published_post, user):
+        for i in range(5):
+            Comment.objects.create(post=published_post, author=user, content=f'Comment {i}')
+        produced = []
+        monkeypatch.setattr(exports, 'FLUSH_BYTES', 1)
+        monkeypatch.setattr(exports, '_buffered', _counting(produced, exports._buffered))
+        client = Client()
+        client.force_login(creator)
+        cookie = f'sessionid={client.cookies["sessionid"].value}'.encode()
+
+        sent = _asgi_get('/creator/export/comments/?format=ndjson', [(b'cookie', cookie)], produced)
+
+        assert len(sent) == len(produced) == 5
+        assert [produced_when_sent for _, produced_when_sent in sent] == [1, 2, 3, 4, 5]
+        assert json.loads(sent[0][0])['content'] == 'Comment 0'
+
+    def test_streamed_list(self, monkeypatch, creator, multiple_posts):
+        produced = []
+        monkeypatch.setattr(streaming, 'json_array', _counting(produced, streaming.json_array))
+        _, key = issue_token(creator)
+
+        sent = _asgi_get('/api/posts/my_posts/', [(b'authorization', f'Token {key}'.encode())], produced)
+
+        assert [produced_when_sent for _, produced_when_sent in sent] == list(range(1, len(produced) + 1))
+        assert len(json.loads(b''.join(body for body, _ in sent))) == len(multiple_posts)
+
+
+@pytest.mark.django_db
+def test_benchmark_command(multiple_posts):
+    out = io.StringIO()
+
+    call_command('benchmark_streaming', chunk_size=2, stdout=out)
+
+    assert 'posts: 5 rows' in out.getvalue()
+    assert 'streamed: first byte' in out.getvalue()
@@ -0,0 +1,250 @@
+"""Tests for the event bus and the Server-Sent Events streams"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from rest_framework.test import APIClient
+
+from boosty_app.authentication import issue_token
+from boosty_app.events import (
+    EventBus,
+    PostgresBackend,
+    StreamOverflow,
+    bus,
+    creator_posts_channel,
+    post_comments_channel,
+)
+from boosty_app.models import Comment, Post
+from boosty_app.streams import issue_stream_ticket, sse_application
+from boosty_project.asgi import application
+
+
+@pytest.fixture(autouse=True)
+def keep_test_connection(monkeypatch):
+    """Streams close stale connections after authenticating; the test database lives in one open connection"""
+    monkeypatch.setattr('boosty_app.streams.close_old_connections', lambda: None)
+
+
+def _scope(path, query_string=b'', headers=None):
+    return {'type': 'http', 'method': 'GET', 'path': path, 'query_string': query_string, 'headers': headers or []}
+
+
+async def _wait_until(predicate, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError('timed out')
+        await asyncio.sleep(0.01)
+
+
+def open_stream(scope, during=None, app=sse_application):
+    """Run a stream until ``during`` finishes, then disconnect; returns the ASGI messages sent"""
+    sent = []
+
+    async def scenario():
+        disconnect = asyncio.Event()
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        task = asyncio.ensure_future(app(scope, receive, send))
+        await _wait_until(lambda: task.done() or bus.subscriber_count() > 0)
+        if during is not None and not task.done():
+            await during()
+        disconnect.set()
+        await asyncio.wait_for(task, 2)
+
+    async_to_sync(scenario)()
+    return sent
+
+
+def _body(sent):
+    return b''.join(m.get('body', b'') for m in sent if m['type'] == 'http.response.body').decode()
+
+
+class TestEventBus:
+    """Test the in-process pub/sub bus"""
+
+    def test_delivers_to_subscribed_channels_only(self):
+        async def scenario():
+            event_bus = EventBus()
+            subscriber = event_bus.subscribe(['a'], maxsize=10)
+            event_bus.dispatch('b', {'type': 'x'})
+            event_bus.dispatch('a', {'type': 'y'})
+            return await asyncio.wait_for(subscriber.get(), 1)
+
+        assert asyncio.run(scenario()) == ('a', {'type': 'y'})
+
+    def test_dispatch_from_another_thread(self):
+        async def scenario():
+            event_bus = EventBus()
+            subscriber = event_bus.subscribe(['a'], maxsize=10)
+            threading.Thread(target=event_bus.dispatch, args=('a', {'type': 'y'})).start()
+            return await asyncio.wait_for(subscriber.get(), 1)
+
+        assert asyncio.run(scenario()) == ('a', {'type': 'y'})
+
+    def test_slow_subscriber_overflows(self):
+        async def scenario():
+            event_bus = EventBus()
+            subscriber = event_bus.subscribe(['a'], maxsize=2)
+            for i in range(3):
+                event_bus.dispatch('a', {'type': 'y', 'id': i})
+            await asyncio.sleep(0)
+            with pytest.raises(StreamOverflow):
+                await subscriber.get()
+
+        asyncio.run(scenario())
+
+    def test_unsubscribe(self):
+        async def scenario():
+            event_bus = EventBus()
+            subscriber = event_bus.subscribe(['a', 'b'])
+            assert event_bus.subscriber_count() == 1
+            subscriber.close()
+            return event_bus.subscriber_count('a'), event_bus.subscriber_count()
+
+        assert asyncio.run(scenario()) == (0, 0)
+
+
+@pytest.mark.django_db
+class TestCommentStream:
+    """Test the per-post comment stream"""
+
+    def test_streams_new_comments(self, published_post, user, django_capture_on_commit_callbacks):
+        def create_comment():
+            with django_capture_on_commit_callbacks(execute=True):
+                return Comment.objects.create(post=published_post, author=user, content='Live!')
+
+        async def during():
+            await sync_to_async(create_comment)()
+            await asyncio.sleep(0.05)
+
+        sent = open_stream(_scope(f'/api/stream/posts/{published_post.id}/comments/'), during)
+
+        assert sent[0]['status'] == 200
+        assert (b'content-type', b'text/event-stream') in sent[0]['headers']
+        body = _body(sent)
+        assert 'event: comment' in body
+        assert '"content": "Live!"' in body
+        assert bus.subscriber_count() == 0
+
+    def test_locked_post_is_forbidden(self, paid_post):
+        sent = open_stream(_scope(f'/api/stream/posts/{paid_post.id}/comments/'))
+
+        assert sent[0]['status'] == 403
+        assert bus.subscriber_count() == 0
+
+    def test_heartbeat_when_idle(self, settings, published_post):
+        settings.SSE_HEARTBEAT_SECONDS = 0.02
+
+        async def during():
+            await asyncio.sleep(0.1)
+
+        sent = open_stream(_scope(f'/api/stream/posts/{published_post.id}/comments/'), during)
+        assert ': ping' in _body(sent)
+
+    def test_overflow_sends_reset(self, settings, published_post):
+        settings.EVENT_STREAM_QUEUE_SIZE = 1
+        channel = post_comments_channel(published_post.id)
+
+        async def during():
+            for i in range(3):
+                bus.dispatch(channel, {'type': 'comment', 'id': i})
+            await asyncio.sleep(0.05)
+
+        sent = open_stream(_scope(f'/api/stream/posts/{published_post.id}/comments/'), during)
+        body = _body(sent)
+        assert 'event: reset' in body
+        assert body.count('event: comment') == 1
+
+    def test_unknown_stream(self):
+        sent = open_stream(_scope('/api/stream/nothing/'))
+        assert sent[0]['status'] == 404
+
+
+@pytest.mark.django_db
+class TestFeedStream:
+    """Test the per-user feed stream"""
+
+    def test_requires_authentication(self):
+        sent = open_stream(_scope('/api/stream/feed/'))
+        assert sent[0]['status'] == 403
+
+    def test_streams_posts_from_followed_creators(
+        self, user, creator, category, subscription, django_capture_on_commit_callbacks
+    ):
+        ticket = issue_stream_ticket(user)
+
+        def publish_post():
+            with django_capture_on_commit_callbacks(execute=True):
+                return Post.objects.create(
+                    title='Fresh', content='Content', author=creator, category=category, status='published'
+                )
+
+        async def during():
+            await sync_to_async(publish_post)()
+            await asyncio.sleep(0.05)
+
+        sent = open_stream(_scope('/api/stream/feed/', query_string=f'ticket={ticket}'.encode()), during, application)
+
+        assert sent[0]['status'] == 200
+        assert 'event: post' in _body(sent)
+
+    def test_token_header(self, user, creator, subscription):
+        _, key = issue_token(user)
+        channel = creator_posts_channel(creator.id)
+
+        async def during():
+            bus.dispatch(channel, {'type': 'post', 'id': 1})
+            await asyncio.sleep(0.05)
+
+        headers = [(b'authorization', f'Token {key}'.encode())]
+        sent = open_stream(_scope('/api/stream/feed/', headers=headers), during)
+        assert 'event: post' in _body(sent)
+
+    def test_tokens_are_not_accepted_in_the_url(self, user, subscription):
+        _, key = issue_token(user)
+
+        sent = open_stream(_scope('/api/stream/feed/', query_string=f'token={key}'.encode()))
+        assert sent[0]['status'] == 403
+
+    def test_expired_and_forged_tickets(self, settings, user, subscription):
+        ticket = issue_stream_ticket(user)
+        settings.STREAM_TICKET_TTL = -1
+
+        for value in (ticket, ticket[:-2]):
+            sent = open_stream(_scope('/api/stream/feed/', query_string=f'ticket={value}'.encode()))
+            assert sent[0]['status'] == 403
+
+    def test_ticket_endpoint(self, authenticated_client):
+        response = authenticated_client.post('/api/stream-tickets/')
+
+        assert response.status_code == 200
+        assert response.data['expires_in'] == 60
+        assert APIClient().post('/api/stream-tickets/').status_code == 401
+
+
+@pytest.mark.django_db(transaction=True)
+def test_postgres_backend_delivers_across_connections():
+    async def scenario():
+        event_bus = EventBus()
+        backend = PostgresBackend(event_bus)
+        subscriber = event_bus.subscribe(['a'])
+        backend.start()
+        # Give the listener a moment to LISTEN before notifying
+        await asyncio.sleep(0.5)
+        await sync_to_async(backend.publish)('a', {'type': 'y', 'id': 1})
+        try:
+            return await asyncio.wait_for(subscriber.get(), 5)
+        finally:
+            await sync_to_async(backend.stop, thread_sensitive=False)()
+
+    assert async_to_sync(scenario)() == ('a', {'type': 'y', 'id': 1})
@@ -3,8 +3,8 @@ API tests for subscription endpoints
 """
 import pytest
 from rest_framework import status
-from rest_framework.authtoken.models import Token
 
+from boosty_app.authentication import issue_token
 from boosty_app.models import Subscription
 
 
@@ -96,8 +96,8 @@ class TestSubscriptionDelete:
             username='otheruser',
             password='testpass123'
         )
-        token = Token.objects.create(user=other_user)
-        authenticated_client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        _, key = issue_token(other_user)
+        authenticated_client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
 
         response = authenticated_client.delete(f'/api/subscriptions/{subscription.id}/')
 
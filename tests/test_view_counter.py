@@ -0,0 +1,133 @@
+"""
+Tests for write-buffered post view counters
+"""
+
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from boosty_app.models import Post
+from boosty_app.view_counter import ViewCounterBuffer
+
+
+@pytest.mark.django_db
+class TestViewCounterBuffer:
+    """Test in-memory aggregation and batched flushing"""
+
+    def test_increments_are_aggregated(self, published_post):
+        buffer = ViewCounterBuffer(interval=0)
+        for _ in range(5):
+            buffer.increment(published_post.id)
+
+        assert buffer.pending(published_post.id) == 5
+        published_post.refresh_from_db()
+        assert published_post.view_count == 0
+
+    def test_flush_writes_all_posts_in_one_statement(self, published_post, free_post, draft_post):
+        buffer = ViewCounterBuffer(interval=0)
+        buffer.increment(published_post.id, 3)
+        buffer.increment(free_post.id)
+        buffer.increment(draft_post.id, 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            assert buffer.flush() == 3
+        updates = [q for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        assert len(updates) == 1
+
+        counts = dict(Post.objects.values_list('id', 'view_count'))
+        assert counts[published_post.id] == 3
+        assert counts[free_post.id] == 1
+        assert counts[draft_post.id] == 2
+        assert buffer.pending(published_post.id) == 0
+
+    def test_flush_adds_to_stored_count(self, published_post):
+        Post.objects.filter(pk=published_post.pk).update(view_count=10)
+        buffer = ViewCounterBuffer(interval=0)
+        buffer.increment(published_post.id, 4)
+        buffer.flush()
+
+        published_post.refresh_from_db()
+        assert published_post.view_count == 14
+
+    def test_empty_flush_is_a_noop(self):
+        buffer = ViewCounterBuffer(interval=0)
+        with CaptureQueriesContext(connection) as queries:
+            assert buffer.flush() == 0
+        assert not queries.captured_queries
+
+    def test_failed_flush_keeps_counts(self, published_post):
+        buffer = ViewCounterBuffer(interval=0)
+        buffer.increment(published_post.id, 2)
+
+        with mock.patch.object(buffer, '_write', side_effect=RuntimeError('db down')):
+            with pytest.raises(RuntimeError):
+                buffer.flush()
+        assert buffer.pending(published_post.id) == 2
+
+        buffer.flush()
+        published_post.refresh_from_db()
+        assert published_post.view_count == 2
+
+    def test_stop_flushes_remaining_counts(self, published_post):
+        buffer = ViewCounterBuffer(interval=0)
+        buffer.increment(published_post.id)
+        buffer.stop()
+
+        published_post.refresh_from_db()
+        assert published_post.view_count == 1
+
+    def test_no_thread_when_interval_disabled(self, published_post):
+        buffer = ViewCounterBuffer(interval=0)
+        buffer.increment(published_post.id)
+        assert buffer._thread is None
+
+
+@pytest.mark.django_db
+class TestPostViewCount:
+    """Test view counting through the post API"""
+
+    def test_retrieve_counts_a_view(self, api_client, published_post, post_view_buffer):
+        api_client.get(f'/api/posts/{published_post.id}/')
+        response = api_client.get(f'/api/posts/{published_post.id}/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert post_view_buffer.pending(published_post.id) == 2
+        # Buffered views from this process are already reflected in the response
+        assert response.data['view_count'] == 1
+
+    def test_view_count_after_flush(self, api_client, published_post, post_view_buffer):
+        api_client.get(f'/api/posts/{published_post.id}/')
+        post_view_buffer.flush()
+
+        response = api_client.get(f'/api/posts/{published_post.id}/')
+        assert response.data['view_count'] == 1
+        published_post.refresh_from_db()
+        assert published_post.view_count == 1
+
+    def test_failed_retrieve_counts_nothing(self, api_client, draft_post, post_view_buffer):
+        response = api_client.get(f'/api/posts/{draft_post.id}/')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert post_view_buffer.pending(draft_post.id) == 0
+
+    def test_view_count_is_read_only(self, creator_client, draft_post):
+        creator_client.patch(f'/api/posts/{draft_post.id}/', {'view_count': 999}, format='json')
+
+        draft_post.refresh_from_db()
+        assert draft_post.view_count == 0
+
+    def test_saving_a_stale_post_keeps_flushed_views(self, creator_client, published_post, post_view_buffer):
+        stale = Post.objects.get(pk=published_post.pk)
+        post_view_buffer.increment(published_post.id, 3)
+        post_view_buffer.flush()
+
+        stale.status = 'archived'
+        stale.save()
+        creator_client.patch(f'/api/posts/{published_post.id}/', {'title': 'Renamed'}, format='json')
+
+        published_post.refresh_from_db()
+        assert published_post.view_count == 3
+        assert (published_post.status, published_post.title) == ('archived', 'Renamed')